@@ -0,0 +1,380 @@
+"""Cached, parallel version of analysis_notebook.ipynb as a command-line report.
+
+    python analysis/report_pipeline.py                        # writes analysis/report/
+    python analysis/report_pipeline.py --out /tmp/pulse_report --workers 8
+    python analysis/report_pipeline.py --force state_quarter  # recompute a step and everything built on it
+    python analysis/report_pipeline.py --list
+
+The notebook's analyses are a DAG of named steps: a few queries against the
+rollup and fact tables, and pandas transforms of their results. Each step's
+DataFrame is cached in analysis/.report_cache under a key built from the
+data_version the extractor bumps after every load, the pandas version, the
+step's own definition and the keys of the steps it reads. A rerun therefore
+only recomputes stale steps (nothing at all after an unchanged load), and only
+the charts whose data changed are redrawn, in parallel processes, as PNGs plus
+an index.html.
+
+The connection comes from dashboard/db_config.py: MySQL credentials from
+.env, or DB_BACKEND=duckdb with PARQUET_ROOT for the Parquet output.
+Rendering needs matplotlib and seaborn.
+"""
+import argparse
+import hashlib
+import html
+import inspect
+import json
+import os
+import pickle
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+ANALYSIS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ANALYSIS_DIR, "..", "dashboard"))
+
+from db_config import get_connection  # noqa: E402
+
+CACHE_DIR = os.getenv("REPORT_CACHE_DIR", os.path.join(ANALYSIS_DIR, ".report_cache"))
+REPORT_DIR = os.getenv("REPORT_DIR", os.path.join(ANALYSIS_DIR, "report"))
+DATA_VERSION_QUERY = "SELECT version FROM data_version WHERE id = 1;"
+
+# -------------------------------
+# Steps
+# -------------------------------
+# query - SQL run as-is; transform(*dependency frames) -> DataFrame otherwise
+Step = namedtuple("Step", ["name", "deps", "query", "transform"], defaults=((), None, None))
+
+
+def _top(df, by, value, n=10):
+    return df.groupby(by, as_index=False)[value].sum().nlargest(n, value).reset_index(drop=True)
+
+
+def top_states(state_quarter):
+    return _top(state_quarter, "state", "txn_amount").rename(columns={"txn_amount": "total_amount"})
+
+
+def year_trend(state_quarter):
+    return state_quarter.groupby("year", as_index=False)["txn_amount"].sum().rename(
+        columns={"txn_amount": "total_amount"})
+
+
+def users_by_state(state_quarter):
+    return _top(state_quarter, "state", "registered_users").rename(columns={"registered_users": "total_users"})
+
+
+def quarter_trend(state_quarter):
+    df = state_quarter.groupby(["year", "quarter"], as_index=False)["txn_amount"].sum()
+    df["period"] = df["year"].astype(str) + " Q" + df["quarter"].astype(str)
+    return df[["period", "txn_amount"]].rename(columns={"txn_amount": "total_amount"})
+
+
+def app_opens_trend(state_quarter):
+    return state_quarter.groupby("year", as_index=False)["app_opens"].sum().rename(
+        columns={"app_opens": "total_opens"})
+
+
+def top_districts(district_totals):
+    return _top(district_totals, "district", "registered_users").rename(columns={"registered_users": "total_users"})
+
+
+STEPS = {step.name: step for step in [
+    # Sources: one scan each, shared by the transforms below
+    Step("state_quarter", query="""
+        SELECT state, year, quarter, txn_count, txn_amount, registered_users, app_opens
+        FROM rollup_state_quarter"""),
+    Step("district_totals", query="SELECT state, district, registered_users FROM rollup_state_district"),
+    Step("type_totals", query="""
+        SELECT transaction_type, SUM(count) AS total_count, SUM(amount) AS total_amount
+        FROM rollup_type_state_year
+        GROUP BY transaction_type
+        ORDER BY total_amount DESC"""),
+    Step("top_brands", query="""
+        SELECT brand, SUM(count) AS user_count
+        FROM aggregated_user
+        GROUP BY brand
+        ORDER BY user_count DESC
+        LIMIT 8"""),
+    Step("top_insurance_states", query="""
+        SELECT state, SUM(amount) AS total_insurance_amount
+        FROM aggregated_insurance
+        GROUP BY state
+        ORDER BY total_insurance_amount DESC
+        LIMIT 10"""),
+    Step("top_pincodes", query="""
+        SELECT name AS pincode, SUM(amount) AS total_amount
+        FROM top_map
+        WHERE entity_type = 'pincode'
+        GROUP BY name
+        ORDER BY total_amount DESC
+        LIMIT 10"""),
+
+    # Derived
+    Step("top_states", ("state_quarter",), transform=top_states),
+    Step("year_trend", ("state_quarter",), transform=year_trend),
+    Step("users_by_state", ("state_quarter",), transform=users_by_state),
+    Step("quarter_trend", ("state_quarter",), transform=quarter_trend),
+    Step("app_opens_trend", ("state_quarter",), transform=app_opens_trend),
+    Step("top_districts", ("district_totals",), transform=top_districts),
+]}
+
+# -------------------------------
+# Charts (one per notebook cell)
+# -------------------------------
+Chart = namedtuple("Chart", ["name", "step", "kind", "x", "y", "title", "size", "palette", "rotate"],
+                   defaults=((12, 6), None, False))
+
+CHARTS = [
+    Chart("top_states", "top_states", "bar", "state", "total_amount",
+          "Top 10 States by Transaction Amount", palette="viridis", rotate=True),
+    Chart("year_trend", "year_trend", "line", "year", "total_amount", "Year-wise Transaction Trend", (10, 5)),
+    Chart("top_brands", "top_brands", "pie", "brand", "user_count", "Top Device Brands Used", (8, 8)),
+    Chart("users_by_state", "users_by_state", "bar", "state", "total_users",
+          "Top 10 States by Registered Users", palette="coolwarm", rotate=True),
+    Chart("quarter_trend", "quarter_trend", "line", "period", "total_amount",
+          "Quarter-wise Growth of Total Transactions", (14, 6), rotate=True),
+    Chart("type_totals", "type_totals", "bar", "transaction_type", "total_amount",
+          "Most Popular Transaction Types by Amount", (10, 6), palette="plasma"),
+    Chart("top_insurance_states", "top_insurance_states", "bar", "state", "total_insurance_amount",
+          "Top 10 States by Insurance Transaction Amount", palette="flare", rotate=True),
+    Chart("app_opens_trend", "app_opens_trend", "line", "year", "total_opens",
+          "Year-wise Trend of App Opens", (10, 5), palette="orange"),
+    Chart("top_pincodes", "top_pincodes", "bar", "pincode", "total_amount",
+          "Top 10 Pincodes by Transaction Amount", (10, 6), palette="mako"),
+    Chart("top_districts", "top_districts", "bar", "district", "total_users",
+          "Top 10 Districts by Registered Users", palette="YlGnBu", rotate=True),
+]
+
+
+def render_chart(chart, df, path):
+    """Draw one chart to a PNG; runs in a worker process, so it imports matplotlib itself."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_theme(style="whitegrid")
+    fig, ax = plt.subplots(figsize=chart.size)
+    if chart.kind == "bar":
+        sns.barplot(data=df, x=chart.x, y=chart.y, hue=chart.x, palette=chart.palette, legend=False, ax=ax)
+    elif chart.kind == "line":
+        sns.lineplot(data=df, x=chart.x, y=chart.y, marker="o", color=chart.palette, ax=ax)
+    else:
+        ax.pie(df[chart.y], labels=df[chart.x], autopct="%1.1f%%", startangle=140)
+        ax.axis("equal")
+    ax.set_title(chart.title)
+    if chart.rotate:
+        ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+    fig.savefig(path + ".tmp.png", dpi=100)
+    plt.close(fig)
+    os.replace(path + ".tmp.png", path)
+    return chart.name
+
+# -------------------------------
+# DAG execution with a result cache
+# -------------------------------
+def read_sql(query):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        columns = [c[0] for c in cursor.description]
+        cursor.close()
+    finally:
+        conn.close()
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+
+def data_version():
+    try:
+        row = read_sql(DATA_VERSION_QUERY)
+    except Exception as e:
+        print("⚠️ No data_version to key the cache on; every step will rerun:", e)
+        return None
+    return str(row.iloc[0, 0]) if len(row) else None
+
+
+def plan(targets):
+    """Steps needed for `targets`, grouped into levels whose steps only depend on earlier levels."""
+    depth = {}
+
+    def visit(name, path=()):
+        if name in path:
+            raise ValueError(f"Step cycle: {' -> '.join(path + (name,))}")
+        if name not in depth:
+            if name not in STEPS:
+                raise ValueError(f"Unknown step {name!r}; see --list")
+            depth[name] = 1 + max((visit(d, path + (name,)) for d in STEPS[name].deps), default=-1)
+        return depth[name]
+
+    for name in targets:
+        visit(name)
+    levels = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for name, level in depth.items():
+        levels[level].append(name)
+    return levels
+
+
+def _definition(step):
+    return step.query if step.query is not None else inspect.getsource(step.transform)
+
+
+def step_key(step, version, dep_keys):
+    # pandas' version too: frames pickled by another release may load wrongly, or not at all
+    text = json.dumps([version, pd.__version__, step.name, _definition(step), [dep_keys[d] for d in step.deps]])
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class StepCache:
+    """<dir>/<step>.pkl holding (key, DataFrame); an entry is valid only for the exact key."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.pkl")
+
+    def get(self, name, key):
+        try:
+            with open(self._path(name), "rb") as f:
+                cached_key, df = pickle.load(f)
+        except Exception:  # missing, truncated, or pickled by a pandas this one cannot read: recompute
+            return None
+        return df if cached_key == key else None
+
+    def put(self, name, key, df):
+        path = self._path(name)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump((key, df), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+
+def run_steps(targets, cache, version, force=(), workers=4):
+    """Bring every step in `targets` (and its dependencies) up to date.
+
+    Returns ({step: DataFrame}, {step: key}, [steps that were recomputed]).
+    """
+    frames, keys, ran = {}, {}, []
+    forced = set(force)
+
+    def run(name):
+        step = STEPS[name]
+        key = step_key(step, version, keys)
+        df = None if version is None or name in forced else cache.get(name, key)
+        if df is None:
+            start = time.perf_counter()
+            df = read_sql(step.query) if step.query is not None else step.transform(*(frames[d] for d in step.deps))
+            cache.put(name, key, df)
+            return name, key, df, time.perf_counter() - start
+        return name, key, df, None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for level in plan(targets):
+            for name, key, df, seconds in pool.map(run, level):
+                frames[name], keys[name] = df, key
+                if seconds is not None:
+                    print(f"🔄 {name}: {len(df):,} rows in {seconds:.2f}s")
+                    ran.append(name)
+                    # Steps built on a forced step are rebuilt too: its key is unchanged, only its rows
+                    forced.update(s.name for s in STEPS.values() if name in s.deps and name in forced)
+    return frames, keys, ran
+
+# -------------------------------
+# Report output
+# -------------------------------
+def chart_key(chart, df):
+    """Hash of the chart definition and the rows it draws, so a reload with unchanged numbers redraws nothing."""
+    rows = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(json.dumps([list(chart), list(df.columns)]).encode() + rows.tobytes()).hexdigest()
+
+
+def render_report(charts, frames, out_dir, workers=4):
+    """Redraw the charts whose data or definition changed (or whose PNG is missing); write index.html."""
+    os.makedirs(out_dir, exist_ok=True)
+    state_path = os.path.join(out_dir, "charts.json")
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            drawn = json.load(f)
+    except (OSError, ValueError):
+        drawn = {}
+
+    todo = []
+    for chart in charts:
+        path = os.path.join(out_dir, f"{chart.name}.png")
+        key = chart_key(chart, frames[chart.step])
+        if drawn.get(chart.name) != key or not os.path.exists(path):
+            todo.append((chart, path, key))
+
+    if todo:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            futures = [pool.submit(render_chart, chart, frames[chart.step], path) for chart, path, _ in todo]
+            for future, (chart, _, key) in zip(futures, todo):
+                future.result()
+                drawn[chart.name] = key
+        print(f"🖼️ Rendered {len(todo)} of {len(charts)} charts in {time.perf_counter() - start:.2f}s")
+    else:
+        print(f"🖼️ All {len(charts)} charts are up to date")
+
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(drawn, f, indent=2)
+    write_index([c for c in CHARTS if os.path.exists(os.path.join(out_dir, f"{c.name}.png"))], out_dir)
+
+
+def write_index(charts, out_dir):
+    figures = "\n".join(
+        f'<figure><img src="{c.name}.png" alt="{html.escape(c.title)}">'
+        f"<figcaption>{html.escape(c.title)}</figcaption></figure>" for c in charts)
+    page = (f"<!doctype html>\n<html><head><meta charset=\"utf-8\"><title>PhonePe Pulse analysis</title>\n"
+            f"<style>body{{font-family:sans-serif;margin:2em}}img{{max-width:100%}}figure{{margin:0 0 2em}}</style>"
+            f"</head>\n<body><h1>PhonePe Pulse analysis</h1>\n"
+            f"<p>Generated {time.strftime('%Y-%m-%d %H:%M')}</p>\n{figures}\n</body></html>\n")
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(page)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("charts", nargs="*", help="Charts to build (default: all; see --list)")
+    parser.add_argument("--out", default=REPORT_DIR, help="Output directory (default: analysis/report; env REPORT_DIR)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="Step result cache (default: analysis/.report_cache; env REPORT_CACHE_DIR)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Parallel queries and chart processes (default: CPU count)")
+    parser.add_argument("--force", nargs="*", metavar="STEP",
+                        help="Recompute these steps and their dependents; with no names, every step")
+    parser.add_argument("--list", action="store_true", help="Show the steps and charts, then exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for level, names in enumerate(plan(STEPS)):
+            for name in names:
+                step = STEPS[name]
+                print(f"step  {name:<22} level {level}  {'<- ' + ', '.join(step.deps) if step.deps else 'SQL'}")
+        for chart in CHARTS:
+            print(f"chart {chart.name:<22} {chart.kind:<5} <- {chart.step}")
+        return
+
+    unknown = [c for c in args.charts if c not in {chart.name for chart in CHARTS}]
+    if unknown:
+        parser.error(f"unknown chart(s): {', '.join(unknown)}")
+    charts = [c for c in CHARTS if not args.charts or c.name in args.charts]
+    force = STEPS if args.force == [] else (args.force or ())
+
+    start = time.perf_counter()
+    version = data_version()
+    frames, keys, ran = run_steps({c.step for c in charts}, StepCache(args.cache_dir), version,
+                                  force=force, workers=args.workers)
+    print(f"🧮 {len(ran)} of {len(keys)} steps recomputed (data version {version})")
+    render_report(charts, frames, args.out, workers=args.workers)
+    print(f"✅ Report written to {os.path.join(os.path.abspath(args.out), 'index.html')} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Request throughput of the headless query API (dashboard/api.py).
+
+    python benchmarks/bench_api.py --states 36 --years 2018-2024 --concurrency 32
+
+Loads a synthetic Pulse tree into Parquet, then drives the ASGI app
+in-process (no server, so this is the app's own cost per request) with
+--concurrency requests in flight. Each endpoint is measured cold (result
+and response caches cleared), warm (served from the response cache) and
+revalidated (If-None-Match, answered 304), as JSON, gzipped JSON and Arrow.
+Pass --parquet-root to reuse an existing load.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+from run_benchmarks import REPO, run_ingest
+from synthetic_pulse import generate, parse_years
+
+
+async def call(app, path, query="", headers=()):
+    """One GET through the ASGI app: (status, {header: value}, body)."""
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query.encode(),
+             "headers": [(k.encode(), v.encode()) for k, v in headers]}
+    response = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+        else:
+            response["body"] = message["body"]
+
+    await app(scope, receive, send)
+    return response["status"], response["headers"], response["body"]
+
+
+async def run(app, requests, concurrency):
+    """Issue every (path, query, headers) request, `concurrency` at a time; returns (seconds, statuses)."""
+    queue = list(requests)
+    statuses = []
+
+    async def worker():
+        while queue:
+            status, _, _ = await call(app, *queue.pop())
+            statuses.append(status)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, statuses
+
+
+async def bench(args, state, year):
+    import api
+    import utils
+
+    endpoints = {
+        "states": ("/v1/states", {}),
+        "geo": ("/v1/geo", {"year": year, "quarter": 4}),
+        "quarterly": ("/v1/quarterly", {"state": state, "year": year}),
+        "types": ("/v1/types", {"state": state, "year": year}),
+        "districts top": ("/v1/districts", {"state": state, "top": 10}),
+        "pincodes page": ("/v1/pincodes", {"state": state, "year": year, "quarter": 4, "page": 1, "page_size": 100}),
+    }
+    variants = {
+        "json": [],
+        "json+gzip": [("accept-encoding", "gzip")],
+        "arrow": [("accept", api.ARROW_TYPE)],
+    }
+
+    print(f"\n{'endpoint':<16}{'format':<11}{'bytes':>9}{'cold req/s':>12}{'warm req/s':>12}{'304 req/s':>12}")
+    for name, (path, params) in endpoints.items():
+        query = urlencode(params)
+        for variant, headers in variants.items():
+            status, response_headers, body = await call(api.app, path, query, headers)
+            if status != 200:
+                print(f"{name:<16}{variant:<11}  HTTP {status}: {body[:120]!r}")
+                continue
+
+            def cold_requests():
+                utils.invalidate_cache()
+                api.response_cache.invalidate()
+                return [(path, query, headers)]
+
+            cold = float("inf")
+            for _ in range(5):
+                cold = min(cold, (await run(api.app, cold_requests(), 1))[0])
+            warm_s, warm = await run(api.app, [(path, query, headers)] * args.requests, args.concurrency)
+            revalidate = headers + [("if-none-match", response_headers["etag"])]
+            not_modified_s, not_modified = await run(api.app, [(path, query, revalidate)] * args.requests,
+                                                     args.concurrency)
+            assert set(warm) == {200} and set(not_modified) == {304}, (set(warm), set(not_modified))
+            print(f"{name:<16}{variant:<11}{len(body):>9,}{1 / cold:>12,.0f}"
+                  f"{args.requests / warm_s:>12,.0f}{args.requests / not_modified_s:>12,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--states", type=int, default=36)
+    parser.add_argument("--years", type=parse_years, default=range(2018, 2025))
+    parser.add_argument("--districts", type=int, default=30)
+    parser.add_argument("--pincodes", type=int, default=200)
+    parser.add_argument("--parquet-root", help="Existing Parquet output to use instead of generating data")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per warm/304 measurement")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="pulse_api_")
+    try:
+        parquet_root = args.parquet_root
+        if parquet_root is None:
+            n_files, n_bytes = generate(work, args.states, args.years,
+                                        districts=args.districts, pincodes=args.pincodes)
+            parquet_root = os.path.join(work, "parquet")
+            seconds = run_ingest(SimpleNamespace(target="parquet", workers=1), os.path.join(work, "data"),
+                                 parquet_root)
+            print(f"🧪 Generated and loaded {n_files:,} files ({n_bytes / 1e6:.1f} MB) in {seconds:.1f}s")
+
+        os.environ["DB_BACKEND"] = "duckdb"
+        os.environ["PARQUET_ROOT"] = parquet_root
+        sys.path.insert(0, os.path.join(REPO, "dashboard"))
+        import utils
+
+        states, years = utils.get_states(), utils.get_years()
+        asyncio.run(bench(args, states[0], years[-1]))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
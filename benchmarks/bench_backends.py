@@ -0,0 +1,114 @@
+"""Compare the MySQL and DuckDB/Parquet backends on the dashboard and notebook queries.
+
+    python extract/extract_to_mysql.py                     # load MySQL
+    python extract/extract_to_mysql.py --target parquet    # write ../data/parquet
+    python benchmarks/bench_backends.py --repeat 5
+
+Both backends are reached through dashboard/db_config.get_connection(), so the
+numbers include the same connection handling the dashboard pays for.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard"))
+
+from db_config import get_connection  # noqa: E402
+
+# (name, query, params) - the rollup reads from dashboard/utils.py and the
+# scan-and-aggregate queries from analysis/analysis_notebook.ipynb
+QUERIES = [
+    ("states", "SELECT state FROM rollup_state_totals ORDER BY state;", None),
+    ("years", "SELECT DISTINCT year FROM rollup_state_quarter ORDER BY year;", None),
+    ("type_by_state_year", """
+        SELECT transaction_type, amount AS total_amount FROM rollup_type_state_year
+        WHERE state = %s AND year = %s ORDER BY total_amount DESC;""", ("maharashtra", 2022)),
+    ("district_totals", "SELECT district, txn_amount AS total FROM rollup_state_district WHERE state = %s;",
+     ("maharashtra",)),
+    ("quarter_totals", """
+        SELECT quarter, txn_amount AS total FROM rollup_state_quarter
+        WHERE state = %s AND year = %s ORDER BY quarter;""", ("maharashtra", 2022)),
+    ("gemini_prompt", """
+        SELECT transaction_type, SUM(amount) AS total_amount FROM aggregated_transaction
+        WHERE state = %s AND year = %s AND quarter = %s
+        GROUP BY transaction_type ORDER BY total_amount DESC;""", ("maharashtra", 2022, 1)),
+    ("nb_top_states", """
+        SELECT state, SUM(amount) AS total_amount FROM aggregated_transaction
+        GROUP BY state ORDER BY total_amount DESC LIMIT 10;""", None),
+    ("nb_year_totals", """
+        SELECT year, SUM(amount) AS total_amount FROM aggregated_transaction
+        GROUP BY year ORDER BY year;""", None),
+    ("nb_top_brands", """
+        SELECT brand, SUM(count) AS user_count FROM aggregated_user
+        GROUP BY brand ORDER BY user_count DESC LIMIT 8;""", None),
+    ("nb_users_by_state", """
+        SELECT state, SUM(registered_users) AS total_users FROM map_user
+        GROUP BY state ORDER BY total_users DESC LIMIT 10;""", None),
+    ("nb_quarter_trend", """
+        SELECT CONCAT(year, ' Q', quarter) AS period, SUM(amount) AS total_amount
+        FROM aggregated_transaction GROUP BY year, quarter ORDER BY year, quarter;""", None),
+    ("nb_type_totals", """
+        SELECT transaction_type, SUM(count) AS total_count, SUM(amount) AS total_amount
+        FROM aggregated_transaction GROUP BY transaction_type ORDER BY total_amount DESC;""", None),
+    ("nb_insurance", """
+        SELECT state, SUM(amount) AS total_insurance_amount FROM aggregated_insurance
+        GROUP BY state ORDER BY total_insurance_amount DESC LIMIT 10;""", None),
+    ("nb_app_opens", """
+        SELECT year, SUM(app_opens) AS total_opens FROM map_user
+        GROUP BY year ORDER BY year;""", None),
+    ("nb_top_pincodes", """
+        SELECT name AS pincode, SUM(amount) AS total_amount FROM top_map
+        WHERE entity_type = 'pincode' GROUP BY name ORDER BY total_amount DESC LIMIT 10;""", None),
+    ("nb_top_districts", """
+        SELECT district, SUM(registered_users) AS total_users FROM map_user
+        GROUP BY district ORDER BY total_users DESC LIMIT 10;""", None),
+]
+
+
+def time_query(backend, query, params, repeat):
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        conn = get_connection(backend)
+        try:
+            cursor = conn.cursor()
+            start = time.perf_counter()
+            cursor.execute(query, params)
+            rows = len(cursor.fetchall())
+            best = min(best, time.perf_counter() - start)
+            cursor.close()
+        finally:
+            conn.close()
+    return rows, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", choices=("mysql", "duckdb"), default=["mysql", "duckdb"])
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing (default: 3)")
+    parser.add_argument("--queries", nargs="+", choices=[name for name, _, _ in QUERIES],
+                        default=[name for name, _, _ in QUERIES])
+    args = parser.parse_args()
+
+    print(f"{'query':<22}" + "".join(f"{b + ' ms':>14}{'rows':>8}" for b in args.backends))
+    totals = dict.fromkeys(args.backends, 0.0)
+    for name, query, params in QUERIES:
+        if name not in args.queries:
+            continue
+        line = f"{name:<22}"
+        for backend in args.backends:
+            try:
+                rows, seconds = time_query(backend, query, params, args.repeat)
+            except Exception as e:
+                print(f"⚠️ {backend} failed on {name}: {e}")
+                line += f"{'-':>14}{'-':>8}"
+                continue
+            totals[backend] += seconds
+            line += f"{seconds * 1000:>14,.1f}{rows:>8,}"
+        print(line)
+    print(f"{'TOTAL':<22}" + "".join(f"{totals[b] * 1000:>14,.1f}{'':>8}" for b in args.backends))
+
+
+if __name__ == "__main__":
+    main()
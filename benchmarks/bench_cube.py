@@ -0,0 +1,98 @@
+"""Memory footprint and query latency of the dashboard's in-memory cube.
+
+    python benchmarks/bench_cube.py --states 36 --years 2018-2024 --districts 30
+
+Loads a synthetic Pulse tree into Parquet, builds dashboard/cube.py from it
+through the DuckDB backend, and compares every chart query answered by the
+cube with the same query sent to the database (uncached) and through the
+dashboard's result cache. Pass --parquet-root to reuse an existing load.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from run_benchmarks import REPO, run_ingest
+from synthetic_pulse import generate, parse_years, state_names
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--states", type=int, default=36)
+    parser.add_argument("--years", type=parse_years, default=range(2018, 2025))
+    parser.add_argument("--districts", type=int, default=30)
+    parser.add_argument("--pincodes", type=int, default=10)
+    parser.add_argument("--parquet-root", help="Existing Parquet output to use instead of generating data")
+    parser.add_argument("--repeat", type=int, default=20, help="Best-of-N timing (default: 20)")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="pulse_cube_")
+    try:
+        parquet_root = args.parquet_root
+        if parquet_root is None:
+            n_files, n_bytes = generate(work, args.states, args.years,
+                                        districts=args.districts, pincodes=args.pincodes)
+            parquet_root = os.path.join(work, "parquet")
+            seconds = run_ingest(SimpleNamespace(target="parquet", workers=1), os.path.join(work, "data"),
+                                 parquet_root)
+            print(f"🧪 Generated and loaded {n_files:,} files ({n_bytes / 1e6:.1f} MB) in {seconds:.1f}s")
+
+        os.environ["DB_BACKEND"] = "duckdb"
+        os.environ["PARQUET_ROOT"] = parquet_root
+        os.environ["CUBE_SNAPSHOT"] = os.path.join(work, "cube.npz")
+        sys.path.insert(0, os.path.join(REPO, "dashboard"))
+        import utils
+        from cube import PulseCube
+
+        start = time.perf_counter()
+        cube = PulseCube.build(utils._read_sql)
+        build_s = time.perf_counter() - start
+        cube.save(os.environ["CUBE_SNAPSHOT"])
+        load_s = best_of(lambda: PulseCube.load(os.environ["CUBE_SNAPSHOT"]), 3)
+        snapshot_mb = os.path.getsize(os.environ["CUBE_SNAPSHOT"]) / 1e6
+
+        print(f"\n🧊 Cube: {cube.nbytes() / 1e6:.2f} MB in memory, {len(cube.states)} states × "
+              f"{len(cube.years)} years × 4 quarters × {len(cube.types)} types, {len(cube.districts):,} districts")
+        print(f"   built in {build_s:.2f}s; snapshot {snapshot_mb:.2f} MB loads in {load_s * 1000:.1f} ms")
+
+        state = cube.states[0] if len(cube.states) else state_names(1)[0]
+        year = int(cube.years[-1]) if len(cube.years) else max(args.years)
+        params = {
+            utils.STATES_QUERY: (), utils.YEARS_QUERY: (),
+            utils.GEO_QUERY: (year, 4),
+            utils.STATE_TXN_TOTALS_QUERY: (), utils.STATE_USER_TOTALS_QUERY: (),
+            utils.DISTRICT_TXN_QUERY: (state,), utils.DISTRICT_USERS_QUERY: (state,),
+            utils.QUARTERLY_TXN_QUERY: (state, year), utils.QUARTERLY_APP_OPENS_QUERY: (state, year),
+            utils.TYPE_INSIGHTS_QUERY: (state, year),
+        }
+        for kind in ("district_txn", "district_users"):
+            params.update({utils.TOP_QUERIES[kind]: (utils.TOP_N, state),
+                           utils.PAGE_QUERIES[kind]: (state, utils.PAGE_SIZE, utils.PAGE_SIZE),
+                           utils.COUNT_QUERIES[kind]: (state,)})
+
+        print(f"\n{'query':<58}{'cube ms':>10}{'sql ms':>10}{'cached ms':>11}")
+        for query, cube_frame in utils.CUBE_FRAMES.items():
+            p = params[query]
+            cube_s = best_of(lambda: cube_frame(cube, *p), args.repeat)
+            sql_s = best_of(lambda: utils._read_sql(query, p or None), args.repeat)
+            cached_s = best_of(lambda: utils.fetch_df(query, p or None), args.repeat)
+            label = " ".join(query.split())[:56]
+            print(f"{label:<58}{cube_s * 1000:>10.3f}{sql_s * 1000:>10.3f}{cached_s * 1000:>11.3f}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
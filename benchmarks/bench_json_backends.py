@@ -0,0 +1,71 @@
+"""Compare JSON parser backends on a synthetic Pulse tree.
+
+    python benchmarks/bench_json_backends.py --states 10 --years 2021-2023
+
+Reports files/sec and MB/sec per dataset for every installed backend,
+timing the same read -> parse -> row-mapping path the extractor uses.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "extract"))
+
+from datasets import DATASETS  # noqa: E402
+from engine import iter_quarter_files, iter_rows, set_json_backend  # noqa: E402
+from json_backend import available_backends  # noqa: E402
+from synthetic_pulse import generate, parse_years  # noqa: E402
+
+
+def bench_dataset(spec, data_root, repeat):
+    base_path = os.path.join(data_root, spec.path)
+    paths = [path for _, _, _, path in iter_quarter_files(base_path)]
+    n_bytes = sum(os.path.getsize(p) for p in paths)
+
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = sum(1 for _ in iter_rows(spec, data_root))
+        best = min(best, time.perf_counter() - start)
+    return len(paths), n_bytes, rows, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-root", help="Existing Pulse data directory (skips generation)")
+    parser.add_argument("--states", type=int, default=10)
+    parser.add_argument("--years", type=parse_years, default=range(2021, 2024))
+    parser.add_argument("--districts", type=int, default=30)
+    parser.add_argument("--pincodes", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing (default: 3)")
+    parser.add_argument("--backends", nargs="+", default=available_backends())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="pulse_bench_") as tmp:
+        data_root = args.data_root
+        if data_root is None:
+            n_files, n_bytes = generate(tmp, args.states, args.years,
+                                        districts=args.districts, pincodes=args.pincodes)
+            data_root = os.path.join(tmp, "data")
+            print(f"🧪 Generated {n_files:,} files ({n_bytes / 1e6:.1f} MB)")
+
+        print(f"{'backend':<10}{'dataset':<24}{'files':>8}{'rows':>10}{'files/s':>12}{'MB/s':>9}")
+        for backend in args.backends:
+            set_json_backend(backend)
+            total_files = total_bytes = total_time = 0
+            for spec in DATASETS.values():
+                files, n_bytes, rows, seconds = bench_dataset(spec, data_root, args.repeat)
+                total_files += files
+                total_bytes += n_bytes
+                total_time += seconds
+                print(f"{backend:<10}{spec.name:<24}{files:>8,}{rows:>10,}"
+                      f"{files / seconds:>12,.0f}{n_bytes / 1e6 / seconds:>9.1f}")
+            print(f"{backend:<10}{'ALL':<24}{total_files:>8,}{'':>10}"
+                  f"{total_files / total_time:>12,.0f}{total_bytes / 1e6 / total_time:>9.1f}\n")
+
+
+if __name__ == "__main__":
+    main()
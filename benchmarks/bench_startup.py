@@ -0,0 +1,109 @@
+"""Cold-start cost of the dashboard shell, checked against a time budget.
+
+    python benchmarks/bench_startup.py                     # synthetic snapshot, 250 ms budget
+    python benchmarks/bench_startup.py --budget-ms 150 --parquet-root ../data/parquet
+
+Each measurement runs in a fresh interpreter, so nothing is already imported.
+"shell" is what dashboard/app.py does before the first tab draws: import
+its top-level modules and read the state/year pickers from the dimension
+snapshot. The per-tab imports (utils, insights, report) are reported for
+reference. Exits 1 when the shell exceeds --budget-ms or pulls in any of the
+heavy modules the tabs are meant to defer.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from run_benchmarks import REPO
+from synthetic_pulse import state_names
+
+DASHBOARD_DIR = os.path.join(REPO, "dashboard")
+HEAVY_MODULES = ("pandas", "numpy", "plotly", "requests", "fpdf", "PIL", "mysql.connector", "duckdb")
+
+_CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {dashboard!r})
+start = time.perf_counter()
+{body}
+seconds = time.perf_counter() - start
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+SCENARIOS = {
+    "shell": "import dimensions, instrumentation\nassert dimensions.get_states() and dimensions.get_years()",
+    "import utils (chart tabs)": "import utils",
+    "import insights (AI tab)": "import insights",
+    "import report (AI tab)": "import report",
+}
+
+
+def measure(body, env, repeat):
+    runs = []
+    for _ in range(repeat):
+        code = _CHILD.format(dashboard=DASHBOARD_DIR, body=body, heavy=HEAVY_MODULES)
+        out = subprocess.run([sys.executable, "-c", code], env=env, cwd=REPO,
+                             capture_output=True, text=True)
+        if out.returncode != 0:
+            return None, out.stderr.strip().splitlines()[-1:]
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(r["seconds"] for r in runs), runs[-1]["heavy"]
+
+
+def write_snapshot(parquet_root, states, years):
+    sys.path.insert(0, os.path.join(REPO, "extract"))
+    from rollups import DIMENSIONS_FILE, write_dimensions
+
+    write_dimensions(os.path.join(parquet_root, DIMENSIONS_FILE),
+                     {"states": states, "years": years, "latest": [years[-1], 4]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", 250)),
+                        help="Shell start-up target (default: 250; env STARTUP_BUDGET_MS)")
+    parser.add_argument("--parquet-root", help="Parquet load whose dimensions.json to read "
+                                               "(default: a synthetic 36-state snapshot)")
+    parser.add_argument("--repeat", type=int, default=5, help="Median of N fresh interpreters (default: 5)")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="pulse_startup_")
+    try:
+        parquet_root = args.parquet_root
+        if parquet_root is None:
+            parquet_root = work
+            write_snapshot(parquet_root, state_names(36), list(range(2018, 2025)))
+        env = dict(os.environ, DB_BACKEND="duckdb", PARQUET_ROOT=parquet_root)
+
+        print(f"\n{'step':<30}{'median ms':>12}   heavy modules loaded")
+        results = {}
+        for name, body in SCENARIOS.items():
+            seconds, heavy = measure(body, env, args.repeat)
+            results[name] = (seconds, heavy)
+            if seconds is None:
+                print(f"{name:<30}{'failed':>12}   {' '.join(heavy)}")
+            else:
+                print(f"{name:<30}{seconds * 1000:>12.1f}   {', '.join(heavy) or '-'}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    seconds, heavy = results["shell"]
+    if seconds is None:
+        print("\n❌ Dashboard shell failed to start.")
+        sys.exit(1)
+    if heavy:
+        print(f"\n❌ Dashboard shell imported {', '.join(heavy)}; move the import into the tab that uses it.")
+        sys.exit(1)
+    if seconds * 1000 > args.budget_ms:
+        print(f"\n❌ Dashboard shell took {seconds * 1000:.1f} ms (budget {args.budget_ms:.0f} ms).")
+        sys.exit(1)
+    print(f"\n✅ Dashboard shell starts in {seconds * 1000:.1f} ms (budget {args.budget_ms:.0f} ms).")
+
+
+if __name__ == "__main__":
+    main()
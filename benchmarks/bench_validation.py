@@ -0,0 +1,134 @@
+"""Ingest time with and without the validation pass, plus a check that it catches planted faults.
+
+    python benchmarks/bench_validation.py --states 36 --years 2018-2024 --repeat 3
+
+Generates a synthetic Pulse tree, plants one fault of each kind the
+validator looks for (see FAULTS), then times full Parquet loads with
+--skip-validation and with validation on. Exits 1 if a planted fault is
+missing from validation_report.json or the multi-instrument entry was not
+summed. The synthetic district and state totals are drawn independently, so
+reconciliation mismatches are expected here and only reported.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+from types import SimpleNamespace
+
+from run_benchmarks import run_ingest
+from synthetic_pulse import generate, parse_years, state_names
+
+# (dataset directory, table, check) for every planted fault; each lands in <state>/<first year>/1.json
+FAULTS = [
+    ("map/transaction/hover/country/india/state", "map_transaction", "duplicate_key"),
+    ("map/insurance/hover/country/india/state", "map_insurance", "negative"),
+    ("map/user/hover/country/india/state", "map_user", "bad_number"),
+    ("top/user/country/india/state", "top_user", "bad_pincode"),
+    ("top/transaction/country/india/state", "top_map", "parse_error"),
+]
+MULTI_INSTRUMENT = "aggregated/transaction/country/india/state"
+
+
+def _edit(path, change):
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    change(doc["data"])
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f)
+
+
+def plant_faults(data_root, state, year):
+    """Plant FAULTS plus one two-instrument entry without a TOTAL row; returns its expected count."""
+    def path(directory):
+        return os.path.join(data_root, directory, state, str(year), "1.json")
+
+    def negative(data):
+        data["hoverDataList"][0]["metric"][0]["count"] = -5
+
+    def null_users(data):
+        first = next(iter(data["hoverData"]))
+        data["hoverData"][first]["registeredUsers"] = None
+
+    def bad_pincode(data):
+        data["pincodes"][0]["name"] = "12AB"
+
+    def malformed(data):
+        data["pincodes"].append("not-an-object")
+
+    def multi_instrument(data):
+        data["transactionData"][0]["paymentInstruments"] = [
+            {"type": "UPI", "count": 700, "amount": 7000.0}, {"type": "CARD", "count": 300, "amount": 3000.0}]
+
+    _edit(path(FAULTS[0][0]), lambda d: d["hoverDataList"].append(dict(d["hoverDataList"][0])))
+    _edit(path(FAULTS[1][0]), negative)
+    _edit(path(FAULTS[2][0]), null_users)
+    _edit(path(FAULTS[3][0]), bad_pincode)
+    _edit(path(FAULTS[4][0]), malformed)
+    _edit(path(MULTI_INSTRUMENT), multi_instrument)
+    return 1000
+
+
+def loaded_count(parquet_root, state, year):
+    import pandas as pd
+
+    df = pd.read_parquet(os.path.join(parquet_root, "aggregated_transaction", f"year={year}", "quarter=1"))
+    return int(df[df["state"] == state]["count"].iloc[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--states", type=int, default=10)
+    parser.add_argument("--years", type=parse_years, default=range(2021, 2024))
+    parser.add_argument("--districts", type=int, default=30)
+    parser.add_argument("--pincodes", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1, help="Extractor --workers (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Loads per mode; the median is reported")
+    args = parser.parse_args()
+    ingest_args = SimpleNamespace(target="parquet", workers=args.workers)
+
+    work = tempfile.mkdtemp(prefix="pulse_validation_")
+    failures = []
+    try:
+        n_files, n_bytes = generate(work, args.states, args.years, districts=args.districts, pincodes=args.pincodes)
+        data_root, parquet_root = os.path.join(work, "data"), os.path.join(work, "parquet")
+        state, year = state_names(args.states)[0], args.years[0]
+        expected_count = plant_faults(data_root, state, year)
+        print(f"🧪 Generated {n_files:,} files ({n_bytes / 1e6:.1f} MB) with {len(FAULTS)} planted faults")
+
+        timings = {}
+        for mode, extra in (("skip", ["--skip-validation", "--skip-rollups"]), ("validate", ["--skip-rollups"])):
+            timings[mode] = []
+            for _ in range(args.repeat):
+                shutil.rmtree(parquet_root, ignore_errors=True)
+                timings[mode].append(run_ingest(ingest_args, data_root, parquet_root, extra=extra))
+
+        with open(os.path.join(parquet_root, "validation_report.json"), encoding="utf-8") as f:
+            report = json.load(f)
+        for _, table, check in FAULTS:
+            found = report["checks"].get(table, {}).get(check, 0)
+            print(f"{table:<18}{check:<16}{'caught' if found else 'MISSED':>8}")
+            if not found:
+                failures.append(f"{table} {check}")
+        count = loaded_count(parquet_root, state, year)
+        if count != expected_count:
+            failures.append(f"multi-instrument count {count} != {expected_count}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    skip, validate = statistics.median(timings["skip"]), statistics.median(timings["validate"])
+    print(f"\nrows checked {report['rows_checked']:,}, quarantined {report['rows_quarantined']:,}, "
+          f"files rejected {report['files_rejected']:,}, "
+          f"reconcile mismatches {report['reconcile_mismatches']:,} of {report['periods_reconciled']:,} periods")
+    print(f"ingest without validation {skip:.2f}s, with validation {validate:.2f}s "
+          f"({(validate - skip) / skip:+.1%}; {report['seconds']:.2f}s inside the checks)")
+    if failures:
+        print("\n❌ " + "; ".join(failures))
+        sys.exit(1)
+    print("\n✅ Every planted fault was caught.")
+
+
+if __name__ == "__main__":
+    main()
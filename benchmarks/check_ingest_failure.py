@@ -0,0 +1,59 @@
+"""Regression check: a load whose writer fails must not record its files or bump the data version.
+
+    python benchmarks/check_ingest_failure.py
+
+Generates a small synthetic Pulse tree, blocks one fact table's output
+directory with a plain file so its loader raises, and runs the real CLI
+(--target parquet) serially and with --workers 2. Each run must exit
+non-zero and leave no ingest manifest and no data version behind, so a
+rerun (incremental or not) loads every file again. Exits 1 otherwise.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from run_benchmarks import EXTRACT_DIR
+from synthetic_pulse import generate
+
+BLOCKED_TABLE = "map_user"
+
+
+def run_blocked(data_root, parquet_root, workers):
+    os.makedirs(parquet_root)
+    open(os.path.join(parquet_root, BLOCKED_TABLE), "w").close()  # the sink cannot create its partitions
+    cmd = [sys.executable, os.path.join(EXTRACT_DIR, "extract_to_mysql.py"), "--target", "parquet",
+           "--data-root", data_root, "--parquet-root", parquet_root, "--workers", str(workers)]
+    proc = subprocess.run(cmd, cwd=EXTRACT_DIR, capture_output=True, text=True)
+
+    problems = []
+    if proc.returncode == 0:
+        problems.append("exited 0")
+    for name in ("ingest_manifest.json", "data_version.parquet"):
+        if os.path.exists(os.path.join(parquet_root, name)):
+            problems.append(f"wrote {name}")
+    return problems, proc
+
+
+def main():
+    work = tempfile.mkdtemp(prefix="pulse_failure_")
+    failed = False
+    try:
+        generate(work, 3, range(2021, 2023), districts=5, pincodes=5)
+        for workers in (1, 2):
+            problems, proc = run_blocked(os.path.join(work, "data"), os.path.join(work, f"parquet_{workers}"),
+                                         workers)
+            if problems:
+                failed = True
+                print(f"❌ --workers {workers}: {', '.join(problems)}")
+                print(proc.stdout[-1500:], proc.stderr[-1500:])
+            else:
+                print(f"✅ --workers {workers}: exit {proc.returncode}, manifest and data version untouched")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Timed ingest and dashboard scenarios on a synthetic Pulse tree, written as JSON.
+
+    python benchmarks/run_benchmarks.py --states 36 --years 2018-2024 --output bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json     # rerun and diff against a baseline
+
+Scenarios:
+    full_ingest           extract_to_mysql.py over the whole tree
+    incremental_noop      --incremental with nothing changed
+    incremental_changed   --incremental after rewriting the latest quarter of every state
+    helper:<name>         each dashboard/utils.py query helper, cold (cache cleared) and warm
+
+The default --target parquet needs no database server: ingest writes Parquet
+and the helpers read it through DB_BACKEND=duckdb. --target mysql loads the
+database configured in .env instead (its tables are overwritten).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_pulse import generate, parse_years, state_names
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXTRACT_DIR = os.path.join(REPO, "extract")
+
+
+# -------------------------------
+# Ingest scenarios (run the real CLI in a subprocess)
+# -------------------------------
+def run_ingest(args, data_root, parquet_root, incremental=False, extra=()):
+    cmd = [sys.executable, os.path.join(EXTRACT_DIR, "extract_to_mysql.py"),
+           "--target", args.target, "--data-root", data_root, "--parquet-root", parquet_root,
+           "--workers", str(args.workers), *extra]
+    if incremental:
+        cmd.append("--incremental")
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=EXTRACT_DIR, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} failed:\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}")
+    return seconds
+
+
+# -------------------------------
+# Dashboard helper scenarios (in-process, through utils.py)
+# -------------------------------
+def helper_calls(utils, state, year, quarter):
+    return {
+        "get_states": lambda: utils.get_states(),
+        "get_years": lambda: utils.get_years(),
+        "get_transaction_insights": lambda: utils.get_transaction_insights(state, year),
+        "plot_total_transaction_by_state": lambda: utils.plot_total_transaction_by_state(),
+        "plot_total_users_by_state": lambda: utils.plot_total_users_by_state(),
+        "plot_district_transactions": lambda: utils.plot_district_transactions(state),
+        "plot_district_users": lambda: utils.plot_district_users(state),
+        "plot_pincodes": lambda: utils.plot_pincodes("pincode_txn", state, year, quarter),
+        "entity_page:pincode_txn": lambda: utils.entity_page("pincode_txn", (state, year, quarter), page=2),
+        "plot_quarterly_transactions": lambda: utils.plot_quarterly_transactions(state, year),
+        "plot_quarterly_app_opens": lambda: utils.plot_quarterly_app_opens(state, year),
+        "plot_geo_transaction": lambda: utils.plot_geo_transaction(year, quarter),
+        "load_geo_tab": lambda: utils.load_geo_tab(year, quarter),
+        "load_trends_tab": lambda: utils.load_trends_tab(state, year),
+    }
+
+
+def time_call(fn, repeat, before=None):
+    samples = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_helpers(args, parquet_root, state, year, quarter):
+    if args.target == "parquet":
+        os.environ["DB_BACKEND"] = "duckdb"
+        os.environ["PARQUET_ROOT"] = parquet_root
+    sys.path.insert(0, os.path.join(REPO, "dashboard"))
+    import utils
+
+    results = []
+    for name, fn in helper_calls(utils, state, year, quarter).items():
+        if args.helpers and name not in args.helpers:
+            continue
+        cold = time_call(fn, args.repeat, before=utils.invalidate_cache)
+        warm = time_call(fn, args.repeat)
+        results.append(summarise(f"helper:{name}", cold, warm=warm))
+    return results
+
+
+# -------------------------------
+# Results
+# -------------------------------
+def summarise(scenario, samples, **extra):
+    result = {"scenario": scenario, "seconds": min(samples), "median_seconds": statistics.median(samples),
+              "samples": [round(s, 6) for s in samples]}
+    for key, values in extra.items():
+        result[f"{key}_seconds"] = min(values)
+        result[f"{key}_median_seconds"] = statistics.median(values)
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_results(results, baseline=None):
+    previous = {r["scenario"]: r for r in (baseline or {}).get("results", [])}
+    print(f"\n{'scenario':<42}{'best s':>10}{'median s':>10}{'warm s':>10}{'vs base':>10}")
+    for r in results:
+        warm = r.get("warm_seconds")
+        line = f"{r['scenario']:<42}{r['seconds']:>10.4f}{r['median_seconds']:>10.4f}"
+        line += f"{warm:>10.4f}" if warm is not None else f"{'':>10}"
+        old = previous.get(r["scenario"])
+        if old and old["seconds"]:
+            line += f"{(r['seconds'] / old['seconds'] - 1) * 100:>+9.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--states", type=int, default=10)
+    parser.add_argument("--years", type=parse_years, default=range(2021, 2024))
+    parser.add_argument("--districts", type=int, default=30)
+    parser.add_argument("--pincodes", type=int, default=10)
+    parser.add_argument("--target", choices=("parquet", "mysql"), default="parquet")
+    parser.add_argument("--workers", type=int, default=1, help="Extractor --workers (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timings per ingest/helper scenario (default: 3)")
+    parser.add_argument("--scenarios", nargs="+", default=["ingest", "helpers"], choices=("ingest", "helpers"))
+    parser.add_argument("--helpers", nargs="+", help="Only these helper names")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run to diff against")
+    parser.add_argument("--keep", help="Keep the generated tree and Parquet output in this directory")
+    args = parser.parse_args()
+
+    work = args.keep or tempfile.mkdtemp(prefix="pulse_bench_")
+    data_root = os.path.join(work, "data")
+    parquet_root = os.path.join(work, "parquet")
+    years = list(args.years)
+    try:
+        n_files, n_bytes = generate(work, args.states, years, districts=args.districts, pincodes=args.pincodes)
+        print(f"🧪 Generated {n_files:,} files ({n_bytes / 1e6:.1f} MB) under {data_root}")
+
+        results = []
+        if "ingest" in args.scenarios:
+            full = []
+            for _ in range(args.repeat):
+                shutil.rmtree(parquet_root, ignore_errors=True)
+                full.append(run_ingest(args, data_root, parquet_root))
+            results.append(summarise("full_ingest", full))
+
+            noop = [run_ingest(args, data_root, parquet_root, incremental=True) for _ in range(args.repeat)]
+            results.append(summarise("incremental_noop", noop))
+
+            changed = []
+            for i in range(args.repeat):
+                generate(work, args.states, [years[-1]], quarters=(4,), districts=args.districts,
+                         pincodes=args.pincodes, seed=100 + i)
+                changed.append(run_ingest(args, data_root, parquet_root, incremental=True))
+            results.append(summarise("incremental_changed", changed))
+        elif not os.path.isdir(parquet_root) and args.target == "parquet":
+            run_ingest(args, data_root, parquet_root)
+
+        if "helpers" in args.scenarios:
+            state = state_names(args.states)[0]
+            results += bench_helpers(args, parquet_root, state, years[-1], 4)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.target,
+            "workers": args.workers,
+            "repeat": args.repeat,
+            "scale": {"states": args.states, "years": years, "districts": args.districts,
+                      "pincodes": args.pincodes, "files": n_files, "bytes": n_bytes},
+        },
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
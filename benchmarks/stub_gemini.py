@@ -0,0 +1,82 @@
+"""Local stand-in for the Gemini generateContent endpoint.
+
+    python benchmarks/stub_gemini.py --port 8765 --latency 2 --fail-rate 0.2
+    GEMINI_API_URL=http://127.0.0.1:8765/ streamlit run dashboard/app.py
+
+Answers every POST with a canned insight after --latency seconds, and fails
+a fraction of requests with 503 (or 429 + Retry-After) so the insight
+service's cache, retry/backoff and concurrency cap can be exercised offline.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(latency, fail_rate, rate_limit_rate):
+    stats = {"requests": 0, "in_flight": 0, "peak_in_flight": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = body.get("contents", [{}])[0].get("parts", [{}])[0].get("text", "")
+            with lock:
+                stats["requests"] += 1
+                stats["in_flight"] += 1
+                stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+            try:
+                time.sleep(latency)
+                roll = random.random()
+                if roll < rate_limit_rate:
+                    self._reply(429, {"error": "rate limited"}, {"Retry-After": "1"})
+                elif roll < rate_limit_rate + fail_rate:
+                    self._reply(503, {"error": "unavailable"})
+                else:
+                    text = f"- Stub insight for a {len(prompt)}-character prompt"
+                    self._reply(200, {"candidates": [{"content": {"parts": [{"text": text}]}}]})
+            finally:
+                with lock:
+                    stats["in_flight"] -= 1
+
+        def do_GET(self):
+            with lock:
+                self._reply(200, dict(stats))
+
+        def _reply(self, status, payload, headers=None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="Seconds before each reply (default: 1)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of 503 replies")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 replies")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port),
+                                 make_handler(args.latency, args.fail_rate, args.rate_limit_rate))
+    print(f"🤖 Stub Gemini on http://127.0.0.1:{args.port}/ (GET for request stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
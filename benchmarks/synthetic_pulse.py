@@ -0,0 +1,141 @@
+"""Generate a synthetic PhonePe Pulse tree with the same layout as pulse/data.
+
+    python benchmarks/synthetic_pulse.py /tmp/pulse --states 36 --years 2018-2024 --districts 30 --pincodes 10
+"""
+import argparse
+import json
+import os
+import random
+
+PULSE_STATES = [
+    "andaman-&-nicobar-islands", "andhra-pradesh", "arunachal-pradesh", "assam", "bihar",
+    "chandigarh", "chhattisgarh", "dadra-&-nagar-haveli-&-daman-&-diu", "delhi", "goa",
+    "gujarat", "haryana", "himachal-pradesh", "jammu-&-kashmir", "jharkhand", "karnataka",
+    "kerala", "ladakh", "lakshadweep", "madhya-pradesh", "maharashtra", "manipur", "meghalaya",
+    "mizoram", "nagaland", "odisha", "puducherry", "punjab", "rajasthan", "sikkim",
+    "tamil-nadu", "telangana", "tripura", "uttar-pradesh", "uttarakhand", "west-bengal",
+]
+
+TRANSACTION_TYPES = ["Recharge & bill payments", "Peer-to-peer payments", "Merchant payments",
+                     "Financial Services", "Others"]
+BRANDS = ["Xiaomi", "Samsung", "Vivo", "Oppo", "OnePlus", "Realme", "Apple", "Motorola", "Lenovo", "Others"]
+
+
+def state_names(count):
+    names = PULSE_STATES[:count]
+    names += [f"synthetic-state-{i}" for i in range(len(names), count)]
+    return names
+
+
+def _instrument(rng, scale=1):
+    count = rng.randint(1_000, 5_000_000) * scale
+    return {"type": "TOTAL", "count": count, "amount": count * rng.uniform(50, 5000)}
+
+
+def _envelope(data):
+    return {"success": True, "code": "SUCCESS", "data": data, "responseTimestamp": 1700000000000}
+
+
+# -------------------------------
+# One document per dataset
+# -------------------------------
+def aggregated_transaction(rng, districts, pincodes):
+    return _envelope({"from": 0, "to": 0, "transactionData": [
+        {"name": t, "paymentInstruments": [_instrument(rng)]} for t in TRANSACTION_TYPES]})
+
+
+def aggregated_user(rng, districts, pincodes):
+    counts = [rng.randint(1_000, 2_000_000) for _ in BRANDS]
+    total = sum(counts)
+    return _envelope({
+        "aggregated": {"registeredUsers": total, "appOpens": total * rng.randint(5, 40)},
+        "usersByDevice": [{"brand": b, "count": c, "percentage": c / total} for b, c in zip(BRANDS, counts)],
+    })
+
+
+def aggregated_insurance(rng, districts, pincodes):
+    return _envelope({"from": 0, "to": 0, "transactionData": [
+        {"name": "Insurance", "paymentInstruments": [_instrument(rng)]}]})
+
+
+def map_user(rng, districts, pincodes):
+    return _envelope({"hoverData": {
+        f"{d} district": {"registeredUsers": rng.randint(1_000, 900_000), "appOpens": rng.randint(0, 9_000_000)}
+        for d in districts}})
+
+
+def map_transaction(rng, districts, pincodes):
+    return _envelope({"hoverDataList": [
+        {"name": f"{d} district", "metric": [_instrument(rng)]} for d in districts]})
+
+
+def top_user(rng, districts, pincodes):
+    return _envelope({
+        "states": None,
+        "districts": [{"name": d, "registeredUsers": rng.randint(1_000, 900_000)} for d in districts[:10]],
+        "pincodes": [{"name": p, "registeredUsers": rng.randint(100, 90_000)} for p in pincodes],
+    })
+
+
+def top_transaction(rng, districts, pincodes):
+    return _envelope({
+        "states": None,
+        "districts": [{"entityName": d, "metric": _instrument(rng)} for d in districts[:10]],
+        "pincodes": [{"entityName": p, "metric": _instrument(rng)} for p in pincodes],
+    })
+
+
+LAYOUT = {
+    "aggregated/transaction/country/india/state": aggregated_transaction,
+    "aggregated/user/country/india/state": aggregated_user,
+    "aggregated/insurance/country/india/state": aggregated_insurance,
+    "map/user/hover/country/india/state": map_user,
+    "map/transaction/hover/country/india/state": map_transaction,
+    "map/insurance/hover/country/india/state": map_transaction,
+    "top/user/country/india/state": top_user,
+    "top/transaction/country/india/state": top_transaction,
+    "top/insurance/country/india/state": top_transaction,
+}
+
+
+def generate(root, states=36, years=range(2018, 2025), quarters=(1, 2, 3, 4),
+             districts=30, pincodes=10, seed=7):
+    """Write the tree under <root>/data and return (files written, bytes written)."""
+    rng = random.Random(seed)
+    files = size = 0
+    for s_index, state in enumerate(state_names(states)):
+        district_names = [f"{state.replace('-', ' ')} {i}" for i in range(districts)]
+        pincode_names = [str(100000 + s_index * 10000 + i) for i in range(pincodes)]
+        for rel_path, build in LAYOUT.items():
+            for year in years:
+                year_dir = os.path.join(root, "data", rel_path, state, str(year))
+                os.makedirs(year_dir, exist_ok=True)
+                for quarter in quarters:
+                    payload = json.dumps(build(rng, district_names, pincode_names))
+                    with open(os.path.join(year_dir, f"{quarter}.json"), "w", encoding="utf-8") as f:
+                        f.write(payload)
+                    files += 1
+                    size += len(payload)
+    return files, size
+
+
+def parse_years(text):
+    if "-" in text:
+        start, end = text.split("-")
+        return range(int(start), int(end) + 1)
+    return [int(y) for y in text.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic PhonePe Pulse data tree.")
+    parser.add_argument("root", help="Output directory (the tree is written to <root>/data)")
+    parser.add_argument("--states", type=int, default=36)
+    parser.add_argument("--years", type=parse_years, default=range(2018, 2025), help="e.g. 2018-2024 or 2022,2023")
+    parser.add_argument("--districts", type=int, default=30, help="Districts per state")
+    parser.add_argument("--pincodes", type=int, default=10, help="Top pincodes per state and quarter")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    n_files, n_bytes = generate(args.root, args.states, args.years, districts=args.districts,
+                                pincodes=args.pincodes, seed=args.seed)
+    print(f"✅ Wrote {n_files:,} files ({n_bytes / 1e6:.1f} MB) under {os.path.join(args.root, 'data')}")
@@ -0,0 +1,226 @@
+# dashboard/api.py
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import os
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+import utils
+from instrumentation import timed, prometheus_text
+from query_cache import QueryCache
+
+# Headless HTTP access to the dashboard aggregates, for services that would
+# otherwise scrape Streamlit or copy its SQL. A plain ASGI app (no framework):
+#
+#     uvicorn api:app --app-dir dashboard --host 0.0.0.0 --port 8000 --workers 4
+#
+#     curl 'localhost:8000/v1/quarterly?state=karnataka&year=2023'
+#     curl -H 'Accept: application/vnd.apache.arrow.stream' 'localhost:8000/v1/geo?year=2023&quarter=4'
+#
+# Responses are JSON arrays of row objects, or Arrow IPC streams with
+# ?format=arrow / that Accept header. Queries go through utils.query_frame(),
+# so they share the result cache (and the cube with DASHBOARD_CUBE=1). The
+# ETag is derived from the request and the data version, so a poller that
+# sends If-None-Match gets a 304 without any query until the next load.
+
+# ------------------ Settings ------------------
+
+API_MAX_AGE = int(os.getenv("API_MAX_AGE", 30))                    # Cache-Control max-age, seconds
+API_CACHE_SIZE = int(os.getenv("API_CACHE_SIZE", 1024))            # encoded responses kept in memory
+API_GZIP_MIN_BYTES = int(os.getenv("API_GZIP_MIN_BYTES", 1024))    # smaller bodies are sent as-is
+API_MAX_PAGE_SIZE = 1000
+
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+JSON_TYPE = "application/json"
+
+# Encoded bodies keyed on (etag, content-encoding); the ETag embeds the data
+# version, so a new load simply stops hitting the old entries
+response_cache = QueryCache(max_entries=API_CACHE_SIZE)
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# ------------------ Parameters ------------------
+
+_REQUIRED = object()
+
+
+def _arg(args, name, cast=str, default=_REQUIRED, choices=None):
+    if name not in args:
+        if default is _REQUIRED:
+            raise ApiError(400, f"missing query parameter '{name}'")
+        return default
+    try:
+        value = cast(args[name])
+    except ValueError:
+        raise ApiError(400, f"invalid value for '{name}': {args[name]!r}")
+    if choices is not None and value not in choices:
+        raise ApiError(400, f"'{name}' must be one of {', '.join(map(str, choices))}")
+    return value
+
+
+def _quarter(args):
+    return _arg(args, "quarter", int, choices=(1, 2, 3, 4))
+
+
+def _measure(args, options):
+    return options[_arg(args, "measure", default=next(iter(options)), choices=tuple(options))]
+
+# ------------------ Routes ------------------
+# Each route maps the query string to (DataFrame, extra headers)
+
+def _frame(query, params=None):
+    return utils.query_frame(query, params), {}
+
+
+def _dimension(column, values):
+    return pd.DataFrame({column: values}), {}
+
+
+def _entities(kind, params, args):
+    """?top=N for the top-N + Others view, otherwise ?page=&page_size= (X-Total-Count has the total)."""
+    if "top" in args:
+        top = _arg(args, "top", int)
+        if not 1 <= top <= API_MAX_PAGE_SIZE:
+            raise ApiError(400, f"top must be between 1 and {API_MAX_PAGE_SIZE}")
+        return utils.top_entities(kind, params, top), {}
+    page = _arg(args, "page", int, default=1)
+    page_size = _arg(args, "page_size", int, default=utils.PAGE_SIZE)
+    if page < 1 or not 1 <= page_size <= API_MAX_PAGE_SIZE:
+        raise ApiError(400, f"page must be >= 1 and page_size between 1 and {API_MAX_PAGE_SIZE}")
+    rows, total = utils.entity_page(kind, params, page, page_size)
+    return rows, {"x-total-count": str(total)}
+
+
+ROUTES = {
+    "/v1/states": lambda a: _dimension("state", utils.get_states()),
+    "/v1/years": lambda a: _dimension("year", utils.get_years()),
+    "/v1/geo": lambda a: _frame(utils.GEO_QUERY, (_arg(a, "year", int), _quarter(a))),
+    "/v1/states/totals": lambda a: _frame(_measure(a, {"txn_amount": utils.STATE_TXN_TOTALS_QUERY,
+                                                       "registered_users": utils.STATE_USER_TOTALS_QUERY})),
+    "/v1/quarterly": lambda a: _frame(_measure(a, {"txn_amount": utils.QUARTERLY_TXN_QUERY,
+                                                   "app_opens": utils.QUARTERLY_APP_OPENS_QUERY}),
+                                      (_arg(a, "state"), _arg(a, "year", int))),
+    "/v1/types": lambda a: _frame(utils.TYPE_INSIGHTS_QUERY, (_arg(a, "state"), _arg(a, "year", int))),
+    "/v1/districts": lambda a: _entities(_measure(a, {"txn_amount": "district_txn",
+                                                      "registered_users": "district_users"}),
+                                         (_arg(a, "state"),), a),
+    "/v1/pincodes": lambda a: _entities(_measure(a, {"txn_amount": "pincode_txn", "txn_count": "pincode_txn_count",
+                                                     "registered_users": "pincode_users",
+                                                     "insurance_amount": "pincode_insurance"}),
+                                        (_arg(a, "state"), _arg(a, "year", int), _quarter(a)), a),
+}
+
+# ------------------ Encoding ------------------
+
+def _to_json(df):
+    return df.to_json(orient="records").encode()
+
+
+def _to_arrow(df):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ApiError(406, "Arrow output needs pyarrow installed on the server")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _render(path, args, fmt, encoding):
+    """(body, headers) for one request; errors propagate, so they are never cached."""
+    with timed("api.render", route=path) as span:
+        df, headers = ROUTES[path](args)
+        body = _to_arrow(df) if fmt == "arrow" else _to_json(df)
+        span.rows, span.bytes = len(df), len(body)
+    headers = dict(headers, **{"content-type": ARROW_TYPE if fmt == "arrow" else JSON_TYPE})
+    if encoding == "gzip" and len(body) >= API_GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=5)
+        headers["content-encoding"] = "gzip"
+    return body, headers
+
+
+def _etag(version, path, args, fmt):
+    key = json.dumps([str(version), path, sorted(args.items()), fmt])
+    return '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+# ------------------ ASGI ------------------
+
+async def _send(send, status, body=b"", headers=None, head=False):
+    raw = [(k.encode(), v.encode()) for k, v in (headers or {}).items()]
+    raw.append((b"content-length", str(len(body)).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": raw})
+    await send({"type": "http.response.body", "body": b"" if head else body})
+
+
+async def _error(send, status, message, head=False):
+    await _send(send, status, json.dumps({"error": message}).encode(), {"content-type": JSON_TYPE}, head)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    path = scope["path"].rstrip("/") or "/"
+    head = scope["method"] == "HEAD"
+    if scope["method"] not in ("GET", "HEAD"):
+        return await _error(send, 405, "only GET and HEAD are supported")
+    if path == "/healthz":
+        return await _send(send, 200, b"ok", {"content-type": "text/plain"}, head)
+    if path == "/metrics":
+        return await _send(send, 200, prometheus_text().encode(), {"content-type": "text/plain; version=0.0.4"}, head)
+    if path not in ROUTES:
+        return await _error(send, 404, f"unknown endpoint {path}; try one of {', '.join(ROUTES)}", head)
+
+    request_headers = {k.decode().lower(): v.decode() for k, v in scope["headers"]}
+    args = {k: v[-1] for k, v in parse_qs(scope["query_string"].decode()).items()}
+    fmt = args.pop("format", "arrow" if ARROW_TYPE in request_headers.get("accept", "") else "json")
+    if fmt not in ("json", "arrow"):
+        return await _error(send, 400, "format must be json or arrow", head)
+    encoding = "gzip" if "gzip" in request_headers.get("accept-encoding", "") else "identity"
+
+    version = await asyncio.to_thread(utils.data_version)
+    etag = _etag(version, path, args, fmt)
+    headers = {"etag": etag, "cache-control": f"public, max-age={API_MAX_AGE}", "vary": "Accept, Accept-Encoding"}
+
+    if_none_match = request_headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+        return await _send(send, 304, headers=headers)
+
+    try:
+        body, extra = await asyncio.to_thread(
+            response_cache.get_or_load, (etag, encoding), lambda: _render(path, args, fmt, encoding))
+    except ApiError as e:
+        return await _error(send, e.status, str(e), head)
+    except Exception as e:
+        print("❌ API request failed:", path, args, repr(e))
+        return await _error(send, 500, "query failed", head)
+    await _send(send, 200, body, dict(headers, **extra), head)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("api:app", host=os.getenv("API_HOST", "127.0.0.1"), port=int(os.getenv("API_PORT", 8000)),
+                workers=int(os.getenv("API_WORKERS", 1)))
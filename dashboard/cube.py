@@ -0,0 +1,259 @@
+# dashboard/cube.py
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# ------------------ Settings ------------------
+
+# DASHBOARD_CUBE=1 answers the chart helpers from this in-memory cube instead of SQL
+CUBE_ENABLED = os.getenv("DASHBOARD_CUBE") == "1"
+CUBE_SNAPSHOT = os.getenv("CUBE_SNAPSHOT", os.path.join(os.path.dirname(__file__), ".cube_snapshot.npz"))
+
+# District spellings resolved through the name index, as rollup_state_district does
+_DISTRICT_SOURCE = """
+    SELECT x.state, x.year, x.quarter, COALESCE(d.name, x.district) AS district, {measures}
+    FROM {table} x
+    LEFT JOIN dim_alias a
+      ON a.kind = 'district' AND a.state = x.state AND a.raw_name = LOWER(TRIM(x.district))
+    LEFT JOIN dim_district d ON d.district_id = a.entity_id;
+"""
+
+# Raw facts the cube is built from; the roll-ups below mirror extract/rollups.py
+SOURCE_QUERIES = {
+    "types": "SELECT state, year, quarter, transaction_type, count, amount FROM aggregated_transaction;",
+    "district_txn": _DISTRICT_SOURCE.format(measures="x.count, x.amount", table="map_transaction"),
+    "district_users": _DISTRICT_SOURCE.format(measures="x.registered_users, x.app_opens", table="map_user"),
+}
+
+QUARTERS = np.arange(1, 5)
+
+
+def _labels(series):
+    """Fixed-width unicode array (snapshots refuse object arrays)."""
+    return np.asarray(series.astype(str).to_numpy(), dtype=str)
+
+# ------------------ Cube ------------------
+
+class PulseCube:
+    """Dense NumPy arrays over (state, year, quarter[, transaction type | district]).
+
+    Dimensions are sorted label arrays; measures are indexed by position in
+    them. District measures are (district, year, quarter) with district_state
+    mapping each district to its state, so a state's districts are one mask.
+    Every has_* mask records which cells had a source row, so frames contain
+    the same rows the rollup tables would.
+    """
+
+    ARRAYS = ("states", "years", "types", "districts", "district_state",
+              "type_count", "type_amount", "has_type",
+              "users", "opens", "has_users",
+              "district_count", "district_amount", "district_users", "district_opens", "has_district")
+
+    def __init__(self, version=None, **arrays):
+        self.version = version
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        # Roll-up over transaction types, reused by every state-level slice
+        self._txn_amount = self.type_amount.sum(axis=3)
+        self._has_txn = self.has_type.any(axis=3)
+        self._state_pos = {s: i for i, s in enumerate(self.states)}
+        self._year_pos = {int(y): i for i, y in enumerate(self.years)}
+
+    # ---- building ----
+
+    @classmethod
+    def from_frames(cls, types, district_txn, district_users, version=None):
+        """Build from the three SOURCE_QUERIES result frames."""
+        states = np.unique(np.concatenate([_labels(types["state"]), _labels(district_users["state"]),
+                                           _labels(district_txn["state"])]))
+        years = np.unique(np.concatenate([types["year"], district_users["year"], district_txn["year"]])).astype(np.int64)
+        type_names = np.unique(_labels(types["transaction_type"]))
+
+        # Districts are keyed on "state<US>district" so equal names in two states stay apart;
+        # the source queries already map every spelling to its dim_district name
+        def d_key(frame):
+            return _labels(frame["state"].astype(str) + "\x1f" + frame["district"].astype(str))
+
+        district_labels = np.unique(np.concatenate([d_key(district_txn), d_key(district_users)]))
+        district_parts = np.char.partition(district_labels, "\x1f")
+
+        S, Y, Q, T, D = len(states), len(years), 4, len(type_names), len(district_labels)
+
+        def pos(values, labels):
+            return np.searchsorted(labels, np.asarray(values, dtype=labels.dtype))
+
+        def q_pos(values):
+            return np.asarray(values, dtype=np.int64) - 1
+
+        # Transaction types: (S, Y, Q, T)
+        t_idx = (pos(types["state"], states), pos(types["year"], years), q_pos(types["quarter"]),
+                 pos(types["transaction_type"], type_names))
+        type_count = np.zeros((S, Y, Q, T), dtype=np.int64)
+        type_amount = np.zeros((S, Y, Q, T), dtype=np.float64)
+        has_type = np.zeros((S, Y, Q, T), dtype=bool)
+        np.add.at(type_count, t_idx, types["count"].to_numpy(np.int64))
+        np.add.at(type_amount, t_idx, types["amount"].to_numpy(np.float64))
+        has_type[t_idx] = True
+
+        # Districts: (D, Y, Q)
+        def d_pos(frame):
+            return np.searchsorted(district_labels, d_key(frame))
+
+        dt_idx = (d_pos(district_txn), pos(district_txn["year"], years), q_pos(district_txn["quarter"]))
+        du_idx = (d_pos(district_users), pos(district_users["year"], years), q_pos(district_users["quarter"]))
+        district_count = np.zeros((D, Y, Q), dtype=np.int64)
+        district_amount = np.zeros((D, Y, Q), dtype=np.float64)
+        district_reg = np.zeros((D, Y, Q), dtype=np.int64)
+        district_opens = np.zeros((D, Y, Q), dtype=np.int64)
+        has_district = np.zeros((D, Y, Q), dtype=bool)
+        np.add.at(district_count, dt_idx, district_txn["count"].to_numpy(np.int64))
+        np.add.at(district_amount, dt_idx, district_txn["amount"].to_numpy(np.float64))
+        np.add.at(district_reg, du_idx, district_users["registered_users"].to_numpy(np.int64))
+        np.add.at(district_opens, du_idx, district_users["app_opens"].to_numpy(np.int64))
+        has_district[dt_idx] = True
+        has_district[du_idx] = True
+
+        # State-level users (map_user summed over districts): (S, Y, Q)
+        u_idx = (pos(district_users["state"], states), du_idx[1], du_idx[2])
+        users = np.zeros((S, Y, Q), dtype=np.int64)
+        opens = np.zeros((S, Y, Q), dtype=np.int64)
+        has_users = np.zeros((S, Y, Q), dtype=bool)
+        np.add.at(users, u_idx, district_users["registered_users"].to_numpy(np.int64))
+        np.add.at(opens, u_idx, district_users["app_opens"].to_numpy(np.int64))
+        has_users[u_idx] = True
+
+        return cls(version=version, states=states, years=years, types=type_names,
+                   districts=district_parts[:, 2], district_state=pos(district_parts[:, 0], states),
+                   type_count=type_count, type_amount=type_amount, has_type=has_type,
+                   users=users, opens=opens, has_users=has_users,
+                   district_count=district_count, district_amount=district_amount,
+                   district_users=district_reg, district_opens=district_opens, has_district=has_district)
+
+    @classmethod
+    def build(cls, read_sql, version=None):
+        frames = {name: read_sql(query) for name, query in SOURCE_QUERIES.items()}
+        return cls.from_frames(frames["types"], frames["district_txn"], frames["district_users"], version)
+
+    # ---- snapshots ----
+
+    def save(self, path=CUBE_SNAPSHOT):
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, version=np.array(str(self.version)),
+                            **{name: getattr(self, name) for name in self.ARRAYS})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=CUBE_SNAPSHOT):
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in cls.ARRAYS}
+            version = str(data["version"])
+        return cls(version=None if version == "None" else version, **arrays)
+
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    # ---- slices and roll-ups ----
+
+    def _s(self, state):
+        return self._state_pos.get(state)
+
+    def _y(self, year):
+        return self._year_pos.get(int(year))
+
+    def state_list(self):
+        return self.states.tolist()
+
+    def year_list(self):
+        present = self.has_type.any(axis=(0, 2, 3)) | self.has_users.any(axis=(0, 2))
+        return self.years[present].tolist()
+
+    def state_totals(self, measure):
+        """rollup_state_totals: one row per state with any data."""
+        amount, has_txn = self._txn_amount, self._has_txn
+        present = has_txn.any(axis=(1, 2)) | self.has_users.any(axis=(1, 2))
+        values = amount.sum(axis=(1, 2)) if measure == "txn_amount" else self.users.sum(axis=(1, 2))
+        return pd.DataFrame({"state": self.states[present], "total": values[present]})
+
+    def state_quarter_slice(self, year, quarter):
+        """rollup_state_quarter for one (year, quarter): txn_amount per state."""
+        y = self._y(year)
+        if y is None or not 1 <= int(quarter) <= 4:
+            return pd.DataFrame({"state": [], "total": []})
+        amount, has_txn = self._txn_amount, self._has_txn
+        q = int(quarter) - 1
+        present = has_txn[:, y, q] | self.has_users[:, y, q]
+        return pd.DataFrame({"state": self.states[present], "total": amount[present, y, q]})
+
+    def quarterly(self, state, year, measure):
+        """rollup_state_quarter for one (state, year), ordered by quarter."""
+        s, y = self._s(state), self._y(year)
+        if s is None or y is None:
+            return pd.DataFrame({"quarter": [], "total": []})
+        amount, has_txn = self._txn_amount, self._has_txn
+        present = has_txn[s, y] | self.has_users[s, y]
+        values = amount[s, y] if measure == "txn_amount" else self.opens[s, y]
+        return pd.DataFrame({"quarter": QUARTERS[present], "total": values[present]})
+
+    def districts_of(self, state, measure):
+        """rollup_state_district for one state."""
+        s = self._s(state)
+        if s is None:
+            return pd.DataFrame({"district": [], "total": []})
+        mask = (self.district_state == s) & self.has_district.any(axis=(1, 2))
+        values = self.district_amount if measure == "txn_amount" else self.district_users
+        return pd.DataFrame({"district": self.districts[mask], "total": values[mask].sum(axis=(1, 2))})
+
+    def types_of(self, state, year):
+        """rollup_type_state_year for one (state, year), largest amount first."""
+        s, y = self._s(state), self._y(year)
+        if s is None or y is None:
+            return pd.DataFrame({"transaction_type": [], "total_amount": []})
+        present = self.has_type[s, y].any(axis=0)
+        amounts = self.type_amount[s, y].sum(axis=0)
+        order = np.argsort(-amounts[present], kind="stable")
+        return pd.DataFrame({"transaction_type": self.types[present][order],
+                             "total_amount": amounts[present][order]})
+
+# ------------------ Process-wide Cube ------------------
+
+_cube = None
+_cube_lock = threading.Lock()
+_cube_checked = 0.0
+
+
+def get_cube(read_sql, fetch_version, check_interval=30.0):
+    """The shared cube, loaded from the snapshot or built from the database.
+
+    The data version is re-read at most every check_interval seconds; a new
+    version rebuilds the cube and rewrites the snapshot.
+    """
+    global _cube, _cube_checked
+    now = time.monotonic()
+    if _cube is not None and now - _cube_checked < check_interval:
+        return _cube
+
+    with _cube_lock:
+        if _cube is not None and time.monotonic() - _cube_checked < check_interval:
+            return _cube
+        try:
+            version = str(fetch_version())
+        except Exception:
+            version = None
+
+        cube = _cube
+        if cube is None and os.path.exists(CUBE_SNAPSHOT):
+            try:
+                cube = PulseCube.load(CUBE_SNAPSHOT)
+            except (OSError, ValueError, KeyError) as e:
+                print("⚠️ Ignoring unreadable cube snapshot:", e)
+        if cube is None or (version is not None and cube.version != version):
+            cube = PulseCube.build(read_sql, version)
+            try:
+                cube.save(CUBE_SNAPSHOT)
+            except OSError as e:
+                print("⚠️ Could not write cube snapshot:", e)
+        _cube, _cube_checked = cube, time.monotonic()
+        return _cube
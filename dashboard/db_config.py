@@ -1,14 +1,204 @@
-# dashboard/db_config.py
-import mysql.connector
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-def get_connection():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        database=os.getenv("DB_NAME")
-    )
+# dashboard/db_config.py
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from instrumentation import timed
+
+load_dotenv()
+
+# ------------------ Backend Settings ------------------
+
+# "mysql" (default) or "duckdb" to query the Parquet files written by
+# `python extract_to_mysql.py --target parquet` without a database server
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()
+PARQUET_ROOT = os.getenv("PARQUET_ROOT", os.path.join(os.path.dirname(__file__), "..", "data", "parquet"))
+
+# ------------------ Pool Settings ------------------
+
+POOL_NAME = "phonepe_dashboard"
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 8))               # mysql-connector caps this at 32
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))      # seconds to wait for a free connection
+POOL_RETRY_INTERVAL = 0.01
+
+_pool = None
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "checkouts": 0,
+    "waits": 0,            # checkouts that found the pool empty
+    "timeouts": 0,
+    "in_use": 0,
+    "peak_in_use": 0,
+    "total_wait_s": 0.0,
+    "max_wait_s": 0.0,
+}
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from mysql.connector import pooling  # only the MySQL backend needs the driver
+
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name=POOL_NAME,
+                    pool_size=POOL_SIZE,
+                    pool_reset_session=True,
+                    host=os.getenv("DB_HOST"),
+                    port=int(os.getenv("DB_PORT", 3306)),
+                    user=os.getenv("DB_USER"),
+                    password=os.getenv("DB_PASSWORD"),
+                    database=os.getenv("DB_NAME")
+                )
+    return _pool
+
+
+class PooledConnection:
+    """Borrowed pool connection; close() hands it back and updates the pool metrics."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        with _stats_lock:
+            _stats["in_use"] -= 1
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@timed("db.connect")
+def get_connection(backend=None):
+    if (backend or DB_BACKEND) == "duckdb":
+        return _get_duckdb_connection()
+
+    from mysql.connector.errors import PoolError
+
+    pool = _get_pool()
+    start = time.perf_counter()
+    waited = False
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except PoolError:
+            waited = True
+            if time.perf_counter() - start >= POOL_TIMEOUT:
+                with _stats_lock:
+                    _stats["timeouts"] += 1
+                raise
+            time.sleep(POOL_RETRY_INTERVAL)
+
+    wait = time.perf_counter() - start
+    with _stats_lock:
+        _stats["checkouts"] += 1
+        _stats["waits"] += waited
+        _stats["total_wait_s"] += wait
+        _stats["max_wait_s"] = max(_stats["max_wait_s"], wait)
+        _stats["in_use"] += 1
+        _stats["peak_in_use"] = max(_stats["peak_in_use"], _stats["in_use"])
+    return PooledConnection(conn)
+
+
+def pool_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["pool_size"] = POOL_SIZE
+    stats["avg_wait_ms"] = 1000 * stats["total_wait_s"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    return stats
+
+
+# ------------------ DuckDB Backend ------------------
+
+_duckdb = None
+_duckdb_lock = threading.Lock()
+
+
+def _register_parquet_views(con, root):
+    """Create one view per fact table, rollup and data_version file under root."""
+    root = os.path.abspath(root)
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        if os.path.isdir(path):
+            source = os.path.join(path, "*", "*", "*.parquet").replace(os.sep, "/")
+            con.execute(f"CREATE OR REPLACE VIEW {name} AS "
+                        f"SELECT * FROM read_parquet('{source}', hive_partitioning = true)")
+        elif name.endswith(".parquet"):
+            con.execute(f"CREATE OR REPLACE VIEW {name[:-len('.parquet')]} AS "
+                        f"SELECT * FROM read_parquet('{path.replace(os.sep, '/')}')")
+
+
+def _get_duckdb():
+    global _duckdb
+    if _duckdb is None:
+        with _duckdb_lock:
+            if _duckdb is None:
+                import duckdb
+
+                if not os.path.isdir(PARQUET_ROOT):
+                    raise FileNotFoundError(f"No Parquet data at {PARQUET_ROOT}; "
+                                            "run extract_to_mysql.py --target parquet first")
+                with timed("duckdb.open"):
+                    con = duckdb.connect()
+                    _register_parquet_views(con, PARQUET_ROOT)
+                _duckdb = con
+    return _duckdb
+
+
+class DuckDBCursor:
+    """DB-API cursor over a DuckDB cursor that accepts the MySQL %s placeholders."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, query, params=None):
+        self._cursor.execute(query.replace("%s", "?"), list(params) if params else None)
+        return self
+
+
+class DuckDBConnection:
+    """Per-checkout DuckDB cursor, so threads never share a result set."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return DuckDBCursor(self._cursor.cursor())
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _get_duckdb_connection():
+    con = _get_duckdb().cursor()
+    with _stats_lock:
+        _stats["checkouts"] += 1
+    return DuckDBConnection(con)
@@ -0,0 +1,87 @@
+# dashboard/dimensions.py
+import json
+import os
+from dotenv import load_dotenv
+
+# Stdlib + dotenv only: app.py reads the state/year pickers from here before
+# pandas, plotly or the database driver are imported.
+
+load_dotenv()
+
+# ------------------ Settings ------------------
+# Same defaults as db_config.py / extract_to_mysql.py (importing those would
+# pull in the driver this module exists to avoid)
+
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()
+PARQUET_ROOT = os.getenv("PARQUET_ROOT", os.path.join(os.path.dirname(__file__), "..", "data", "parquet"))
+DIMENSIONS_FILE = "dimensions.json"
+DIMENSIONS_SNAPSHOT = os.getenv("DIMENSIONS_SNAPSHOT", os.path.join(os.path.dirname(__file__), ".dimensions.json"))
+
+
+def snapshot_path():
+    """Where the extractor leaves the snapshot for the configured backend."""
+    if DB_BACKEND == "duckdb":
+        return os.path.join(PARQUET_ROOT, DIMENSIONS_FILE)
+    return DIMENSIONS_SNAPSHOT
+
+
+def database_stamp():
+    """The "database" value the extractor records; None for Parquet (the path identifies it)."""
+    if DB_BACKEND == "duckdb":
+        return None
+    return f"{os.getenv('DB_HOST')}:{int(os.getenv('DB_PORT', 3306))}/{os.getenv('DB_NAME')}"
+
+# ------------------ Snapshot ------------------
+
+_snapshot = (None, None)   # (mtime_ns, parsed file)
+
+
+def load_dimensions():
+    """{"states", "years", "latest"} written by the last extractor run.
+
+    Re-read whenever the file changes. None when there is no snapshot or it
+    describes a different database, so callers fall back to querying.
+    """
+    global _snapshot
+    path = snapshot_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    if _snapshot[0] != mtime:
+        try:
+            with open(path, encoding="utf-8") as f:
+                _snapshot = (mtime, json.load(f))
+        except (OSError, ValueError) as e:
+            print("⚠️ Ignoring unreadable dimension snapshot:", e)
+            return None
+    dims = _snapshot[1]
+    if dims.get("database") != database_stamp() or not dims.get("states"):
+        return None
+    return dims
+
+# ------------------ Picker Values ------------------
+
+def get_states():
+    dims = load_dimensions()
+    if dims is None:
+        from utils import query_states  # no snapshot yet: ask the database
+        return query_states()
+    return list(dims["states"])
+
+
+def get_years():
+    dims = load_dimensions()
+    if dims is None:
+        from utils import query_years
+        return query_years()
+    return list(dims["years"])
+
+
+def latest_quarter():
+    """(year, quarter) of the newest data, or (None, None)."""
+    dims = load_dimensions()
+    if dims is None:
+        from utils import query_latest_quarter
+        return query_latest_quarter()
+    return tuple(dims["latest"]) if dims.get("latest") else (None, None)
@@ -0,0 +1,103 @@
+# dashboard/geo.py
+import json
+import os
+import re
+from functools import lru_cache
+
+# ------------------ Settings ------------------
+
+GEOJSON_PATH = os.path.join(os.path.dirname(__file__), 'states_india.geojson')
+GEOJSON_TOLERANCE = float(os.getenv("GEOJSON_TOLERANCE", 0.01))   # degrees, 0 keeps full resolution
+GEOJSON_PRECISION = int(os.getenv("GEOJSON_PRECISION", 4))         # decimal places kept per coordinate
+
+# ------------------ State Names ------------------
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=512)
+def state_key(name):
+    """Normalised state name used as the feature id: "andhra-pradesh" and "Andhra Pradesh" both map here.
+
+    Same rule as extract/names.normalise(); spellings that differ by more than
+    case and punctuation ("Orissa") are resolved through dim_alias in utils.
+    """
+    return _NON_ALNUM.sub(" ", name.lower().replace("&", " and ")).strip()
+
+# ------------------ Simplification ------------------
+
+def _perpendicular_distance(point, start, end):
+    (x, y), (x1, y1), (x2, y2) = point, start, end
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+    return abs(dy * x - dx * y + x2 * y1 - y2 * x1) / (dx * dx + dy * dy) ** 0.5
+
+
+def simplify_line(points, tolerance):
+    """Douglas-Peucker simplification (iterative, so long rings cannot hit the recursion limit)."""
+    if tolerance <= 0 or len(points) < 3:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_dist, index = 0.0, first
+        for i in range(first + 1, last):
+            dist = _perpendicular_distance(points[i], points[first], points[last])
+            if dist > max_dist:
+                max_dist, index = dist, i
+        if max_dist > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _simplify_ring(ring, tolerance, precision):
+    simplified = simplify_line(ring, tolerance)
+    if len(simplified) < 4:  # a closed ring needs at least 4 positions; keep the original
+        simplified = ring
+    return [[round(x, precision), round(y, precision)] for x, y, *_ in simplified]
+
+
+def _simplify_geometry(geometry, tolerance, precision):
+    if geometry["type"] == "Polygon":
+        rings = [_simplify_ring(r, tolerance, precision) for r in geometry["coordinates"]]
+        return {"type": "Polygon", "coordinates": rings}
+    if geometry["type"] == "MultiPolygon":
+        polygons = [[_simplify_ring(r, tolerance, precision) for r in polygon]
+                    for polygon in geometry["coordinates"]]
+        return {"type": "MultiPolygon", "coordinates": polygons}
+    return geometry
+
+# ------------------ Loading ------------------
+
+@lru_cache(maxsize=4)
+def load_india_geojson(tolerance=GEOJSON_TOLERANCE, precision=GEOJSON_PRECISION):
+    """Load the state boundaries once per process, keyed by state_key() in each feature's id.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    with open(GEOJSON_PATH, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+
+    features = []
+    for feature in raw["features"]:
+        props = feature["properties"]
+        name = props.get("st_nm") or props.get("ST_NM")
+        features.append({
+            "type": "Feature",
+            "id": state_key(name),
+            "properties": {"st_nm": name},
+            "geometry": _simplify_geometry(feature["geometry"], tolerance, precision),
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+@lru_cache(maxsize=4)
+def state_index(tolerance=GEOJSON_TOLERANCE, precision=GEOJSON_PRECISION):
+    """state_key -> position of its feature in load_india_geojson()."""
+    geojson = load_india_geojson(tolerance, precision)
+    return {feature["id"]: i for i, feature in enumerate(geojson["features"])}
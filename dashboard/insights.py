@@ -0,0 +1,229 @@
+# dashboard/insights.py
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()  # Load Gemini key from .env
+
+# ------------------ Settings ------------------
+
+GEMINI_API_URL = os.getenv(
+    "GEMINI_API_URL",
+    "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent")
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", 30))           # seconds per HTTP attempt
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 3))      # extra attempts after the first
+GEMINI_BACKOFF = float(os.getenv("GEMINI_BACKOFF", 1.0))          # base delay, doubled per retry
+GEMINI_CONCURRENCY = int(os.getenv("GEMINI_CONCURRENCY", 4))      # in-flight requests per process
+INSIGHT_CACHE_DIR = os.getenv("INSIGHT_CACHE_DIR", os.path.join(os.path.dirname(__file__), ".insight_cache"))
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# ------------------ Prompt ------------------
+
+def _growth_table(df, columns):
+    shown = df[columns].copy()
+    if "value" in shown:
+        shown["value"] = shown["value"].map("{:,.0f}".format)
+    for col in ("qoq", "yoy", "cagr_3y"):
+        if col in shown:
+            shown[col] = shown[col].map(lambda x: "n/a" if x is None or x != x else f"{x:+.1%}")
+    return shown.to_string(index=False)
+
+
+def growth_summary(growth):
+    """Prompt sections from a state's analytics_growth rows for one quarter."""
+    state = growth[growth["level"] == "state"]
+    types = growth[(growth["level"] == "type") & (growth["measure"] == "txn_amount")]
+    districts = growth[(growth["level"] == "district") & (growth["measure"] == "txn_amount")].dropna(subset=["yoy"])
+    movers = districts.sort_values("yoy")
+    outliers = growth[growth["outlier"].astype(bool)]
+
+    sections = [
+        "State metrics (growth vs last quarter / last year / 3-year CAGR; rank among states, change since last quarter):\n"
+        + _growth_table(state, ["measure", "value", "qoq", "yoy", "cagr_3y", "peer_rank", "rank_change"]),
+        "Transaction types by amount:\n"
+        + _growth_table(types.sort_values("value", ascending=False), ["entity", "value", "qoq", "yoy", "peer_rank"]),
+    ]
+    if not movers.empty:
+        sections.append("Districts with the fastest and slowest year-on-year growth in transaction amount:\n"
+                        + _growth_table(movers.tail(3).iloc[::-1], ["entity", "value", "yoy", "peer_rank"]) + "\n"
+                        + _growth_table(movers.head(3), ["entity", "value", "yoy", "peer_rank"]))
+    if not outliers.empty:
+        sections.append("Unusual quarter-on-quarter moves compared with peers:\n"
+                        + _growth_table(outliers.head(8), ["level", "entity", "measure", "qoq"]))
+    return "\n\n    ".join(sections)
+
+
+def build_prompt(state, year, quarter, df, growth=None):
+    """Prompt for one state and quarter; `growth` (analytics_growth rows) replaces the plain type table."""
+    if growth is not None and not growth.empty:
+        summary = growth_summary(growth)
+    else:
+        summary = "Summary Table:\n    " + df.to_string(index=False)
+    return f"""
+    Analyze PhonePe transaction data for:
+    - State: {state}
+    - Year: {year}
+    - Quarter: Q{quarter}
+
+    {summary}
+
+    Provide:
+    - Key insights in bullet points
+    - Trends, growth patterns or declines
+    - Business suggestions (brief)
+    """
+
+# ------------------ Service ------------------
+
+class InsightError(Exception):
+    pass
+
+
+class InsightService:
+    """Gemini client with an on-disk cache, timeouts, retry/backoff and a concurrency cap.
+
+    Responses are cached under a hash of (api_url, prompt); the prompt embeds
+    the summary table, so a data reload naturally produces new keys. Errors
+    are never cached.
+    """
+
+    def __init__(self, api_url=GEMINI_API_URL, api_key=None, cache_dir=INSIGHT_CACHE_DIR,
+                 timeout=GEMINI_TIMEOUT, max_retries=GEMINI_MAX_RETRIES, backoff=GEMINI_BACKOFF,
+                 max_concurrency=GEMINI_CONCURRENCY):
+        self.api_url = api_url
+        self.api_key = api_key if api_key is not None else os.getenv("GEMINI_API_KEY")
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+        self._local = threading.local()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.stats = {"cache_hits": 0, "api_calls": 0, "retries": 0, "errors": 0}
+        self._stats_lock = threading.Lock()  # updated from the prefetch threads
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    # ---- cache ----
+
+    def cache_key(self, prompt):
+        return hashlib.sha256(f"{self.api_url}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def cached(self, prompt):
+        path = self._cache_path(self.cache_key(prompt))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["text"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store(self, key, text):
+        path = self._cache_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "api_url": self.api_url, "text": text}, f)
+        os.replace(tmp_path, path)
+
+    # ---- HTTP ----
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _post(self, prompt):
+        headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self.api_key or ""
+        }
+        data = {"contents": [{"parts": [{"text": prompt}]}]}
+
+        for attempt in range(self.max_retries + 1):
+            delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+            try:
+                with self._slots:
+                    self._count("api_calls")
+                    response = self._session().post(self.api_url, headers=headers, json=data,
+                                                     timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code == 200:
+                    try:
+                        return response.json()['candidates'][0]['content']['parts'][0]['text']
+                    except (ValueError, KeyError, IndexError):
+                        raise InsightError(f"Unexpected Gemini response: {response.text[:500]}")
+                if response.status_code not in RETRY_STATUS:
+                    raise InsightError(response.text)
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+
+            if attempt == self.max_retries:
+                raise InsightError(error)
+            self._count("retries")
+            time.sleep(delay)
+
+    # ---- public API ----
+
+    def generate(self, prompt):
+        """Return the insight text for prompt, from the disk cache when possible."""
+        with self._inflight_lock:
+            future = self._inflight.get(self.cache_key(prompt))
+        if future is not None:  # already being prefetched; wait for that call
+            return future.result()
+        return self._generate(prompt)
+
+    def _generate(self, prompt):
+        text = self.cached(prompt)
+        if text is not None:
+            self._count("cache_hits")
+            return text
+        try:
+            text = self._post(prompt)
+        except InsightError as e:
+            self._count("errors")
+            return f"❌ Gemini API Error: {e}"
+        self._store(self.cache_key(prompt), text)
+        return text
+
+    def submit(self, prompt):
+        """Generate in the background; identical in-flight prompts share one Future."""
+        key = self.cache_key(prompt)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._inflight[key] = self._executor.submit(self._generate, prompt)
+        # outside the lock: the callback runs immediately if the call already finished
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key):
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+
+    def prefetch(self, prompts):
+        """Warm the cache for many prompts without blocking; returns the Futures."""
+        return [self.submit(p) for p in prompts if self.cached(p) is None]
+
+
+insight_service = InsightService()
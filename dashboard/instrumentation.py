@@ -0,0 +1,171 @@
+# dashboard/instrumentation.py
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+# ------------------ Settings ------------------
+
+# INSTRUMENTATION_LOG=1 writes one JSON line per timed call to the "pulse.timing" logger
+LOG_SPANS = os.getenv("INSTRUMENTATION_LOG") == "1"
+MAX_TRACE_SPANS = 2000
+
+logger = logging.getLogger("pulse.timing")
+
+# ------------------ Spans ------------------
+
+_trace = contextvars.ContextVar("pulse_trace", default=None)     # spans of the current rerun
+_parent = contextvars.ContextVar("pulse_parent", default=None)   # enclosing span, for nesting
+
+_totals_lock = threading.Lock()
+_totals = {}   # name -> {"count", "seconds", "max_seconds", "rows", "bytes", "errors"}
+
+
+class Span:
+    """One timed call. Set .rows / .bytes inside the block to record result sizes."""
+
+    __slots__ = ("name", "parent", "tags", "rows", "bytes", "start", "seconds", "error", "_token")
+
+    def __init__(self, name, **tags):
+        self.name = name
+        self.parent = None
+        self.tags = tags
+        self.rows = None
+        self.bytes = None
+        self.start = None
+        self.seconds = None
+        self.error = None
+
+    def __enter__(self):
+        parent = _parent.get()
+        self.parent = parent.name if parent is not None else None
+        self._token = _parent.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        _parent.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _record(self)
+        return False
+
+    def as_dict(self):
+        return {"name": self.name, "parent": self.parent, "seconds": self.seconds, "rows": self.rows,
+                "bytes": self.bytes, "error": self.error, **self.tags}
+
+
+def timed(name=None, **tags):
+    """Time a block (`with timed("sql.query") as span:`) or a function (`@timed()`)."""
+    if callable(name):  # bare @timed
+        return timed()(name)
+
+    class _Timed:
+        def __enter__(self):
+            self.span = Span(name, **tags)
+            return self.span.__enter__()
+
+        def __exit__(self, *exc):
+            return self.span.__exit__(*exc)
+
+        def __call__(self, fn):
+            span_name = name or f"{fn.__module__}.{fn.__name__}"
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with Span(span_name, **tags):
+                    return fn(*args, **kwargs)
+            return wrapper
+
+    return _Timed()
+
+
+def _record(span):
+    with _totals_lock:
+        totals = _totals.setdefault(span.name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                                "rows": 0, "bytes": 0, "errors": 0})
+        totals["count"] += 1
+        totals["seconds"] += span.seconds
+        totals["max_seconds"] = max(totals["max_seconds"], span.seconds)
+        totals["rows"] += span.rows or 0
+        totals["bytes"] += span.bytes or 0
+        totals["errors"] += span.error is not None
+
+    trace = _trace.get()
+    if trace is not None and len(trace) < MAX_TRACE_SPANS:
+        trace.append(span)  # list.append is atomic; worker threads share the rerun's list
+    if LOG_SPANS:
+        logger.info(json.dumps(span.as_dict(), default=str))
+
+# ------------------ Per-Rerun Trace ------------------
+
+def start_trace():
+    """Collect every span of this rerun (including fetch_many worker threads) into a new list."""
+    trace = []
+    _trace.set(trace)
+    return trace
+
+
+def current_trace():
+    return _trace.get() or []
+
+
+def run_in_context(executor, fn, *args):
+    """executor.submit() that carries the current trace into the worker thread."""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def summarize_trace(spans=None):
+    """Aggregate spans by name with self time (time not spent in nested spans)."""
+    spans = current_trace() if spans is None else spans
+    rows = {}
+    for span in spans:
+        row = rows.setdefault(span.name, {"name": span.name, "calls": 0, "seconds": 0.0, "self_seconds": 0.0,
+                                          "rows": 0, "bytes": 0})
+        row["calls"] += 1
+        row["seconds"] += span.seconds
+        row["self_seconds"] += span.seconds
+        row["rows"] += span.rows or 0
+        row["bytes"] += span.bytes or 0
+    for span in spans:
+        if span.parent in rows:
+            rows[span.parent]["self_seconds"] -= span.seconds
+    for row in rows.values():
+        row["self_seconds"] = max(row["self_seconds"], 0.0)
+    return sorted(rows.values(), key=lambda r: r["seconds"], reverse=True)
+
+# ------------------ Export ------------------
+
+def timing_totals():
+    with _totals_lock:
+        return {name: dict(values) for name, values in _totals.items()}
+
+
+def reset_totals():
+    with _totals_lock:
+        _totals.clear()
+
+
+def prometheus_text(prefix="pulse_dashboard"):
+    """Process-wide totals in the Prometheus text exposition format."""
+    metrics = [
+        ("calls_total", "counter", "count", "Timed calls"),
+        ("seconds_total", "counter", "seconds", "Seconds spent in timed calls"),
+        ("seconds_max", "gauge", "max_seconds", "Slowest single call"),
+        ("rows_total", "counter", "rows", "Rows returned"),
+        ("bytes_total", "counter", "bytes", "Payload bytes produced"),
+        ("errors_total", "counter", "errors", "Calls that raised"),
+    ]
+    totals = timing_totals()
+    lines = []
+    for suffix, kind, key, help_text in metrics:
+        metric = f"{prefix}_{suffix}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, values in sorted(totals.items()):
+            lines.append(f'{metric}{{name="{name}"}} {values[key]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,92 @@
+# dashboard/query_cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# ------------------ Cache Settings ------------------
+
+CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", 3600))                  # seconds an entry stays fresh
+CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", 256))                   # max entries before LRU eviction
+VERSION_CHECK_INTERVAL = float(os.getenv("QUERY_CACHE_VERSION_CHECK", 30))
+
+# Bumped by the extractor after every load; a change clears the cache
+DATA_VERSION_QUERY = "SELECT version FROM data_version WHERE id = 1;"
+
+
+class QueryCache:
+    """Thread-safe TTL + LRU cache for query results, keyed on (query, params)."""
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL, version_check_interval=VERSION_CHECK_INTERVAL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(self, key, load):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = load()
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, predicate=None):
+        """Drop every entry, or only those whose key matches predicate(key)."""
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if predicate(k)]:
+                    del self._entries[key]
+
+    def check_version(self, fetch_version):
+        """Clear the cache when the data version reported by fetch_version() changes.
+
+        fetch_version is only called once per version_check_interval seconds.
+        """
+        now = time.monotonic()
+        if now - self._version_checked < self.version_check_interval:
+            return
+        self._version_checked = now
+
+        try:
+            version = fetch_version()
+        except Exception:
+            return  # no version table yet; rely on the TTL
+        if version != self._version:
+            if self._version is not None:
+                self.invalidate()
+            self._version = version
+
+    @property
+    def version(self):
+        """Data version seen by the last check_version() (None before the first)."""
+        return self._version
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        return {"entries": size, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "data_version": self._version}
+
+
+query_cache = QueryCache()
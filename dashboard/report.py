@@ -0,0 +1,103 @@
+# dashboard/report.py
+import io
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from fpdf import FPDF, set_global
+
+# ------------------ Settings ------------------
+
+FONT_FAMILY = "DejaVu"
+FONT_PATH = os.path.join(os.path.dirname(__file__), "assets", "dejavu-fonts-ttf-2.37", "ttf", "DejaVuSans.ttf")
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", os.cpu_count() or 2))
+
+# ------------------ Fonts ------------------
+# add_font(uni=True) parses the whole TTF; do it once per process and hand
+# each new document a copy of the parsed metrics instead.
+
+set_global("FPDF_CACHE_MODE", 1)  # no .pkl font caches written next to the TTF
+
+_font_lock = threading.Lock()
+_font = None
+
+
+def _load_font():
+    global _font
+    with _font_lock:
+        if _font is None:
+            proto = FPDF()
+            proto.add_font(FONT_FAMILY, "", FONT_PATH, uni=True)
+            _font = (proto.fonts[FONT_FAMILY.lower()], dict(proto.font_files))
+    return _font
+
+
+def pdf_text(text):
+    """Drop characters the font has no glyph for (emoji from Gemini would crash output())."""
+    widths = _load_font()[0]["cw"]
+    return "".join(c for c in text if ord(c) < len(widths) and (widths[ord(c)] or c in "\n\t"))
+
+
+def _register_font(pdf):
+    key = FONT_FAMILY.lower()
+    font, font_files = _load_font()
+    # Per-document copies: the writer records object numbers and used glyphs on these
+    pdf.fonts[key] = dict(font, i=len(pdf.fonts) + 1, subset=list(font["subset"]))
+    pdf.font_files.update({name: dict(entry) for name, entry in font_files.items()})
+
+# ------------------ Reports ------------------
+
+class InsightPDF(FPDF):
+    def header(self):
+        self.set_font(FONT_FAMILY, '', 14)
+        self.cell(0, 10, pdf_text("📊 PhonePe AI Insight Report").strip(), ln=True, align="C")
+        self.ln(10)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font(FONT_FAMILY, '', 8)
+        self.cell(0, 10, f"Page {self.page_no()}", 0, 0, "C")
+
+
+def report_filename(state, year, quarter):
+    return f"insight_{state}_{year}_Q{quarter}.pdf"
+
+
+def build_report(state, year, quarter, insight):
+    """Render one insight report and return the PDF bytes (nothing touches the disk)."""
+    pdf = InsightPDF()
+    _register_font(pdf)  # must come BEFORE pdf.add_page()
+    pdf.set_font(FONT_FAMILY, "", 12)
+
+    pdf.add_page()
+    text = f"📊 PhonePe AI Insight Report\n\nState: {state}\nYear: {year}\nQuarter: Q{quarter}\n\n{insight}"
+    pdf.multi_cell(0, 10, pdf_text(text).strip())
+
+    data = pdf.output(dest="S")
+    return data.encode("latin-1") if isinstance(data, str) else bytes(data)
+
+
+def _build_named_report(item):
+    state, year, quarter, insight = item
+    return report_filename(state, year, quarter), build_report(state, year, quarter, insight)
+
+
+def build_report_pack(items, workers=REPORT_WORKERS):
+    """Render (state, year, quarter, insight) items in parallel and return one zip as bytes.
+
+    PDF layout is pure Python, so the pages are built in worker processes;
+    each worker parses the font once and reuses it for all of its reports.
+    """
+    items = list(items)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        if workers > 1 and len(items) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+                reports = pool.map(_build_named_report, items, chunksize=4)
+                for name, data in reports:
+                    archive.writestr(name, data)
+        else:
+            for item in items:
+                archive.writestr(*_build_named_report(item))
+    return buffer.getvalue()
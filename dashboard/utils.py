@@ -1,191 +1,464 @@
-import pandas as pd
-import plotly.express as px
-from db_config import get_connection
-import json
-import os
-import requests
-from dotenv import load_dotenv
-
-load_dotenv()  # Load Gemini key from .env
-
-# ------------------ Basic Utilities ------------------
-
-def get_states():
-    conn = get_connection()
-    query = "SELECT DISTINCT state FROM aggregated_transaction ORDER BY state;"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df['state'].tolist()
-
-def get_years():
-    conn = get_connection()
-    query = "SELECT DISTINCT year FROM aggregated_transaction ORDER BY year;"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df['year'].tolist()
-
-# ------------------ Visualizations ------------------
-
-def get_transaction_insights(state, year):
-    conn = get_connection()
-    query = """
-    SELECT transaction_type, SUM(amount) as total_amount
-    FROM aggregated_transaction
-    WHERE state = %s AND year = %s
-    GROUP BY transaction_type
-    ORDER BY total_amount DESC;
-    """
-    df = pd.read_sql(query, conn, params=(state, year))
-    conn.close()
-    fig = px.bar(df, x='transaction_type', y='total_amount',
-                 title=f'{state} - Transaction Types ({year})')
-    return fig
-
-def plot_total_transaction_by_state():
-    conn = get_connection()
-    query = "SELECT state, SUM(amount) AS total FROM aggregated_transaction GROUP BY state;"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    fig = px.bar(df, x='state', y='total', title="Total Transaction Amount by State", color='total')
-    return fig
-
-def plot_total_users_by_state():
-    conn = get_connection()
-    query = "SELECT state, SUM(registered_users) AS total FROM map_user GROUP BY state;"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    fig = px.bar(df, x='state', y='total', title="Total Registered Users by State", color='total')
-    return fig
-
-def plot_district_transactions(state):
-    conn = get_connection()
-    query = "SELECT district, SUM(amount) AS total FROM map_transaction WHERE state = %s GROUP BY district;"
-    df = pd.read_sql(query, conn, params=(state,))
-    conn.close()
-    fig = px.bar(df, x='district', y='total', title=f"{state} - Transactions by District")
-    return fig
-
-def plot_district_users(state):
-    conn = get_connection()
-    query = "SELECT district, SUM(registered_users) AS total FROM map_user WHERE state = %s GROUP BY district;"
-    df = pd.read_sql(query, conn, params=(state,))
-    conn.close()
-    fig = px.bar(df, x='district', y='total', title=f"{state} - Registered Users by District")
-    return fig
-
-def plot_quarterly_transactions(state, year):
-    conn = get_connection()
-    query = """
-    SELECT quarter, SUM(amount) AS total
-    FROM aggregated_transaction
-    WHERE state = %s AND year = %s
-    GROUP BY quarter ORDER BY quarter;
-    """
-    df = pd.read_sql(query, conn, params=(state, year))
-    conn.close()
-    fig = px.line(df, x='quarter', y='total', markers=True,
-                  title=f"{state} - Quarterly Transaction Amount ({year})")
-    return fig
-
-def plot_quarterly_app_opens(state, year):
-    conn = get_connection()
-    query = """
-    SELECT quarter, SUM(app_opens) AS total
-    FROM map_user
-    WHERE state = %s AND year = %s
-    GROUP BY quarter ORDER BY quarter;
-    """
-    df = pd.read_sql(query, conn, params=(state, year))
-    conn.close()
-    fig = px.line(df, x='quarter', y='total', markers=True,
-                  title=f"{state} - Quarterly App Opens ({year})")
-    return fig
-
-# ------------------ Geo Visualization ------------------
-
-def plot_geo_transaction(year, quarter):
-    geojson_path = os.path.join(os.path.dirname(__file__), 'states_india.geojson')
-    with open(geojson_path, 'r', encoding='utf-8') as f:
-        india_geojson = json.load(f)
-
-    for feature in india_geojson["features"]:
-        feature["properties"]["st_nm"] = feature["properties"]["st_nm"].title().strip()
-
-    conn = get_connection()
-    query = """
-    SELECT state, SUM(amount) AS total
-    FROM aggregated_transaction
-    WHERE year = %s AND quarter = %s
-    GROUP BY state;
-    """
-    df = pd.read_sql(query, conn, params=(year, quarter))
-    conn.close()
-    df['state'] = df['state'].str.title().str.strip()
-
-    fig = px.choropleth_mapbox(
-        df,
-        geojson=india_geojson,
-        locations='state',
-        featureidkey="properties.st_nm",
-        color='total',
-        color_continuous_scale="YlOrBr",
-        mapbox_style="carto-positron",
-        zoom=3.5,
-        center={"lat": 23.5937, "lon": 80.9629},
-        opacity=0.8,
-        title=f"🗺️ India State-wise Transactions in Q{quarter} {year}",
-        height=650
-    )
-    fig.update_layout(margin={"r": 0, "t": 50, "l": 0, "b": 0})
-    return fig
-
-# ------------------ Gemini AI Summary ------------------
-
-def generate_gemini_insight(state, year, quarter):
-    conn = get_connection()
-    query = """
-    SELECT transaction_type, SUM(amount) as total_amount
-    FROM aggregated_transaction
-    WHERE state = %s AND year = %s AND quarter = %s
-    GROUP BY transaction_type
-    ORDER BY total_amount DESC;
-    """
-    df = pd.read_sql(query, conn, params=(state, year, quarter))
-    conn.close()
-
-    if df.empty:
-        return "❌ No data found for this selection."
-
-    prompt = f"""
-    Analyze PhonePe transaction data for:
-    - State: {state}
-    - Year: {year}
-    - Quarter: Q{quarter}
-
-    Summary Table:
-    {df.to_string(index=False)}
-
-    Provide:
-    - Key insights in bullet points
-    - Trends, growth patterns or declines
-    - Business suggestions (brief)
-    """
-
-    headers = {
-        "Content-Type": "application/json",
-        "x-goog-api-key": os.getenv("GEMINI_API_KEY")
-    }
-
-    data = {
-        "contents": [{
-            "parts": [{"text": prompt}]
-        }]
-    }
-
-    url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
-    response = requests.post(url, headers=headers, json=data)
-
-    if response.status_code == 200:
-        return response.json()['candidates'][0]['content']['parts'][0]['text']
-    else:
-        return f"❌ Gemini API Error: {response.text}"
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from db_config import get_connection, POOL_SIZE
+from query_cache import query_cache, DATA_VERSION_QUERY
+from geo import load_india_geojson, state_index, state_key
+from instrumentation import timed, run_in_context
+from cube import CUBE_ENABLED, get_cube
+from dimensions import get_states, get_years, latest_quarter  # noqa: F401 - snapshot first, queries below
+import os
+
+# plotly.express (~0.5s) and insights.py (requests) load on first use, so
+# tabs that never draw a chart or call Gemini do not pay for them
+
+def _px():
+    import plotly.express as px
+    return px
+
+def _insights():
+    import insights
+    return insights
+
+# ------------------ Data Access ------------------
+
+def _read_sql(query, params=None):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        with timed("sql.query") as span:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            span.rows = len(rows)
+        columns = [c[0] for c in cursor.description]
+        cursor.close()
+    finally:
+        conn.close()
+    with timed("pandas.frame") as span:
+        df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+        span.rows = len(df)
+        span.bytes = int(df.memory_usage(deep=True).sum())
+    return df
+
+def _fetch_data_version():
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(DATA_VERSION_QUERY)
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+@timed("query.fetch_df")
+def fetch_df(query, params=None):
+    """Run a query through the shared result cache; callers get their own copy of the frame."""
+    query_cache.check_version(_fetch_data_version)
+    params = tuple(params) if params else None
+    df = query_cache.get_or_load((query, params), lambda: _read_sql(query, params))
+    return df.copy()
+
+def data_version():
+    """Current data version, re-read at most every QUERY_CACHE_VERSION_CHECK seconds."""
+    query_cache.check_version(_fetch_data_version)
+    return query_cache.version
+
+def invalidate_cache():
+    query_cache.invalidate()
+
+# ------------------ Concurrent Loading ------------------
+# A tab's charts are independent, so their queries run side by side on pooled
+# connections and the tab waits for the slowest one instead of the sum.
+
+FETCH_WORKERS = int(os.getenv("DASHBOARD_FETCH_WORKERS", min(4, POOL_SIZE)))
+_fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="fetch")
+
+def fetch_many(requests_by_name):
+    """Run {name: (query, params)} concurrently and return {name: DataFrame}.
+
+    Cache hits return immediately; the first failing query re-raises here.
+    """
+    futures = {name: run_in_context(_fetch_executor, query_frame, query, params)
+               for name, (query, params) in requests_by_name.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+# Queries behind each chart, shared by the plot helpers and the tab loaders
+STATES_QUERY = "SELECT state FROM rollup_state_totals ORDER BY state;"
+YEARS_QUERY = "SELECT DISTINCT year FROM rollup_state_quarter ORDER BY year;"
+DISTRICT_TXN_QUERY = "SELECT district, txn_amount AS total FROM rollup_state_district WHERE state = %s;"
+DISTRICT_USERS_QUERY = "SELECT district, registered_users AS total FROM rollup_state_district WHERE state = %s;"
+GEO_QUERY = """
+    SELECT state, txn_amount AS total
+    FROM rollup_state_quarter
+    WHERE year = %s AND quarter = %s;
+    """
+STATE_TXN_TOTALS_QUERY = "SELECT state, txn_amount AS total FROM rollup_state_totals;"
+STATE_USER_TOTALS_QUERY = "SELECT state, registered_users AS total FROM rollup_state_totals;"
+QUARTERLY_TXN_QUERY = """
+    SELECT quarter, txn_amount AS total
+    FROM rollup_state_quarter
+    WHERE state = %s AND year = %s
+    ORDER BY quarter;
+    """
+QUARTERLY_APP_OPENS_QUERY = """
+    SELECT quarter, app_opens AS total
+    FROM rollup_state_quarter
+    WHERE state = %s AND year = %s
+    ORDER BY quarter;
+    """
+TYPE_INSIGHTS_QUERY = """
+    SELECT transaction_type, amount as total_amount
+    FROM rollup_type_state_year
+    WHERE state = %s AND year = %s
+    ORDER BY total_amount DESC;
+    """
+
+# ------------------ Entity Drilldowns ------------------
+# District and pincode charts never ship every entity to the browser: the
+# database ranks them, keeps the top N and folds the rest into one "Others"
+# bar, and the full list is paged through a sorted LIMIT/OFFSET table.
+
+TOP_N = int(os.getenv("DASHBOARD_TOP_N", 15))
+PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", 25))
+OTHERS = "Others"
+
+# (name, total) per entity. District sources take (state,); pincode sources
+# (state, year, quarter), which is a prefix of the top_* primary keys.
+ENTITY_SOURCES = {
+    "district_txn": "SELECT district AS name, txn_amount AS total FROM rollup_state_district WHERE state = %s",
+    "district_users": "SELECT district AS name, registered_users AS total FROM rollup_state_district WHERE state = %s",
+    "pincode_txn": """SELECT name, amount AS total FROM top_map
+        WHERE state = %s AND year = %s AND quarter = %s AND entity_type = 'pincode'""",
+    "pincode_txn_count": """SELECT name, count AS total FROM top_map
+        WHERE state = %s AND year = %s AND quarter = %s AND entity_type = 'pincode'""",
+    "pincode_users": """SELECT pincode AS name, registered_users AS total FROM top_user
+        WHERE state = %s AND year = %s AND quarter = %s""",
+    "pincode_insurance": """SELECT name, amount AS total FROM top_insurance
+        WHERE state = %s AND year = %s AND quarter = %s AND entity_type = 'pincode'""",
+}
+
+# Params: (n,) + source params. Others (if any) is the last row; `entities` counts what each row covers.
+TOP_QUERIES = {kind: f"""
+    SELECT CASE WHEN rn <= %s THEN name ELSE '{OTHERS}' END AS name, SUM(total) AS total, COUNT(*) AS entities
+    FROM (SELECT name, total, ROW_NUMBER() OVER (ORDER BY total DESC, name) AS rn FROM ({sql}) e) ranked
+    GROUP BY 1
+    ORDER BY MIN(rn);
+    """ for kind, sql in ENTITY_SOURCES.items()}
+
+# Params: source params + (limit, offset)
+PAGE_QUERIES = {kind: f"SELECT name, total FROM ({sql}) e ORDER BY total DESC, name LIMIT %s OFFSET %s;"
+                for kind, sql in ENTITY_SOURCES.items()}
+COUNT_QUERIES = {kind: f"SELECT COUNT(*) AS entities FROM ({sql}) e;" for kind, sql in ENTITY_SOURCES.items()}
+
+def sort_entities(df):
+    return df.sort_values(["total", "name"], ascending=[False, True], kind="stable").reset_index(drop=True)
+
+def top_n_frame(df, n):
+    """TOP_QUERIES in pandas: (name, total) -> top n rows plus one Others row."""
+    df = sort_entities(df)
+    top = df.iloc[:n].assign(entities=1)
+    if len(df) > n:
+        others = pd.DataFrame({"name": [OTHERS], "total": [df["total"].iloc[n:].sum()], "entities": [len(df) - n]})
+        top = pd.concat([top, others], ignore_index=True)
+    return top
+
+# ------------------ In-Memory Cube ------------------
+# With DASHBOARD_CUBE=1 the chart queries above are answered from a NumPy cube
+# (see cube.py) built once from the fact tables, instead of a DB round trip.
+
+CUBE_FRAMES = {
+    STATES_QUERY: lambda cube: pd.DataFrame({"state": cube.state_list()}),
+    YEARS_QUERY: lambda cube: pd.DataFrame({"year": cube.year_list()}),
+    GEO_QUERY: lambda cube, year, quarter: cube.state_quarter_slice(year, quarter),
+    STATE_TXN_TOTALS_QUERY: lambda cube: cube.state_totals("txn_amount"),
+    STATE_USER_TOTALS_QUERY: lambda cube: cube.state_totals("registered_users"),
+    DISTRICT_TXN_QUERY: lambda cube, state: cube.districts_of(state, "txn_amount"),
+    DISTRICT_USERS_QUERY: lambda cube, state: cube.districts_of(state, "registered_users"),
+    QUARTERLY_TXN_QUERY: lambda cube, state, year: cube.quarterly(state, year, "txn_amount"),
+    QUARTERLY_APP_OPENS_QUERY: lambda cube, state, year: cube.quarterly(state, year, "app_opens"),
+    TYPE_INSIGHTS_QUERY: lambda cube, state, year: cube.types_of(state, year),
+}
+
+def _cube_districts(cube, state, measure):
+    return cube.districts_of(state, measure).rename(columns={"district": "name"})
+
+for _kind, _measure in (("district_txn", "txn_amount"), ("district_users", "registered_users")):
+    CUBE_FRAMES.update({
+        TOP_QUERIES[_kind]: lambda cube, n, state, m=_measure: top_n_frame(_cube_districts(cube, state, m), n),
+        PAGE_QUERIES[_kind]: lambda cube, state, limit, offset, m=_measure:
+            sort_entities(_cube_districts(cube, state, m)).iloc[offset:offset + limit].reset_index(drop=True),
+        COUNT_QUERIES[_kind]: lambda cube, state, m=_measure:
+            pd.DataFrame({"entities": [len(_cube_districts(cube, state, m))]}),
+    })
+
+def _get_cube():
+    with timed("cube.load"):
+        return get_cube(_read_sql, _fetch_data_version, query_cache.version_check_interval)
+
+def query_frame(query, params=None):
+    """fetch_df(), served from the in-memory cube when it is enabled and covers the query."""
+    if CUBE_ENABLED and query in CUBE_FRAMES:
+        cube = _get_cube()
+        with timed("cube.query") as span:
+            df = CUBE_FRAMES[query](cube, *(params or ()))
+            span.rows = len(df)
+        return df
+    return fetch_df(query, params)
+
+@timed("tab.geo")
+def load_geo_tab(year, quarter):
+    """Frames for the Overall Geo tab: geo, txn_by_state, users_by_state."""
+    return fetch_many({
+        "geo": (GEO_QUERY, (year, quarter)),
+        "txn_by_state": (STATE_TXN_TOTALS_QUERY, None),
+        "users_by_state": (STATE_USER_TOTALS_QUERY, None),
+    })
+
+@timed("tab.trends")
+def load_trends_tab(state, year):
+    """Frames for the Year & Month Trends tab: quarterly_txn, quarterly_app_opens, type_insights."""
+    params = (state, year)
+    return fetch_many({
+        "quarterly_txn": (QUARTERLY_TXN_QUERY, params),
+        "quarterly_app_opens": (QUARTERLY_APP_OPENS_QUERY, params),
+        "type_insights": (TYPE_INSIGHTS_QUERY, params),
+    })
+
+# ------------------ Basic Utilities ------------------
+# Chart helpers read the rollup_* tables the extractor rebuilds after each load
+# (see extract/rollups.py), so page latency does not grow with the raw tables.
+# get_states()/get_years()/latest_quarter() come from dimensions.py, which
+# reads the extractor's snapshot and only falls back to these queries.
+
+def query_states():
+    df = query_frame(STATES_QUERY)
+    return df['state'].tolist()
+
+def query_years():
+    df = query_frame(YEARS_QUERY)
+    return df['year'].tolist()
+
+def query_latest_quarter():
+    df = fetch_df("SELECT year, quarter FROM rollup_state_quarter ORDER BY year DESC, quarter DESC LIMIT 1;")
+    return (int(df['year'].iloc[0]), int(df['quarter'].iloc[0])) if not df.empty else (None, None)
+
+# ------------------ Visualizations ------------------
+
+@timed("chart.get_transaction_insights")
+def get_transaction_insights(state, year, df=None):
+    if df is None:
+        df = query_frame(TYPE_INSIGHTS_QUERY, params=(state, year))
+    fig = _px().bar(df, x='transaction_type', y='total_amount',
+                 title=f'{state} - Transaction Types ({year})')
+    return fig
+
+@timed("chart.plot_total_transaction_by_state")
+def plot_total_transaction_by_state(df=None):
+    if df is None:
+        df = query_frame(STATE_TXN_TOTALS_QUERY)
+    fig = _px().bar(df, x='state', y='total', title="Total Transaction Amount by State", color='total')
+    return fig
+
+@timed("chart.plot_total_users_by_state")
+def plot_total_users_by_state(df=None):
+    if df is None:
+        df = query_frame(STATE_USER_TOTALS_QUERY)
+    fig = _px().bar(df, x='state', y='total', title="Total Registered Users by State", color='total')
+    return fig
+
+def top_entities(kind, params, n=TOP_N):
+    """Top n entities of ENTITY_SOURCES[kind] by total, the rest summed into a final Others row."""
+    return query_frame(TOP_QUERIES[kind], params=(int(n),) + tuple(params))
+
+def entity_page(kind, params, page=1, page_size=PAGE_SIZE):
+    """(one page of entities sorted by total, number of entities); pages start at 1."""
+    params = tuple(params)
+    frames = fetch_many({
+        "rows": (PAGE_QUERIES[kind], params + (int(page_size), (int(page) - 1) * int(page_size))),
+        "count": (COUNT_QUERIES[kind], params),
+    })
+    return frames["rows"], int(frames["count"]["entities"].iloc[0])
+
+def _plot_top(df, title, entity):
+    others = df.loc[df['name'] == OTHERS, 'entities'].sum()
+    if others:
+        title += f" (top {len(df) - 1} + {others} others)"
+    return _px().bar(df, x='name', y='total', title=title, labels={"name": entity})
+
+@timed("chart.plot_district_transactions")
+def plot_district_transactions(state, top_n=TOP_N):
+    df = top_entities("district_txn", (state,), top_n)
+    return _plot_top(df, f"{state} - Transactions by District", "district")
+
+@timed("chart.plot_district_users")
+def plot_district_users(state, top_n=TOP_N):
+    df = top_entities("district_users", (state,), top_n)
+    return _plot_top(df, f"{state} - Registered Users by District", "district")
+
+PINCODE_MEASURES = {
+    "pincode_txn": "Transaction Amount",
+    "pincode_txn_count": "Transaction Count",
+    "pincode_users": "Registered Users",
+    "pincode_insurance": "Insurance Premium",
+}
+
+@timed("chart.plot_pincodes")
+def plot_pincodes(kind, state, year, quarter, top_n=TOP_N):
+    df = top_entities(kind, (state, year, quarter), top_n)
+    return _plot_top(df, f"{state} - {PINCODE_MEASURES[kind]} by Pincode (Q{quarter} {year})", "pincode")
+
+@timed("chart.plot_quarterly_transactions")
+def plot_quarterly_transactions(state, year, df=None):
+    if df is None:
+        df = query_frame(QUARTERLY_TXN_QUERY, params=(state, year))
+    fig = _px().line(df, x='quarter', y='total', markers=True,
+                  title=f"{state} - Quarterly Transaction Amount ({year})")
+    return fig
+
+@timed("chart.plot_quarterly_app_opens")
+def plot_quarterly_app_opens(state, year, df=None):
+    if df is None:
+        df = query_frame(QUARTERLY_APP_OPENS_QUERY, params=(state, year))
+    fig = _px().line(df, x='quarter', y='total', markers=True,
+                  title=f"{state} - Quarterly App Opens ({year})")
+    return fig
+
+# ------------------ Geo Visualization ------------------
+# The extractor's name index (extract/names.py) records every spelling of a
+# state, including the GeoJSON ones ("Orissa", "Dadara & Nagar Havelli"), so
+# slugs are matched to boundaries with one lookup per data version
+
+STATE_ALIAS_QUERY = """
+    SELECT s.slug, a.raw_name
+    FROM dim_alias a JOIN dim_state s ON s.state_id = a.entity_id
+    WHERE a.kind = 'state';
+    """
+
+def _load_state_geo_keys():
+    features = state_index()
+    try:
+        aliases = _read_sql(STATE_ALIAS_QUERY)
+    except Exception as e:  # loads from before the name index: fall back to state_key() alone
+        print("⚠️ Name index unavailable:", e)
+        return {}
+    keys = {}
+    for slug, raw_name in aliases.itertuples(index=False):
+        key = state_key(raw_name)
+        if key in features and key not in keys.setdefault(slug, []):
+            keys[slug].append(key)
+    return keys
+
+def state_geo_keys():
+    """{state slug: [GeoJSON feature ids]}, cached until the next load."""
+    query_cache.check_version(_fetch_data_version)
+    return query_cache.get_or_load(("state_geo_keys",), _load_state_geo_keys)
+
+
+@timed("chart.plot_geo_transaction")
+def plot_geo_transaction(year, quarter, df=None):
+    with timed("geojson.load"):
+        india_geojson = load_india_geojson()  # cached, pre-normalised and simplified
+
+    if df is None:
+        df = query_frame(GEO_QUERY, params=(year, quarter))
+    keys = state_geo_keys()
+    df['state'] = df['state'].map(lambda s: keys.get(s) or [state_key(s)])
+    df = df.explode('state')  # a merged UT colours each of its older boundaries
+    df = df[df['state'].isin(state_index())]  # rows without a boundary would not render anyway
+
+    fig = _px().choropleth_mapbox(
+        df,
+        geojson=india_geojson,
+        locations='state',
+        featureidkey="id",
+        color='total',
+        color_continuous_scale="YlOrBr",
+        mapbox_style="carto-positron",
+        zoom=3.5,
+        center={"lat": 23.5937, "lon": 80.9629},
+        opacity=0.8,
+        title=f"🗺️ India State-wise Transactions in Q{quarter} {year}",
+        height=650
+    )
+    fig.update_layout(margin={"r": 0, "t": 50, "l": 0, "b": 0})
+    return fig
+
+# ------------------ Growth Analytics ------------------
+# analytics_growth is rebuilt by the extractor (extract/analytics.py): QoQ/YoY
+# growth, 3-year CAGR, peer ranks and outlier flags per state, district and type
+
+GROWTH_QUERY = """
+    SELECT level, entity, measure, value, qoq, yoy, cagr_3y, peer_rank, rank_change, outlier
+    FROM analytics_growth
+    WHERE state = %s AND year = %s AND quarter = %s;
+    """
+STATE_GROWTH_QUERY = """
+    SELECT quarter, measure, value, qoq, yoy, cagr_3y, peer_rank, rank_change, outlier
+    FROM analytics_growth
+    WHERE state = %s AND year = %s AND level = 'state'
+    ORDER BY measure, quarter;
+    """
+GROWTH_OUTLIERS_QUERY = """
+    SELECT quarter, level, entity, measure, value, qoq, zscore
+    FROM analytics_growth
+    WHERE state = %s AND year = %s AND outlier
+    ORDER BY quarter, ABS(zscore) DESC;
+    """
+
+def _growth_frame(query, params):
+    try:
+        return fetch_df(query, params=params)
+    except Exception as e:  # table not built yet (older load or --skip-analytics)
+        print("⚠️ analytics_growth unavailable:", e)
+        return pd.DataFrame()
+
+def growth_metrics(state, year, quarter):
+    return _growth_frame(GROWTH_QUERY, (state, year, quarter))
+
+def state_growth(state, year):
+    return _growth_frame(STATE_GROWTH_QUERY, (state, year))
+
+def growth_outliers(state, year):
+    return _growth_frame(GROWTH_OUTLIERS_QUERY, (state, year))
+
+# ------------------ Gemini AI Summary ------------------
+# HTTP, caching and rate limiting live in insights.py
+
+INSIGHT_QUERY = """
+    SELECT transaction_type, SUM(amount) as total_amount
+    FROM aggregated_transaction
+    WHERE state = %s AND year = %s AND quarter = %s
+    GROUP BY transaction_type
+    ORDER BY total_amount DESC;
+    """
+
+def _insight_prompt(state, year, quarter):
+    df = fetch_df(INSIGHT_QUERY, params=(state, year, quarter))
+    if df.empty:
+        return None
+    return _insights().build_prompt(state, year, quarter, df, growth=growth_metrics(state, year, quarter))
+
+def generate_gemini_insight(state, year, quarter):
+    prompt = _insight_prompt(state, year, quarter)
+    if prompt is None:
+        return "❌ No data found for this selection."
+    return _insights().insight_service.generate(prompt)
+
+def generate_gemini_insights(states, year, quarter):
+    """{state: insight} for many states; API calls overlap, capped by GEMINI_CONCURRENCY."""
+    prompts = {state: _insight_prompt(state, year, quarter) for state in states}
+    futures = {state: _insights().insight_service.submit(p) for state, p in prompts.items() if p}
+    return {state: futures[state].result() if state in futures else "❌ No data found for this selection."
+            for state in states}
+
+def prefetch_insights(year=None, quarter=None, states=None):
+    """Warm the insight cache for every state (default: latest quarter) in the background.
+
+    Returns the Futures of the requests actually sent; cached prompts are skipped.
+    """
+    if year is None or quarter is None:
+        year, quarter = latest_quarter()
+        if year is None:
+            return []
+    prompts = [p for p in (_insight_prompt(s, year, quarter) for s in (states or get_states())) if p]
+    return _insights().insight_service.prefetch(prompts)
@@ -0,0 +1,108 @@
+"""Versioned schema migrations for the PhonePe Pulse database.
+
+Version 1 is db/phonepe_schema.sql; every later change is a file named
+db/migrations/NNNN_<name>.sql (NNNN >= 0002). Applied versions are recorded
+in schema_migrations, so running this repeatedly is a no-op.
+
+    python db/migrate.py            # apply pending migrations
+    python db/migrate.py --status   # list applied / pending versions
+"""
+import argparse
+import os
+import re
+
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_SCHEMA = os.path.join(DB_DIR, "phonepe_schema.sql")
+MIGRATIONS_DIR = os.path.join(DB_DIR, "migrations")
+
+_MIGRATION_NAME = re.compile(r"^(\d{4})_[\w-]+\.sql$")
+
+
+def list_migrations():
+    migrations = [(1, os.path.basename(BASE_SCHEMA), BASE_SCHEMA)]
+    if os.path.isdir(MIGRATIONS_DIR):
+        for name in sorted(os.listdir(MIGRATIONS_DIR)):
+            match = _MIGRATION_NAME.match(name)
+            if match:
+                migrations.append((int(match.group(1)), name, os.path.join(MIGRATIONS_DIR, name)))
+    versions = [v for v, _, _ in migrations]
+    if len(set(versions)) != len(versions) or min(versions[1:], default=2) < 2:
+        raise ValueError(f"Migration versions must be unique and start at 0002: {versions}")
+    return migrations
+
+
+def split_statements(sql):
+    """Split a migration file on ';' line endings, dropping -- comments."""
+    statements, current = [], []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("--"):
+            continue
+        current.append(line)
+        if stripped.endswith(";"):
+            statements.append("\n".join(current))
+            current = []
+    if current:
+        statements.append("\n".join(current))
+    return statements
+
+
+def applied_versions(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    cursor.execute("SELECT version FROM schema_migrations;")
+    versions = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    return versions
+
+
+def apply_migrations(conn, verbose=True):
+    """Apply every pending migration in order; returns the versions applied."""
+    done = applied_versions(conn)
+    applied = []
+    cursor = conn.cursor()
+    for version, name, path in list_migrations():
+        if version in done:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            statements = split_statements(f.read())
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s);", (version, name))
+        conn.commit()
+        applied.append(version)
+        if verbose:
+            print(f"🗄️ Applied migration {version:04d} ({name})")
+    cursor.close()
+    return applied
+
+
+if __name__ == "__main__":
+    import mysql.connector
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Apply PhonePe Pulse schema migrations.")
+    parser.add_argument("--status", action="store_true", help="Only list applied and pending migrations")
+    args = parser.parse_args()
+
+    load_dotenv(os.path.join(DB_DIR, "..", ".env"))
+    conn = mysql.connector.connect(
+        host=os.getenv("DB_HOST"),
+        port=int(os.getenv("DB_PORT", 3306)),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=os.getenv("DB_NAME")
+    )
+    if args.status:
+        done = applied_versions(conn)
+        for version, name, _ in list_migrations():
+            print(f"{'✅' if version in done else '⏳'} {version:04d} {name}")
+    elif not apply_migrations(conn):
+        print("✅ Schema is up to date.")
+    conn.close()
@@ -0,0 +1,18 @@
+-- Growth, rank and outlier metrics rebuilt by extract/analytics.py after each load
+CREATE TABLE IF NOT EXISTS analytics_growth (
+    level ENUM('state', 'district', 'type') NOT NULL,
+    state VARCHAR(64) NOT NULL,
+    entity VARCHAR(80) NOT NULL,
+    measure VARCHAR(32) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    value DOUBLE NOT NULL,
+    qoq DOUBLE NULL,
+    yoy DOUBLE NULL,
+    cagr_3y DOUBLE NULL,
+    peer_rank INT UNSIGNED NOT NULL,
+    rank_change INT NULL,
+    zscore DOUBLE NULL,
+    outlier BOOLEAN NOT NULL,
+    PRIMARY KEY (state, year, quarter, level, measure, entity)
+);
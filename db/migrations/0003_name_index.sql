@@ -0,0 +1,31 @@
+-- Canonical ids for state / district / pincode names, rebuilt by extract/names.py after each load
+CREATE TABLE IF NOT EXISTS dim_state (
+    state_id SMALLINT UNSIGNED PRIMARY KEY,
+    slug VARCHAR(64) NOT NULL,
+    name VARCHAR(64) NOT NULL,
+    UNIQUE KEY uq_dim_state_slug (slug)
+);
+
+CREATE TABLE IF NOT EXISTS dim_district (
+    district_id INT UNSIGNED PRIMARY KEY,
+    state_id SMALLINT UNSIGNED NOT NULL,
+    name VARCHAR(80) NOT NULL,
+    KEY idx_dim_district_state (state_id)
+);
+
+CREATE TABLE IF NOT EXISTS dim_pincode (
+    pincode INT UNSIGNED PRIMARY KEY,
+    state_id SMALLINT UNSIGNED NOT NULL
+);
+
+-- Every raw spelling seen (lower-cased, trimmed) -> entity id; state is '' for kind = 'state'
+CREATE TABLE IF NOT EXISTS dim_alias (
+    kind ENUM('state', 'district', 'pincode') NOT NULL,
+    state VARCHAR(64) NOT NULL,
+    raw_name VARCHAR(100) NOT NULL,
+    entity_id INT UNSIGNED NOT NULL,
+    PRIMARY KEY (kind, state, raw_name)
+);
+
+-- Appended last: the rollup is rebuilt with a positional INSERT ... SELECT
+ALTER TABLE rollup_state_district ADD COLUMN district_id INT UNSIGNED NULL;
@@ -0,0 +1,16 @@
+-- Rows rejected by extract/validation.py, plus rejected files and reconciliation gaps (one batch per run_id)
+CREATE TABLE IF NOT EXISTS ingest_quarantine (
+    id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    run_id VARCHAR(32) NOT NULL,
+    table_name VARCHAR(64) NOT NULL,
+    check_name VARCHAR(32) NOT NULL,
+    state VARCHAR(64) NULL,
+    year SMALLINT NULL,
+    quarter TINYINT NULL,
+    entity VARCHAR(100) NULL,
+    detail VARCHAR(255) NOT NULL DEFAULT '',
+    row_data TEXT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_quarantine_run (run_id),
+    KEY idx_quarantine_check (table_name, check_name)
+);
@@ -0,0 +1,237 @@
+-- PhonePe Pulse schema, version 1.
+--
+-- Applied by db/migrate.py (the extractor runs it on start-up); later
+-- changes go in db/migrations/NNNN_<name>.sql, never in this file.
+--
+-- * state is an ENUM of the Pulse directory slugs: MySQL stores it as a
+--   1-byte dictionary code, and it sorts alphabetically like the old VARCHAR.
+--   New states need an ALTER ... MODIFY migration before they can be loaded.
+-- * Every fact table is clustered on its natural key (state, year, quarter,
+--   entity), which is also what the extractor upserts on and what the
+--   dashboard filters by.
+
+-- ------------------------------------------------------------
+-- Aggregated
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS aggregated_transaction (
+    state ENUM(
+        'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar',
+        'chandigarh', 'chhattisgarh', 'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat',
+        'haryana', 'himachal-pradesh', 'jammu-&-kashmir', 'jharkhand', 'karnataka', 'kerala', 'ladakh',
+        'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya', 'mizoram', 'nagaland',
+        'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+        'uttar-pradesh', 'uttarakhand', 'west-bengal'
+    ) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    transaction_type VARCHAR(48) NOT NULL,
+    count BIGINT NOT NULL,
+    amount DOUBLE NOT NULL,
+    PRIMARY KEY (state, year, quarter, transaction_type),
+    KEY idx_year_quarter (year, quarter)
+);
+
+CREATE TABLE IF NOT EXISTS aggregated_user (
+    state ENUM(
+        'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar',
+        'chandigarh', 'chhattisgarh', 'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat',
+        'haryana', 'himachal-pradesh', 'jammu-&-kashmir', 'jharkhand', 'karnataka', 'kerala', 'ladakh',
+        'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya', 'mizoram', 'nagaland',
+        'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+        'uttar-pradesh', 'uttarakhand', 'west-bengal'
+    ) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    brand VARCHAR(32) NOT NULL,
+    count BIGINT NOT NULL,
+    percentage FLOAT NOT NULL,
+    PRIMARY KEY (state, year, quarter, brand)
+);
+
+CREATE TABLE IF NOT EXISTS aggregated_insurance (
+    state ENUM(
+        'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar',
+        'chandigarh', 'chhattisgarh', 'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat',
+        'haryana', 'himachal-pradesh', 'jammu-&-kashmir', 'jharkhand', 'karnataka', 'kerala', 'ladakh',
+        'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya', 'mizoram', 'nagaland',
+        'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+        'uttar-pradesh', 'uttarakhand', 'west-bengal'
+    ) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    insurance_type VARCHAR(48) NOT NULL,
+    count BIGINT NOT NULL,
+    amount DOUBLE NOT NULL,
+    PRIMARY KEY (state, year, quarter, insurance_type)
+);
+
+-- ------------------------------------------------------------
+-- Map (district level)
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS map_user (
+    state ENUM(
+        'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar',
+        'chandigarh', 'chhattisgarh', 'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat',
+        'haryana', 'himachal-pradesh', 'jammu-&-kashmir', 'jharkhand', 'karnataka', 'kerala', 'ladakh',
+        'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya', 'mizoram', 'nagaland',
+        'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+        'uttar-pradesh', 'uttarakhand', 'west-bengal'
+    ) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    district VARCHAR(80) NOT NULL,
+    registered_users INT UNSIGNED NOT NULL,
+    app_opens BIGINT UNSIGNED NOT NULL,
+    PRIMARY KEY (state, year, quarter, district)
+);
+
+CREATE TABLE IF NOT EXISTS map_transaction (
+    state ENUM(
+        'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar',
+        'chandigarh', 'chhattisgarh', 'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat',
+        'haryana', 'himachal-pradesh', 'jammu-&-kashmir', 'jharkhand', 'karnataka', 'kerala', 'ladakh',
+        'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya', 'mizoram', 'nagaland',
+        'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+        'uttar-pradesh', 'uttarakhand', 'west-bengal'
+    ) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    district VARCHAR(80) NOT NULL,
+    count BIGINT NOT NULL,
+    amount DOUBLE NOT NULL,
+    PRIMARY KEY (state, year, quarter, district)
+);
+
+CREATE TABLE IF NOT EXISTS map_insurance (
+    state ENUM(
+        'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar',
+        'chandigarh', 'chhattisgarh', 'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat',
+        'haryana', 'himachal-pradesh', 'jammu-&-kashmir', 'jharkhand', 'karnataka', 'kerala', 'ladakh',
+        'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya', 'mizoram', 'nagaland',
+        'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+        'uttar-pradesh', 'uttarakhand', 'west-bengal'
+    ) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    district VARCHAR(80) NOT NULL,
+    count BIGINT NOT NULL,
+    amount DOUBLE NOT NULL,
+    PRIMARY KEY (state, year, quarter, district)
+);
+
+-- ------------------------------------------------------------
+-- Top (district and pincode level)
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS top_user (
+    state ENUM(
+        'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar',
+        'chandigarh', 'chhattisgarh', 'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat',
+        'haryana', 'himachal-pradesh', 'jammu-&-kashmir', 'jharkhand', 'karnataka', 'kerala', 'ladakh',
+        'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya', 'mizoram', 'nagaland',
+        'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+        'uttar-pradesh', 'uttarakhand', 'west-bengal'
+    ) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    pincode VARCHAR(10) NOT NULL,
+    registered_users INT UNSIGNED NOT NULL,
+    PRIMARY KEY (state, year, quarter, pincode)
+);
+
+CREATE TABLE IF NOT EXISTS top_map (
+    state ENUM(
+        'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar',
+        'chandigarh', 'chhattisgarh', 'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat',
+        'haryana', 'himachal-pradesh', 'jammu-&-kashmir', 'jharkhand', 'karnataka', 'kerala', 'ladakh',
+        'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya', 'mizoram', 'nagaland',
+        'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+        'uttar-pradesh', 'uttarakhand', 'west-bengal'
+    ) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    name VARCHAR(80) NOT NULL,
+    entity_type ENUM('district', 'pincode') NOT NULL,
+    count BIGINT NOT NULL,
+    amount DOUBLE NOT NULL,
+    PRIMARY KEY (state, year, quarter, entity_type, name)
+);
+
+CREATE TABLE IF NOT EXISTS top_insurance (
+    state ENUM(
+        'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar',
+        'chandigarh', 'chhattisgarh', 'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat',
+        'haryana', 'himachal-pradesh', 'jammu-&-kashmir', 'jharkhand', 'karnataka', 'kerala', 'ladakh',
+        'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya', 'mizoram', 'nagaland',
+        'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+        'uttar-pradesh', 'uttarakhand', 'west-bengal'
+    ) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    name VARCHAR(80) NOT NULL,
+    entity_type ENUM('district', 'pincode') NOT NULL,
+    count BIGINT NOT NULL,
+    amount DOUBLE NOT NULL,
+    PRIMARY KEY (state, year, quarter, entity_type, name)
+);
+
+-- ------------------------------------------------------------
+-- Rollups (rebuilt by extract/rollups.py after every load)
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS rollup_state_totals (
+    state VARCHAR(64) NOT NULL,
+    txn_count BIGINT NOT NULL,
+    txn_amount DOUBLE NOT NULL,
+    registered_users BIGINT NOT NULL,
+    app_opens BIGINT NOT NULL,
+    PRIMARY KEY (state)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_state_quarter (
+    state VARCHAR(64) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    quarter TINYINT UNSIGNED NOT NULL,
+    txn_count BIGINT NOT NULL,
+    txn_amount DOUBLE NOT NULL,
+    registered_users BIGINT NOT NULL,
+    app_opens BIGINT NOT NULL,
+    PRIMARY KEY (state, year, quarter),
+    KEY idx_year_quarter (year, quarter)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_state_district (
+    state VARCHAR(64) NOT NULL,
+    district VARCHAR(80) NOT NULL,
+    txn_count BIGINT NOT NULL,
+    txn_amount DOUBLE NOT NULL,
+    registered_users BIGINT NOT NULL,
+    app_opens BIGINT NOT NULL,
+    PRIMARY KEY (state, district)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_type_state_year (
+    transaction_type VARCHAR(48) NOT NULL,
+    state VARCHAR(64) NOT NULL,
+    year SMALLINT UNSIGNED NOT NULL,
+    count BIGINT NOT NULL,
+    amount DOUBLE NOT NULL,
+    PRIMARY KEY (state, year, transaction_type)
+);
+
+-- ------------------------------------------------------------
+-- Ingestion bookkeeping
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS ingest_manifest (
+    path VARCHAR(512) NOT NULL,
+    size BIGINT NOT NULL,
+    mtime DOUBLE NOT NULL,
+    sha1 CHAR(40) NOT NULL,
+    ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (path)
+);
+
+-- Bumped after every load; dashboards clear their query cache when it changes
+CREATE TABLE IF NOT EXISTS data_version (
+    id TINYINT PRIMARY KEY,
+    version BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
@@ -0,0 +1,170 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from rollups import _TXN_AND_USERS
+
+# -------------------------------
+# Growth, rank and outlier metrics
+# -------------------------------
+# Rebuilt after the rollups on every load and stored as analytics_growth
+# (db/migrations/0002_analytics_growth.sql, or analytics_growth.parquet), one
+# row per (level, state, entity, measure, year, quarter):
+#
+#   level     state (entity = state), district or type (entity = transaction type)
+#   qoq/yoy   growth against the previous quarter / same quarter last year
+#   cagr_3y   compound annual growth over the last 12 quarters
+#   peer_rank position among peers that period (states nationally, districts
+#             and types within their state; 1 = largest); rank_change > 0 = moved up
+#   zscore    robust z-score (median/MAD) of qoq among the same peers (only
+#             with at least MIN_PEERS of them); outlier when |zscore| > OUTLIER_Z
+#
+# Every series is pivoted into one dense entity x quarter matrix, so lags are
+# array slices and ranks/z-scores are groupby transforms: no per-entity loops.
+ANALYTICS_TABLE = "analytics_growth"
+OUTLIER_Z = 3.5
+MIN_PEERS = 5
+MAD_SCALE = 0.6745   # makes the MAD-based score comparable to a normal z-score
+
+SOURCES = {
+    "state": ("SELECT state, year, quarter, txn_count, txn_amount, registered_users, app_opens "
+              "FROM rollup_state_quarter",
+              "state", ("txn_amount", "txn_count", "registered_users", "app_opens")),
+    "district": ("""
+        SELECT state, district, year, quarter, SUM(txn_count) AS txn_count, SUM(txn_amount) AS txn_amount,
+               SUM(registered_users) AS registered_users, SUM(app_opens) AS app_opens
+        FROM ({union}) x
+        GROUP BY state, district, year, quarter
+        """.format(union=_TXN_AND_USERS.format(keys=", district, year, quarter", txn_table="map_transaction")),
+                 "district", ("txn_amount", "registered_users")),
+    "type": ("SELECT state, transaction_type, year, quarter, count AS txn_count, amount AS txn_amount "
+             "FROM aggregated_transaction",
+             "transaction_type", ("txn_amount", "txn_count")),
+}
+
+KEYS = ["level", "state", "entity", "measure"]
+COLUMNS = ["level", "state", "entity", "measure", "year", "quarter", "value",
+           "qoq", "yoy", "cagr_3y", "peer_rank", "rank_change", "zscore", "outlier"]
+
+
+def _long(frames):
+    """Stack every source into (level, state, entity, measure, period, value)."""
+    parts = []
+    for level, (_, entity_col, measures) in SOURCES.items():
+        df = frames[level].assign(entity=lambda f: f[entity_col])
+        melted = df.melt(id_vars=["state", "entity", "year", "quarter"], value_vars=list(measures),
+                         var_name="measure", value_name="value")
+        parts.append(melted.assign(level=level))
+    long = pd.concat(parts, ignore_index=True)
+    long["entity"] = long["entity"].astype(str)
+    long["state"] = long["state"].astype(str)
+    long["value"] = long["value"].astype(np.float64)
+    long["period"] = long["year"].astype(np.int64) * 4 + long["quarter"].astype(np.int64) - 1
+    return long
+
+
+def _lag(matrix, k):
+    """matrix shifted k periods to the right (NaN where there is no earlier period)."""
+    out = np.full_like(matrix, np.nan)
+    if k < matrix.shape[1]:
+        out[:, k:] = matrix[:, :-k]
+    return out
+
+
+def _growth(current, previous, years=1):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (current / previous) ** (1.0 / years) - 1
+    return np.where(previous > 0, growth, np.nan)
+
+
+def compute_growth(frames):
+    """analytics_growth rows from {"state", "district", "type"} source frames (see SOURCES)."""
+    long = _long(frames)
+    if long.empty:
+        return pd.DataFrame(columns=COLUMNS)
+
+    # Dense (series x period) matrices; gaps in a series stay NaN
+    periods = np.arange(long["period"].min(), long["period"].max() + 1)
+    wide = long.pivot_table(index=KEYS, columns="period", values="value", aggfunc="sum")
+    wide = wide.reindex(columns=periods)
+    values = wide.to_numpy(np.float64)
+
+    metrics = {
+        "qoq": _growth(values, _lag(values, 1)),
+        "yoy": _growth(values, _lag(values, 4)),
+        "cagr_3y": _growth(values, _lag(values, 12), years=3),
+    }
+
+    # Back to long form, keeping only cells that had data
+    present = ~np.isnan(values)
+    rows, cols = np.nonzero(present)
+    index = wide.index.to_frame(index=False).iloc[rows].reset_index(drop=True)
+    out = index.assign(period=periods[cols], value=values[rows, cols],
+                       **{name: m[rows, cols] for name, m in metrics.items()})
+
+    # Ranks among peers in the same period; states compete nationally
+    out["peer"] = np.where(out["level"] == "state", "", out["state"])
+    peers = out.groupby(["level", "measure", "peer", "period"], sort=False)
+    out["peer_rank"] = peers["value"].rank(ascending=False, method="min").astype(np.int64)
+
+    ranks = np.full_like(values, np.nan)
+    ranks[rows, cols] = out["peer_rank"].to_numpy(np.float64)
+    out["rank_change"] = pd.array(_lag(ranks, 1)[rows, cols] - out["peer_rank"], dtype="Int64")
+
+    # Robust z-score of quarter-on-quarter growth among the same peers
+    median = peers["qoq"].transform("median")
+    mad = (out["qoq"] - median).abs().groupby([out["level"], out["measure"], out["peer"], out["period"]],
+                                              sort=False).transform("median")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = MAD_SCALE * (out["qoq"] - median) / mad
+    enough = peers["qoq"].transform("count") >= MIN_PEERS
+    out["zscore"] = z.where(np.isfinite(z) & enough)
+    out["outlier"] = out["zscore"].abs() > OUTLIER_Z
+
+    out["year"], out["quarter"] = out["period"] // 4, out["period"] % 4 + 1
+    return out[COLUMNS].sort_values(["state", "year", "quarter", "level", "measure", "entity"],
+                                    ignore_index=True)
+
+
+def read_sources(read_frame):
+    """Run every SOURCES query through read_frame(sql) -> DataFrame."""
+    return {level: read_frame(query) for level, (query, _, _) in SOURCES.items()}
+
+# -------------------------------
+# MySQL: rebuild analytics_growth (same swap as the rollups)
+# -------------------------------
+def _mysql_frame(conn, query):
+    cursor = conn.cursor()
+    cursor.execute(query)
+    rows = cursor.fetchall()
+    columns = [c[0] for c in cursor.description] if cursor.description else []
+    cursor.close()
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+
+def _db_rows(df):
+    """Rows with NaN as NULL and numpy scalars as plain Python values."""
+    df = df.astype(object).where(df.notna(), None)
+    df["outlier"] = df["outlier"].astype(bool).astype(int)
+    return [tuple(v.item() if hasattr(v, "item") else v for v in row) for row in df.itertuples(index=False)]
+
+
+def build_analytics(conn, batch_size=5000):
+    start = time.perf_counter()
+    df = compute_growth(read_sources(lambda q: _mysql_frame(conn, q)))
+    table, staging, old = ANALYTICS_TABLE, f"{ANALYTICS_TABLE}_new", f"{ANALYTICS_TABLE}_old"
+
+    cursor = conn.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {staging}, {old};")
+    cursor.execute(f"CREATE TABLE {staging} LIKE {table};")
+    insert = f"INSERT INTO {staging} ({', '.join(COLUMNS)}) VALUES ({', '.join(['%s'] * len(COLUMNS))})"
+    rows = _db_rows(df)
+    for i in range(0, len(rows), batch_size):
+        cursor.executemany(insert, rows[i:i + batch_size])
+    cursor.execute(f"RENAME TABLE {table} TO {old}, {staging} TO {table};")
+    cursor.execute(f"DROP TABLE {old};")
+    conn.commit()
+    cursor.close()
+    print(f"📈 Rebuilt {table}: {len(df):,} rows ({int(df['outlier'].sum()):,} outliers) "
+          f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,173 @@
+import os
+import tempfile
+import time
+
+# -------------------------------
+# Target table layouts (column order used for every INSERT / LOAD DATA)
+# -------------------------------
+TABLE_COLUMNS = {
+    "aggregated_transaction": ("state", "year", "quarter", "transaction_type", "count", "amount"),
+    "aggregated_user": ("state", "year", "quarter", "brand", "count", "percentage"),
+    "aggregated_insurance": ("state", "year", "quarter", "insurance_type", "count", "amount"),
+    "map_user": ("state", "year", "quarter", "district", "registered_users", "app_opens"),
+    "map_transaction": ("state", "year", "quarter", "district", "count", "amount"),
+    "map_insurance": ("state", "year", "quarter", "district", "count", "amount"),
+    "top_user": ("state", "year", "quarter", "pincode", "registered_users"),
+    "top_map": ("state", "year", "quarter", "name", "entity_type", "count", "amount"),
+    "top_insurance": ("state", "year", "quarter", "name", "entity_type", "count", "amount"),
+}
+
+# Natural key of each table; rows are upserted on it so re-ingesting a file is idempotent
+TABLE_KEYS = {
+    "aggregated_transaction": ("state", "year", "quarter", "transaction_type"),
+    "aggregated_user": ("state", "year", "quarter", "brand"),
+    "aggregated_insurance": ("state", "year", "quarter", "insurance_type"),
+    "map_user": ("state", "year", "quarter", "district"),
+    "map_transaction": ("state", "year", "quarter", "district"),
+    "map_insurance": ("state", "year", "quarter", "district"),
+    "top_user": ("state", "year", "quarter", "pincode"),
+    "top_map": ("state", "year", "quarter", "entity_type", "name"),
+    "top_insurance": ("state", "year", "quarter", "entity_type", "name"),
+}
+
+LOAD_MODES = ("executemany", "infile")
+
+
+def _tsv_value(value):
+    if value is None:
+        return "\\N"
+    return (str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n"))
+
+
+class BulkLoader:
+    """Buffers parsed rows per table and writes them to MySQL in batches.
+
+    mode="executemany" sends each batch as one multi-row INSERT;
+    mode="infile" streams it through LOAD DATA LOCAL INFILE from a temp TSV
+    (the connection must be opened with allow_local_infile=True).
+    Rows are upserted on the table's unique natural key (ON DUPLICATE KEY
+    UPDATE / LOAD DATA ... REPLACE); on a table without that key this is a
+    plain append.
+    """
+
+    def __init__(self, conn, batch_size=5000, mode="executemany", close_connection=False):
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode {mode!r}, expected one of {LOAD_MODES}")
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.batch_size = max(1, int(batch_size))
+        self.mode = mode
+        self.close_connection = close_connection
+        self.buffers = {}
+        self.stats = {}
+
+    def add(self, table, row):
+        buffer = self.buffers.get(table)
+        if buffer is None:
+            buffer = self.buffers[table] = []
+            self.stats.setdefault(table, {"rows": 0, "batches": 0, "db_seconds": 0.0,
+                                          "started": time.perf_counter(), "finished": None})
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table=None):
+        tables = [table] if table else list(self.buffers)
+        for name in tables:
+            rows = self.buffers.get(name)
+            if not rows:
+                continue
+
+            start = time.perf_counter()
+            if self.mode == "infile":
+                self._load_infile(name, rows)
+            else:
+                self._insert_many(name, rows)
+            self.conn.commit()
+            now = time.perf_counter()
+
+            stats = self.stats[name]
+            stats["rows"] += len(rows)
+            stats["batches"] += 1
+            stats["db_seconds"] += now - start
+            stats["finished"] = now
+            self.buffers[name] = []
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.cursor.close()
+            if self.close_connection:
+                self.conn.close()
+
+    # -------------------------------
+    # Write paths
+    # -------------------------------
+    def _insert_many(self, table, rows):
+        columns = TABLE_COLUMNS[table]
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = ", ".join(f"{c} = VALUES({c})" for c in columns if c not in TABLE_KEYS[table])
+        query = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                 f"ON DUPLICATE KEY UPDATE {updates}")
+        self.cursor.executemany(query, rows)
+
+    def _load_infile(self, table, rows):
+        columns = TABLE_COLUMNS[table]
+        fd, path = tempfile.mkstemp(prefix=f"{table}_", suffix=".tsv")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                for row in rows:
+                    f.write("\t".join(_tsv_value(v) for v in row))
+                    f.write("\n")
+            self.cursor.execute(f"""
+                LOAD DATA LOCAL INFILE %s REPLACE INTO TABLE {table}
+                CHARACTER SET utf8mb4
+                FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+                LINES TERMINATED BY '\\n'
+                ({', '.join(columns)})
+            """, (path,))
+        finally:
+            os.remove(path)
+
+    def print_summary(self):
+        print_summary(self.stats, self.mode, self.batch_size)
+
+
+# -------------------------------
+# Throughput report
+# -------------------------------
+def merge_stats(*stats_dicts):
+    merged = {}
+    for stats in stats_dicts:
+        for table, s in stats.items():
+            m = merged.get(table)
+            if m is None:
+                merged[table] = dict(s)
+                continue
+            m["rows"] += s["rows"]
+            m["batches"] += s["batches"]
+            m["db_seconds"] += s["db_seconds"]
+            m["started"] = min(m["started"], s["started"])
+            finished = [f for f in (m["finished"], s["finished"]) if f is not None]
+            m["finished"] = max(finished) if finished else None
+    return merged
+
+
+def print_summary(stats, mode, batch_size):
+    if not stats:
+        print("ℹ️ No rows were loaded.")
+        return
+
+    print(f"\n📊 Load summary (mode={mode}, batch_size={batch_size})")
+    print(f"{'table':<24}{'rows':>12}{'batches':>9}{'elapsed s':>11}{'rows/s':>12}{'db rows/s':>12}")
+    for table, s in stats.items():
+        finished = s["finished"] or s["started"]
+        elapsed = finished - s["started"]
+        rate = s["rows"] / elapsed if elapsed > 0 else 0.0
+        db_rate = s["rows"] / s["db_seconds"] if s["db_seconds"] > 0 else 0.0
+        print(f"{table:<24}{s['rows']:>12,}{s['batches']:>9}"
+              f"{elapsed:>11.2f}{rate:>12,.0f}{db_rate:>12,.0f}")
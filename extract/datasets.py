@@ -0,0 +1,102 @@
+from collections import namedtuple
+
+# -------------------------------
+# Dataset specs
+# -------------------------------
+# name     - key used on the command line and in parallel work units
+# path     - directory under the Pulse data root holding state/year/quarter.json
+# pointer  - JSON pointer to the node handed to the mapper (missing -> file skipped)
+# mapper   - mapper(state, year, quarter, node) -> iterable of row tuples
+# table    - target table (column order in bulk_loader.TABLE_COLUMNS)
+# desc     - progress bar label
+DatasetSpec = namedtuple("DatasetSpec", ["name", "path", "pointer", "mapper", "table", "desc"])
+
+
+def _total(items):
+    """The TOTAL entry of a paymentInstruments / metric list, or the sum of all entries.
+
+    Pulse files carry one TOTAL entry today; anything else is added up rather
+    than silently keeping only the first instrument.
+    """
+    if not items:
+        return {}
+    if len(items) == 1:
+        return items[0]
+    for item in items:
+        if str(item.get("type", "")).upper() == "TOTAL":
+            return item
+    return {"count": sum(item.get("count", 0) for item in items),
+            "amount": sum(item.get("amount", 0.0) for item in items)}
+
+
+# -------------------------------
+# Row mappers
+# -------------------------------
+def map_payment_instruments(state, year, quarter, items):
+    for entry in items:
+        instrument = _total(entry.get("paymentInstruments"))
+        yield (state, year, quarter, entry.get("name", "Unknown"),
+               instrument.get("count", 0), instrument.get("amount", 0.0))
+
+
+def map_users_by_device(state, year, quarter, items):
+    for entry in items:
+        yield (state, year, quarter, entry.get("brand", "Unknown"),
+               entry.get("count", 0), entry.get("percentage", 0.0))
+
+
+def map_hover_users(state, year, quarter, hover):
+    for district, stats in hover.items():
+        yield (state, year, quarter, district,
+               stats.get("registeredUsers", 0), stats.get("appOpens", 0))
+
+
+def map_hover_metrics(state, year, quarter, items):
+    for entry in items:
+        stats = _total(entry.get("metric"))
+        yield (state, year, quarter, entry.get("name", "Unknown"),
+               stats.get("count", 0), stats.get("amount", 0.0))
+
+
+def map_top_user_pincodes(state, year, quarter, items):
+    for entry in items:
+        yield (state, year, quarter, entry.get("name", "Unknown"), entry.get("registeredUsers", 0))
+
+
+def map_top_entities(state, year, quarter, data):
+    for entity_type, key in (("district", "districts"), ("pincode", "pincodes")):
+        for entry in data.get(key) or []:
+            stats = entry.get("metric") or {}
+            yield (state, year, quarter, entry.get("entityName", "Unknown"), entity_type,
+                   stats.get("count", 0), stats.get("amount", 0.0))
+
+
+DATASETS = {spec.name: spec for spec in [
+    DatasetSpec("aggregated_transaction", "aggregated/transaction/country/india/state",
+                "/data/transactionData", map_payment_instruments, "aggregated_transaction",
+                "📥 Extracting Transaction Data"),
+    DatasetSpec("aggregated_user", "aggregated/user/country/india/state",
+                "/data/usersByDevice", map_users_by_device, "aggregated_user",
+                "📥 Extracting User Data"),
+    DatasetSpec("aggregated_insurance", "aggregated/insurance/country/india/state",
+                "/data/transactionData", map_payment_instruments, "aggregated_insurance",
+                "📥 Extracting Insurance Data"),
+    DatasetSpec("map_user", "map/user/hover/country/india/state",
+                "/data/hoverData", map_hover_users, "map_user",
+                "📍 Extracting Map User Data"),
+    DatasetSpec("map_transaction", "map/transaction/hover/country/india/state",
+                "/data/hoverDataList", map_hover_metrics, "map_transaction",
+                "🗺️ Extracting Map Transaction Data"),
+    DatasetSpec("map_insurance", "map/insurance/hover/country/india/state",
+                "/data/hoverDataList", map_hover_metrics, "map_insurance",
+                "📌 Extracting Map Insurance Data"),
+    DatasetSpec("top_user", "top/user/country/india/state",
+                "/data/pincodes", map_top_user_pincodes, "top_user",
+                "👤 Extracting Top User Data"),
+    DatasetSpec("top_map", "top/transaction/country/india/state",
+                "/data", map_top_entities, "top_map",
+                "📍 Extracting Top Map Data"),
+    DatasetSpec("top_insurance", "top/insurance/country/india/state",
+                "/data", map_top_entities, "top_insurance",
+                "🛡️ Extracting Top Insurance Data"),
+]}
@@ -0,0 +1,67 @@
+from tqdm import tqdm
+from json_backend import DEFAULT_BACKEND, get_backend
+from sources import iter_quarter_files, list_states, open_source  # noqa: F401 - re-exported
+
+JSON_BACKEND, _loads = get_backend(DEFAULT_BACKEND)
+
+
+def set_json_backend(name):
+    global JSON_BACKEND, _loads
+    JSON_BACKEND, _loads = get_backend(name)
+    return JSON_BACKEND
+
+# -------------------------------
+# JSON access
+# -------------------------------
+def split_pointer(pointer):
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer.lstrip("/").split("/") if part]
+
+
+def resolve(doc, parts):
+    node = doc
+    for part in parts:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(part)
+        if node is None:
+            return None
+    return node
+
+
+# -------------------------------
+# Row streaming
+# -------------------------------
+def iter_rows(spec, data_root, states=None, manifest=None, on_error=None):
+    """Stream the rows of one dataset; files that fail to parse are reported and skipped.
+
+    data_root is anything open_source() accepts: a directory, an archive or git:<repo>.
+    on_error(table, path, exception) is called for each skipped file.
+    """
+    source = open_source(data_root)
+    parts = split_pointer(spec.pointer)
+    mapper = spec.mapper
+
+    for state, year, quarter, path in source.iter_quarter_files(spec.path, states):
+        if manifest is not None and not manifest.needs_ingest(path):
+            continue
+        try:
+            node = resolve(_loads(source.read(path)), parts)
+            if node is not None:
+                # Materialise per file so a malformed record drops the file, not half of it
+                yield from list(mapper(state, year, quarter, node))
+            if manifest is not None:
+                manifest.mark_done(path)
+        except Exception as e:
+            print(f"❌ Error processing {path}:", e)
+            if on_error is not None:
+                on_error(spec.table, path, e)
+
+
+def run_dataset(spec, loader, data_root, states=None, manifest=None, progress=False):
+    if states is None:
+        states = open_source(data_root).list_states(spec.path)
+    if progress:
+        states = tqdm(states, desc=spec.desc)
+    for row in iter_rows(spec, data_root, states, manifest, on_error=getattr(loader, "reject_file", None)):
+        loader.add(spec.table, row)
+    loader.flush(spec.table)
@@ -1,430 +1,255 @@
-import os
-import json
-import mysql.connector
-from dotenv import load_dotenv
-from tqdm import tqdm
-
-# Load environment variables from .env
-load_dotenv("../.env")
-
-# MySQL credentials
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = int(os.getenv("DB_PORT", 3306))
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_NAME = os.getenv("DB_NAME")
-
-# Connect to MySQL
-try:
-    conn = mysql.connector.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        database=DB_NAME
-    )
-    cursor = conn.cursor()
-    print("✅ Connected to MySQL successfully!")
-except mysql.connector.Error as err:
-    print("❌ MySQL connection failed:", err)
-    exit()
-
-# -------------------------------
-# Create TABLES if not exists
-# -------------------------------
-
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS aggregated_transaction (
-        state VARCHAR(100),
-        year INT,
-        quarter INT,
-        transaction_type VARCHAR(100),
-        count BIGINT,
-        amount DOUBLE
-    );
-""")
-
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS aggregated_user (
-        state VARCHAR(100),
-        year INT,
-        quarter INT,
-        brand VARCHAR(100),
-        count BIGINT,
-        percentage FLOAT
-    );
-""")
-
-conn.commit()
-
-# -------------------------------
-# Function: Extract aggregated_transaction
-# -------------------------------
-def extract_aggregated_transaction():
-    base_path = "../data/pulse/data/aggregated/transaction/country/india/state"
-    for state in tqdm(os.listdir(base_path), desc="📥 Extracting Transaction Data"):
-        state_path = os.path.join(base_path, state)
-        for year in os.listdir(state_path):
-            year_path = os.path.join(state_path, year)
-            for file_name in os.listdir(year_path):
-                if file_name.endswith(".json"):
-                    quarter = int(file_name.strip(".json"))
-                    file_path = os.path.join(year_path, file_name)
-
-                    try:
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                            txn_data = data.get("data", {}).get("transactionData", [])
-
-                            for txn in txn_data:
-                                txn_type = txn.get("name")
-                                instrument = txn.get("paymentInstruments", [{}])[0]
-                                count = instrument.get("count", 0)
-                                amount = instrument.get("amount", 0.0)
-
-                                cursor.execute("""
-                                    INSERT INTO aggregated_transaction 
-                                    (state, year, quarter, transaction_type, count, amount)
-                                    VALUES (%s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, txn_type, count, amount))
-                    except Exception as e:
-                        print(f"❌ Error processing {file_path}:", e)
-    conn.commit()
-    print("✅ Data inserted into aggregated_transaction successfully.")
-
-# -------------------------------
-# Function: Extract aggregated_user
-# -------------------------------
-def extract_aggregated_user():
-    base_path = "../data/pulse/data/aggregated/user/country/india/state"
-    for state in tqdm(os.listdir(base_path), desc="📥 Extracting User Data"):
-        state_path = os.path.join(base_path, state)
-        for year in os.listdir(state_path):
-            year_path = os.path.join(state_path, year)
-            for file_name in os.listdir(year_path):
-                if file_name.endswith(".json"):
-                    quarter = int(file_name.strip(".json"))
-                    file_path = os.path.join(year_path, file_name)
-
-                    try:
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                            user_data = data.get("data", {}).get("usersByDevice")
-                            
-                            if user_data is None:
-                                continue  # 🛑 Skip if no user data
-
-                            for entry in user_data:
-                                brand = entry.get("brand", "Unknown")
-                                count = entry.get("count", 0)
-                                percentage = entry.get("percentage", 0.0)
-
-                                cursor.execute("""
-                                    INSERT INTO aggregated_user 
-                                    (state, year, quarter, brand, count, percentage)
-                                    VALUES (%s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, brand, count, percentage))
-                    except Exception as e:
-                        print(f"❌ Error processing {file_path}:", e)
-
-    conn.commit()
-    print("✅ Data inserted into aggregated_user successfully.")
-
-# -------------------------------
-# Function: Extract aggregated_insurance
-# -------------------------------
-def extract_aggregated_insurance():
-    base_path = "../data/pulse/data/aggregated/insurance/country/india/state"
-    for state in tqdm(os.listdir(base_path), desc="📥 Extracting Insurance Data"):
-        state_path = os.path.join(base_path, state)
-        for year in os.listdir(state_path):
-            year_path = os.path.join(state_path, year)
-            for file_name in os.listdir(year_path):
-                if file_name.endswith(".json"):
-                    quarter = int(file_name.strip(".json"))
-                    file_path = os.path.join(year_path, file_name)
-
-                    try:
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                            ins_data = data.get("data", {}).get("transactionData")
-                            
-                            if ins_data is None:
-                                continue
-
-                            for entry in ins_data:
-                                ins_type = entry.get("name", "Unknown")
-                                instrument = entry.get("paymentInstruments", [{}])[0]
-                                count = instrument.get("count", 0)
-                                amount = instrument.get("amount", 0.0)
-
-                                cursor.execute("""
-                                    INSERT INTO aggregated_insurance 
-                                    (state, year, quarter, insurance_type, count, amount)
-                                    VALUES (%s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, ins_type, count, amount))
-                    except Exception as e:
-                        print(f"❌ Error processing {file_path}:", e)
-
-    conn.commit()
-    print("✅ Data inserted into aggregated_insurance successfully.")
-# -------------------------------
-# Function: extract_map_user()
-# -------------------------------
-def extract_map_user():
-    base_path = "../data/pulse/data/map/user/hover/country/india/state"
-    for state in tqdm(os.listdir(base_path), desc="📍 Extracting Map User Data"):
-        state_path = os.path.join(base_path, state)
-        for year in os.listdir(state_path):
-            year_path = os.path.join(state_path, year)
-            for file_name in os.listdir(year_path):
-                if file_name.endswith(".json"):
-                    quarter = int(file_name.strip(".json"))
-                    file_path = os.path.join(year_path, file_name)
-
-                    try:
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                            user_data = data.get("data", {}).get("hoverData", {})
-
-                            for district, stats in user_data.items():
-                                registered = stats.get("registeredUsers", 0)
-                                app_opens = stats.get("appOpens", 0)
-
-                                cursor.execute("""
-                                    INSERT INTO map_user 
-                                    (state, year, quarter, district, registered_users, app_opens)
-                                    VALUES (%s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, district, registered, app_opens))
-                    except Exception as e:
-                        print(f"❌ Error processing {file_path}:", e)
-
-    conn.commit()
-    print("✅ Data inserted into map_user successfully.")
-
-# -------------------------------
-# Function: extract_map_transaction()
-# -------------------------------
-def extract_map_transaction():
-    base_path = "../data/pulse/data/map/transaction/hover/country/india/state"
-    for state in tqdm(os.listdir(base_path), desc="🗺️ Extracting Map Transaction Data"):
-        state_path = os.path.join(base_path, state)
-        for year in os.listdir(state_path):
-            year_path = os.path.join(state_path, year)
-            for file_name in os.listdir(year_path):
-                if file_name.endswith(".json"):
-                    quarter = int(file_name.strip(".json"))
-                    file_path = os.path.join(year_path, file_name)
-
-                    try:
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                            districts = data.get("data", {}).get("hoverDataList", [])
-
-                            for entry in districts:
-                                district = entry.get("name", "Unknown")
-                                stats = entry.get("metric", [{}])[0]
-                                count = stats.get("count", 0)
-                                amount = stats.get("amount", 0.0)
-
-                                cursor.execute("""
-                                    INSERT INTO map_transaction 
-                                    (state, year, quarter, district, count, amount)
-                                    VALUES (%s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, district, count, amount))
-                    except Exception as e:
-                        print(f"❌ Error processing {file_path}:", e)
-
-    conn.commit()
-    print("✅ Data inserted into map_transaction successfully.")
-
-# -------------------------------
-# Function: extract_map_insurance()
-# -------------------------------
-def extract_map_insurance():
-    base_path = "../data/pulse/data/map/insurance/hover/country/india/state"
-    for state in tqdm(os.listdir(base_path), desc="📌 Extracting Map Insurance Data"):
-        state_path = os.path.join(base_path, state)
-        for year in os.listdir(state_path):
-            year_path = os.path.join(state_path, year)
-            for file_name in os.listdir(year_path):
-                if file_name.endswith(".json"):
-                    quarter = int(file_name.strip(".json"))
-                    file_path = os.path.join(year_path, file_name)
-
-                    try:
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                            districts = data.get("data", {}).get("hoverDataList", [])
-
-                            for entry in districts:
-                                district = entry.get("name", "Unknown")
-                                stats = entry.get("metric", [{}])[0]
-                                count = stats.get("count", 0)
-                                amount = stats.get("amount", 0.0)
-
-                                cursor.execute("""
-                                    INSERT INTO map_insurance 
-                                    (state, year, quarter, district, count, amount)
-                                    VALUES (%s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, district, count, amount))
-                    except Exception as e:
-                        print(f"❌ Error processing {file_path}:", e)
-
-    conn.commit()
-    print("✅ Data inserted into map_insurance successfully.")
-
-# -------------------------------
-# Function: extract_top_user()
-# -------------------------------
-def extract_top_user():
-    base_path = "../data/pulse/data/top/user/country/india/state"
-    for state in tqdm(os.listdir(base_path), desc="👤 Extracting Top User Data"):
-        state_path = os.path.join(base_path, state)
-        for year in os.listdir(state_path):
-            year_path = os.path.join(state_path, year)
-            for file_name in os.listdir(year_path):
-                if file_name.endswith(".json"):
-                    quarter = int(file_name.strip(".json"))
-                    file_path = os.path.join(year_path, file_name)
-
-                    try:
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                            top_users = data.get("data", {}).get("pincodes", [])
-
-                            for entry in top_users:
-                                pincode = entry.get("name", "Unknown")
-                                registered_users = entry.get("registeredUsers", 0)
-
-                                cursor.execute("""
-                                    INSERT INTO top_user 
-                                    (state, year, quarter, pincode, registered_users)
-                                    VALUES (%s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, pincode, registered_users))
-                    except Exception as e:
-                        print(f"❌ Error processing {file_path}:", e)
-
-    conn.commit()
-    print("✅ Data inserted into top_user successfully.")
-
-# -------------------------------
-# Function: extract_top_map()
-# -------------------------------
-def extract_top_map():
-    base_path = "../data/pulse/data/top/transaction/country/india/state"
-    for state in tqdm(os.listdir(base_path), desc="📍 Extracting Top Map Data"):
-        state_path = os.path.join(base_path, state)
-        for year in os.listdir(state_path):
-            year_path = os.path.join(state_path, year)
-            for file_name in os.listdir(year_path):
-                if file_name.endswith(".json"):
-                    quarter = int(file_name.strip(".json"))
-                    file_path = os.path.join(year_path, file_name)
-
-                    try:
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                            districts = data.get("data", {}).get("districts", [])
-                            pincodes = data.get("data", {}).get("pincodes", [])
-
-                            # District entries
-                            for entry in districts:
-                                name = entry.get("entityName", "Unknown")
-                                stats = entry.get("metric", {})
-                                count = stats.get("count", 0)
-                                amount = stats.get("amount", 0.0)
-
-                                cursor.execute("""
-                                    INSERT INTO top_map 
-                                    (state, year, quarter, name, entity_type, count, amount)
-                                    VALUES (%s, %s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, name, "district", count, amount))
-
-                            # Pincode entries
-                            for entry in pincodes:
-                                name = entry.get("entityName", "Unknown")
-                                stats = entry.get("metric", {})
-                                count = stats.get("count", 0)
-                                amount = stats.get("amount", 0.0)
-
-                                cursor.execute("""
-                                    INSERT INTO top_map 
-                                    (state, year, quarter, name, entity_type, count, amount)
-                                    VALUES (%s, %s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, name, "pincode", count, amount))
-                    except Exception as e:
-                        print(f"❌ Error processing {file_path}:", e)
-
-    conn.commit()
-    print("✅ Data inserted into top_map successfully.")
-
-# -------------------------------
-# Function: extract_top_insurance()
-# -------------------------------
-def extract_top_insurance():
-    base_path = "../data/pulse/data/top/insurance/country/india/state"
-    for state in tqdm(os.listdir(base_path), desc="🛡️ Extracting Top Insurance Data"):
-        state_path = os.path.join(base_path, state)
-        for year in os.listdir(state_path):
-            year_path = os.path.join(state_path, year)
-            for file_name in os.listdir(year_path):
-                if file_name.endswith(".json"):
-                    quarter = int(file_name.strip(".json"))
-                    file_path = os.path.join(year_path, file_name)
-
-                    try:
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                            districts = data.get("data", {}).get("districts", [])
-                            pincodes = data.get("data", {}).get("pincodes", [])
-
-                            # District entries
-                            for entry in districts:
-                                name = entry.get("entityName", "Unknown")
-                                stats = entry.get("metric", {})
-                                count = stats.get("count", 0)
-                                amount = stats.get("amount", 0.0)
-
-                                cursor.execute("""
-                                    INSERT INTO top_insurance 
-                                    (state, year, quarter, name, entity_type, count, amount)
-                                    VALUES (%s, %s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, name, "district", count, amount))
-
-                            # Pincode entries
-                            for entry in pincodes:
-                                name = entry.get("entityName", "Unknown")
-                                stats = entry.get("metric", {})
-                                count = stats.get("count", 0)
-                                amount = stats.get("amount", 0.0)
-
-                                cursor.execute("""
-                                    INSERT INTO top_insurance 
-                                    (state, year, quarter, name, entity_type, count, amount)
-                                    VALUES (%s, %s, %s, %s, %s, %s, %s);
-                                """, (state, int(year), quarter, name, "pincode", count, amount))
-                    except Exception as e:
-                        print(f"❌ Error processing {file_path}:", e)
-
-    conn.commit()
-    print("✅ Data inserted into top_insurance successfully.")
-
-# -------------------------------
-# Run All Extraction Functions
-# -------------------------------
-
-extract_aggregated_transaction()
-extract_aggregated_user()
-extract_aggregated_insurance()
-extract_map_user()
-extract_map_transaction()
-extract_map_insurance()
-extract_top_user()
-extract_top_map()
-extract_top_insurance()
-
-# Close MySQL connection
-cursor.close()
-conn.close()
-print("🔒 MySQL connection closed.")
+import os
+import re
+import sys
+import argparse
+import mysql.connector
+from dotenv import load_dotenv
+from bulk_loader import BulkLoader, LOAD_MODES, print_summary
+from datasets import DATASETS
+from engine import open_source, run_dataset, set_json_backend
+from json_backend import BACKEND_ORDER, DEFAULT_BACKEND
+from manifest import Manifest, MANIFEST_FILE
+from names import build_name_index
+from rollups import DIMENSIONS_FILE, build_rollups, write_dimensions
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "db"))
+from migrate import apply_migrations  # noqa: E402
+
+# Load environment variables from .env
+load_dotenv("../.env")
+
+# MySQL credentials
+DB_HOST = os.getenv("DB_HOST")
+DB_PORT = int(os.getenv("DB_PORT", 3306))
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Pulse checkout layout
+DATA_ROOT = os.getenv("PULSE_DATA_ROOT", "../data/pulse/data")
+PARQUET_ROOT = os.getenv("PARQUET_ROOT", "../data/parquet")
+
+# State/year lists for the dashboard's start-up (MySQL target; Parquet keeps it next to the data)
+DIMENSIONS_SNAPSHOT = os.getenv("DIMENSIONS_SNAPSHOT", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "dashboard", ".dimensions.json"))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load PhonePe Pulse JSON data into MySQL or Parquet.")
+    parser.add_argument("--target", choices=("mysql", "parquet"), default=os.getenv("EXTRACT_TARGET", "mysql"),
+                        help="mysql (default) or partitioned Parquet for the embedded DuckDB backend")
+    parser.add_argument("--parquet-root", default=PARQUET_ROOT,
+                        help="Output directory for --target parquet (default: ../data/parquet or $PARQUET_ROOT)")
+    parser.add_argument("--data-root", default=DATA_ROOT,
+                        help="Pulse data directory, a .tar[.gz]/.zip of the Pulse repo, or git:<repo>[@rev] "
+                             "(default: ../data/pulse/data or $PULSE_DATA_ROOT)")
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS),
+                        help="Datasets to load (default: all)")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("EXTRACT_BATCH_SIZE", 5000)),
+                        help="Rows buffered per table before each flush (default: 5000)")
+    parser.add_argument("--load-mode", choices=LOAD_MODES, default=os.getenv("EXTRACT_LOAD_MODE", "executemany"),
+                        help="executemany: multi-row INSERTs, infile: LOAD DATA LOCAL INFILE from a temp TSV")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("EXTRACT_WORKERS", 1)),
+                        help="Parser processes; >1 fans (dataset, state) units out to a process pool")
+    parser.add_argument("--writers", type=int, default=int(os.getenv("EXTRACT_WRITERS", 2)),
+                        help="MySQL writer connections used in parallel mode (default: 2, always 1 for Parquet)")
+    parser.add_argument("--json-backend", choices=("auto",) + BACKEND_ORDER, default=DEFAULT_BACKEND,
+                        help="JSON parser: auto picks orjson, then simdjson, then the stdlib")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only parse files that are new or changed since the last load (see ingest_manifest)")
+    parser.add_argument("--skip-rollups", action="store_true",
+                        help="Do not rebuild the rollup_* tables after loading")
+    parser.add_argument("--skip-analytics", action="store_true",
+                        help="Do not rebuild analytics_growth (growth, ranks, outliers); implied by --skip-rollups")
+    parser.add_argument("--skip-validation", action="store_true",
+                        help="Load rows without the schema / duplicate / reconciliation checks (see validation.py)")
+    parser.add_argument("--validation-report", default=None,
+                        help="Where to write the validation summary (default: validation_report.json, "
+                             "next to the data for --target parquet)")
+    parser.add_argument("--dimensions-file", default=DIMENSIONS_SNAPSHOT,
+                        help="Where the MySQL target writes the dashboard's state/year snapshot "
+                             "(default: dashboard/.dimensions.json; env DIMENSIONS_SNAPSHOT)")
+    return parser.parse_args(argv)
+
+
+def connect(load_mode="executemany"):
+    return mysql.connector.connect(
+        host=DB_HOST,
+        port=DB_PORT,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_NAME,
+        allow_local_infile=load_mode == "infile"
+    )
+
+
+# -------------------------------
+# Schema checks (tables come from db/phonepe_schema.sql + db/migrations)
+# -------------------------------
+def check_natural_keys(conn):
+    # Tables created by older versions of this script have no natural key, so upserts would append
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT DISTINCT table_name FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND index_name IN ('PRIMARY', 'uq_natural');
+    """)
+    keyed = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    for table in sorted({spec.table for spec in DATASETS.values()}):
+        if table not in keyed:
+            print(f"⚠️ {table} has no natural key; re-ingested rows will be duplicated. "
+                  f"Drop it and run a full load to enable upserts.")
+
+
+def known_states(conn):
+    # state is an ENUM; slugs outside it would fail the whole batch they land in
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT column_type FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = 'aggregated_transaction' AND column_name = 'state';
+    """)
+    row = cursor.fetchone()
+    cursor.close()
+    if not row or not str(row[0]).lower().startswith("enum("):
+        return None
+    return set(re.findall(r"'((?:[^']|'')*)'", str(row[0])))
+
+
+# -------------------------------
+# Signal dashboards that cached query results are stale
+# -------------------------------
+def bump_data_version(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO data_version (id, version) VALUES (1, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    """)
+    conn.commit()
+    cursor.close()
+
+# -------------------------------
+# Run All Extraction Functions
+# -------------------------------
+def main(argv=None):
+    args = parse_args(argv)
+    parquet = args.target == "parquet"
+    conn = None
+
+    if parquet:
+        from parquet_sink import (ParquetSink, build_parquet_analytics, build_parquet_names, build_parquet_rollups,
+                                  write_data_version)
+
+        manifest_path = os.path.join(args.parquet_root, MANIFEST_FILE)
+        manifest = Manifest.load_file(manifest_path, args.data_root, force=not args.incremental)
+        allowed = None
+        sink = ParquetSink(args.parquet_root)
+        make_loader = lambda: sink  # noqa: E731 - one sink; partitions must not be written concurrently
+        args.writers = 1
+        print(f"📦 Writing Parquet to {os.path.abspath(args.parquet_root)}")
+    else:
+        # Connect to MySQL
+        try:
+            conn = connect(args.load_mode)
+            print("✅ Connected to MySQL successfully!")
+        except mysql.connector.Error as err:
+            print("❌ MySQL connection failed:", err)
+            exit()
+
+        apply_migrations(conn)
+        check_natural_keys(conn)
+        manifest = Manifest.load(conn, args.data_root, force=not args.incremental)
+        allowed = known_states(conn)
+        make_loader = lambda: BulkLoader(connect(args.load_mode), batch_size=args.batch_size,  # noqa: E731
+                                         mode=args.load_mode, close_connection=True)
+
+    validator = None
+    if not args.skip_validation:
+        from validation import REPORT_FILE, ValidatingLoader, Validator  # pandas only needed here
+
+        validator = Validator()
+        unchecked_loader = make_loader
+        make_loader = lambda: ValidatingLoader(unchecked_loader(), validator)  # noqa: E731
+        if args.validation_report is None:
+            args.validation_report = os.path.join(args.parquet_root, REPORT_FILE) if parquet else REPORT_FILE
+
+    print(f"🧩 Parsing JSON with {set_json_backend(args.json_backend)}")
+    specs = [DATASETS[name] for name in args.datasets]
+    source = open_source(args.data_root)
+    if args.workers > 1 and not source.random_access:
+        print(f"⚠️ {args.data_root} can only be read sequentially; ignoring --workers {args.workers}.")
+        args.workers = 1
+
+    spec_states = {}
+    for spec in specs:
+        states = source.list_states(spec.path)
+        unknown = [s for s in states if allowed is not None and s not in allowed]
+        if unknown:
+            print(f"⚠️ Skipping {spec.name} for states missing from the state ENUM "
+                  f"(add a migration): {', '.join(unknown)}")
+        spec_states[spec.name] = [s for s in states if s not in unknown]
+
+    if args.workers > 1:
+        from parallel_loader import WriterError, run_parallel
+
+        units = [(spec.name, state) for spec in specs for state in spec_states[spec.name]]
+        try:
+            stats, done = run_parallel(units, make_loader, manifest, json_backend=args.json_backend,
+                                       workers=args.workers, writers=args.writers,
+                                       reject_file=validator and validator.reject_file)
+        except WriterError as e:
+            # Rows were lost: keep the manifest and data version as they were so a rerun reloads these files
+            print(f"❌ {e}")
+            print("⚠️ Manifest and data version left unchanged; rerun to load these files again.")
+            if conn is not None:
+                conn.close()
+            sys.exit(1)
+        print_summary(stats, "parquet" if parquet else args.load_mode, args.batch_size)
+        manifest.done.update(done)
+    else:
+        loader = sink if parquet else BulkLoader(conn, batch_size=args.batch_size, mode=args.load_mode)
+        if validator is not None:
+            loader = ValidatingLoader(loader, validator)
+        for spec in specs:
+            run_dataset(spec, loader, args.data_root, spec_states[spec.name], manifest, progress=True)
+            print(f"✅ Data inserted into {spec.table} successfully.")
+        loader.close()
+        loader.print_summary()
+
+    if validator is not None:
+        from validation import finish_validation
+
+        finish_validation(validator, args.validation_report, conn=conn,
+                          parquet_root=args.parquet_root if parquet else None)
+
+    # Only record files once their rows are committed
+    saved = manifest.save_file(manifest_path) if parquet else manifest.save(conn)
+    print(f"🧾 Manifest updated for {saved:,} files ({manifest.skipped:,} unchanged files skipped).")
+
+    if saved and not args.skip_rollups:
+        # Names first: the district rollup resolves spellings through dim_alias
+        if parquet:
+            build_parquet_names(args.parquet_root)
+            dims = build_parquet_rollups(args.parquet_root)
+            write_dimensions(os.path.join(args.parquet_root, DIMENSIONS_FILE), dims)
+        else:
+            build_name_index(conn)
+            dims = build_rollups(conn)
+            write_dimensions(args.dimensions_file, dims, database=f"{DB_HOST}:{DB_PORT}/{DB_NAME}")
+        if not args.skip_analytics:
+            if parquet:
+                build_parquet_analytics(args.parquet_root)
+            else:
+                from analytics import build_analytics  # pandas/NumPy only needed here
+                build_analytics(conn)
+    if saved:
+        write_data_version(args.parquet_root) if parquet else bump_data_version(conn)
+        print("🔄 Data version bumped; dashboard caches will refresh.")
+
+    if conn is not None:
+        # Close MySQL connection
+        conn.close()
+        print("🔒 MySQL connection closed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import json
+import os
+
+# -------------------------------
+# Pluggable JSON parsers
+# -------------------------------
+# Every backend is a loads(bytes) -> dict/list callable. "auto" picks the
+# fastest one that is installed: orjson, then pysimdjson, then the stdlib.
+BACKEND_ORDER = ("orjson", "simdjson", "json")
+
+
+def _make_orjson():
+    import orjson
+    return orjson.loads
+
+
+def _make_simdjson():
+    import simdjson
+    parser = simdjson.Parser()
+
+    def loads(data):
+        # recursive=True materialises plain dicts/lists, so the parser can be reused
+        return parser.parse(data, recursive=True)
+    return loads
+
+
+def _make_json():
+    return json.loads
+
+
+_FACTORIES = {
+    "orjson": _make_orjson,
+    "simdjson": _make_simdjson,
+    "json": _make_json,
+}
+
+
+def available_backends():
+    names = []
+    for name in BACKEND_ORDER:
+        try:
+            _FACTORIES[name]()
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def get_backend(name="auto"):
+    """Return (name, loads) for the requested backend, resolving "auto" to the fastest installed one."""
+    if name == "auto":
+        name = available_backends()[0]
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown JSON backend {name!r}, expected one of {('auto',) + BACKEND_ORDER}")
+    return name, _FACTORIES[name]()
+
+
+DEFAULT_BACKEND = os.getenv("PULSE_JSON_BACKEND", "auto")
@@ -0,0 +1,104 @@
+import json
+import os
+
+from sources import file_sha1, open_source  # noqa: F401 - file_sha1 re-exported
+
+MANIFEST_TABLE = "ingest_manifest"
+MANIFEST_FILE = "ingest_manifest.json"   # used instead of the table for the Parquet target
+
+
+class Manifest:
+    """Tracks (path, size, mtime, sha1) of every ingested Pulse file.
+
+    `known` is the manifest as stored in MySQL, keyed on the path relative to
+    `root`. With force=False a file is skipped when its size and mtime are
+    unchanged, or when only its mtime moved but the content hash still matches.
+    `root` may be any --data-root (see sources.py); git sources skip straight
+    to the hash comparison because their blob ids are free.
+    Entries for files that were parsed successfully collect in `done` and are
+    written back with save() once their rows have been loaded.
+    """
+
+    def __init__(self, root, known=None, force=False):
+        self.root = root
+        self.source = open_source(root)
+        self.known = known or {}
+        self.force = force
+        self.pending = {}
+        self.done = {}
+        self.skipped = 0
+
+    def _key(self, path):
+        return self.source.key(path)
+
+    def needs_ingest(self, path):
+        key = self._key(path)
+        size, mtime = self.source.stat(path)
+        previous = self.known.get(key)
+
+        if (not self.force and previous and not self.source.content_addressed
+                and previous[0] == size and previous[1] == mtime):
+            self.skipped += 1
+            return False
+
+        sha1 = self.source.sha1(path)
+        entry = (size, mtime, sha1)
+        if not self.force and previous and previous[2] == sha1:
+            self.done[key] = entry  # touched but identical: refresh mtime only
+            self.skipped += 1
+            return False
+
+        self.pending[key] = entry
+        return True
+
+    def mark_done(self, path):
+        key = self._key(path)
+        entry = self.pending.pop(key, None)
+        if entry is not None:
+            self.done[key] = entry
+
+    # -------------------------------
+    # Persistence
+    # -------------------------------
+    @classmethod
+    def load(cls, conn, root, force=False):
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT path, size, mtime, sha1 FROM {MANIFEST_TABLE};")
+        known = {path: (size, mtime, sha1) for path, size, mtime, sha1 in cursor.fetchall()}
+        cursor.close()
+        return cls(root, known, force=force)
+
+    def save(self, conn, entries=None):
+        entries = self.done if entries is None else entries
+        if not entries:
+            return 0
+
+        rows = [(path, size, mtime, sha1) for path, (size, mtime, sha1) in entries.items()]
+        cursor = conn.cursor()
+        cursor.executemany(f"""
+            INSERT INTO {MANIFEST_TABLE} (path, size, mtime, sha1)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE size = VALUES(size), mtime = VALUES(mtime),
+                                    sha1 = VALUES(sha1), ingested_at = CURRENT_TIMESTAMP
+        """, rows)
+        conn.commit()
+        cursor.close()
+        self.known.update(entries)
+        return len(rows)
+
+    @classmethod
+    def load_file(cls, path, root, force=False):
+        known = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                known = {key: tuple(entry) for key, entry in json.load(f).items()}
+        return cls(root, known, force=force)
+
+    def save_file(self, path, entries=None):
+        entries = self.done if entries is None else entries
+        self.known.update(entries)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.known, f)
+        os.replace(path + ".tmp", path)
+        return len(entries)
@@ -0,0 +1,206 @@
+import re
+import time
+
+# -------------------------------
+# Canonical state / district / pincode ids
+# -------------------------------
+# The same place is spelled differently across datasets: map_user and
+# map_transaction say "north and middle andaman district", top_map says
+# "north and middle andaman", GeoJSON files say "Andaman & Nicobar Island".
+# NameIndex gives every state, district and pincode a stable integer id and
+# records each raw spelling it has seen, so downstream joins (the district
+# rollup, the choropleth) are one lookup instead of string clean-up per query.
+#
+# Stored after every load as (db/migrations/0003_name_index.sql, or
+# dim_*.parquet next to the Parquet data):
+#   dim_state     state_id, slug, name
+#   dim_district  district_id, state_id, name      (name = first spelling seen)
+#   dim_pincode   pincode, state_id                (the pincode is its own id)
+#   dim_alias     kind, state, raw_name, entity_id (raw_name lower-cased, trimmed)
+# Ids are reloaded before each build, so they never change between loads.
+
+# Pulse directory slugs, in schema ENUM order; state_id is the 1-based position
+STATE_SLUGS = [
+    "andaman-&-nicobar-islands", "andhra-pradesh", "arunachal-pradesh", "assam", "bihar",
+    "chandigarh", "chhattisgarh", "dadra-&-nagar-haveli-&-daman-&-diu", "delhi", "goa", "gujarat",
+    "haryana", "himachal-pradesh", "jammu-&-kashmir", "jharkhand", "karnataka", "kerala", "ladakh",
+    "lakshadweep", "madhya-pradesh", "maharashtra", "manipur", "meghalaya", "mizoram", "nagaland",
+    "odisha", "puducherry", "punjab", "rajasthan", "sikkim", "tamil-nadu", "telangana", "tripura",
+    "uttar-pradesh", "uttarakhand", "west-bengal",
+]
+
+# Other spellings in circulation (older GeoJSON boundaries, pre-merger names)
+STATE_ALIASES = {
+    "andaman-&-nicobar-islands": ["Andaman & Nicobar Island", "Andaman & Nicobar"],
+    "arunachal-pradesh": ["Arunanchal Pradesh"],
+    "dadra-&-nagar-haveli-&-daman-&-diu": ["Dadara & Nagar Havelli", "Dadra & Nagar Haveli", "Daman & Diu"],
+    "delhi": ["NCT of Delhi", "Delhi NCT"],
+    "odisha": ["Orissa"],
+    "puducherry": ["Pondicherry"],
+    "telangana": ["Telengana"],
+    "uttarakhand": ["Uttaranchal"],
+}
+
+DIM_TABLES = {
+    "dim_state": ("state_id", "slug", "name"),
+    "dim_district": ("district_id", "state_id", "name"),
+    "dim_pincode": ("pincode", "state_id"),
+    "dim_alias": ("kind", "state", "raw_name", "entity_id"),
+}
+
+# Every (state, kind, raw name) in the fact tables, best spelling first
+NAME_SOURCES = [
+    ("map_transaction", "SELECT DISTINCT state, 'district', district FROM map_transaction"),
+    ("map_user", "SELECT DISTINCT state, 'district', district FROM map_user"),
+    ("map_insurance", "SELECT DISTINCT state, 'district', district FROM map_insurance"),
+    ("top_map", "SELECT DISTINCT state, entity_type, name FROM top_map"),
+    ("top_insurance", "SELECT DISTINCT state, entity_type, name FROM top_insurance"),
+    ("top_user", "SELECT DISTINCT state, 'pincode', pincode FROM top_user"),
+]
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalise(name):
+    """Spelling-insensitive key: lower case, '&' as 'and', punctuation collapsed to single spaces."""
+    return _NON_ALNUM.sub(" ", str(name).lower().replace("&", " and ")).strip()
+
+
+def district_key(name):
+    key = normalise(name)
+    return key[:-len(" district")] if key.endswith(" district") else key
+
+
+def alias_key(name):
+    """How a raw spelling is stored in dim_alias (and matched by the rollups)."""
+    return str(name).strip().lower()
+
+
+def state_display_name(slug):
+    return " ".join(w if w == "&" else w.capitalize() for w in slug.split("-"))
+
+
+class NameIndex:
+    """In-memory raw spelling -> id lookups, loadable from and saved to the dim_* tables."""
+
+    def __init__(self):
+        self.states = {}       # state_id -> (slug, name)
+        self.districts = {}    # district_id -> (state_id, name)
+        self.pincodes = {}     # pincode -> state_id
+        self.aliases = {}      # (kind, state slug, alias_key) -> id
+        self._state_ids = {}   # normalise(spelling) -> state_id
+        self._district_ids = {}  # (state_id, district_key) -> district_id
+        for state_id, slug in enumerate(STATE_SLUGS, 1):
+            self._add_state(state_id, slug, state_display_name(slug))
+
+    def _add_state(self, state_id, slug, name):
+        self.states[state_id] = (slug, name)
+        for spelling in [slug, name] + STATE_ALIASES.get(slug, []):
+            self._state_ids.setdefault(normalise(spelling), state_id)
+            self.aliases[("state", "", alias_key(spelling))] = state_id
+
+    # ---- lookups (assigning new ids) ----
+
+    def state_id(self, raw):
+        key = normalise(raw)
+        state_id = self._state_ids.get(key)
+        if state_id is None:
+            state_id = max(self.states) + 1
+            self._add_state(state_id, str(raw), state_display_name(str(raw)))
+            self._state_ids[key] = state_id
+        self.aliases[("state", "", alias_key(raw))] = state_id
+        return state_id
+
+    def district_id(self, state, raw):
+        state_id = self.state_id(state)
+        key = (state_id, district_key(raw))
+        district_id = self._district_ids.get(key)
+        if district_id is None:
+            district_id = max(self.districts, default=0) + 1
+            self._district_ids[key] = district_id
+            self.districts[district_id] = (state_id, str(raw).strip())
+        self.aliases[("district", self.states[state_id][0], alias_key(raw))] = district_id
+        return district_id
+
+    def pincode_id(self, state, raw):
+        digits = str(raw).strip()
+        if not digits.isdigit():
+            return None
+        pincode = int(digits)
+        self.pincodes.setdefault(pincode, self.state_id(state))
+        self.aliases[("pincode", self.states[self.pincodes[pincode]][0], alias_key(raw))] = pincode
+        return pincode
+
+    def add(self, state, kind, raw):
+        if kind == "pincode":
+            return self.pincode_id(state, raw)
+        return self.district_id(state, raw)
+
+    # ---- persistence ----
+
+    def rows(self):
+        """{dim table: [row tuples]} in DIM_TABLES column order."""
+        return {
+            "dim_state": [(i, slug, name) for i, (slug, name) in sorted(self.states.items())],
+            "dim_district": [(i, s, name) for i, (s, name) in sorted(self.districts.items())],
+            "dim_pincode": sorted(self.pincodes.items()),
+            "dim_alias": [(kind, state, raw, i) for (kind, state, raw), i in sorted(self.aliases.items())],
+        }
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Rebuild from rows() output (or the stored tables) so existing ids are kept."""
+        index = cls()
+        for state_id, slug, name in rows.get("dim_state", []):
+            if int(state_id) not in index.states:
+                index._add_state(int(state_id), slug, name)
+        for district_id, state_id, name in rows.get("dim_district", []):
+            index.districts[int(district_id)] = (int(state_id), name)
+            index._district_ids.setdefault((int(state_id), district_key(name)), int(district_id))
+        for pincode, state_id in rows.get("dim_pincode", []):
+            index.pincodes[int(pincode)] = int(state_id)
+        for kind, state, raw, entity_id in rows.get("dim_alias", []):
+            index.aliases[(kind, state, raw)] = int(entity_id)
+            if kind == "district":
+                state_id = index.state_id(state)
+                index._district_ids.setdefault((state_id, district_key(raw)), int(entity_id))
+            elif kind == "state":
+                index._state_ids.setdefault(normalise(raw), int(entity_id))
+        return index
+
+    def add_names(self, names):
+        """Register (state, kind, raw name) rows, e.g. from NAME_SOURCES."""
+        for state, kind, raw in names:
+            if raw is not None:
+                self.add(state, kind, raw)
+        return self
+
+    def summary(self):
+        return (f"{len(self.states)} states, {len(self.districts):,} districts, "
+                f"{len(self.pincodes):,} pincodes, {len(self.aliases):,} spellings")
+
+# -------------------------------
+# MySQL: rebuild the dim_* tables
+# -------------------------------
+def build_name_index(conn):
+    start = time.perf_counter()
+    cursor = conn.cursor()
+    stored = {}
+    for table, columns in DIM_TABLES.items():
+        cursor.execute(f"SELECT {', '.join(columns)} FROM {table};")
+        stored[table] = cursor.fetchall()
+    index = NameIndex.from_rows(stored)
+    for _, query in NAME_SOURCES:
+        cursor.execute(query)
+        index.add_names(cursor.fetchall())
+
+    # Small tables: replace them in one transaction
+    for table, rows in index.rows().items():
+        columns = DIM_TABLES[table]
+        cursor.execute(f"DELETE FROM {table};")
+        cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                           rows)
+    conn.commit()
+    cursor.close()
+    print(f"🗂️ Name index: {index.summary()} in {time.perf_counter() - start:.2f}s")
+    return index
@@ -0,0 +1,132 @@
+import queue
+import threading
+from multiprocessing import Pool
+
+from tqdm import tqdm
+from bulk_loader import merge_stats
+from datasets import DATASETS
+from engine import run_dataset, set_json_backend
+from manifest import Manifest
+
+
+# -------------------------------
+# Worker side: parse one (dataset, state) unit into plain row lists
+# -------------------------------
+class RowCollector:
+    """Stands in for BulkLoader inside worker processes and keeps rows in memory."""
+
+    def __init__(self):
+        self.rows = {}
+        self.rejected = []
+
+    def add(self, table, row):
+        self.rows.setdefault(table, []).append(row)
+
+    def reject_file(self, table, path, error):
+        self.rejected.append((table, path, repr(error)))
+
+    def flush(self, table=None):
+        pass
+
+
+_worker_manifest = None
+
+
+def _init_worker(root, known, force, json_backend):
+    global _worker_manifest
+    _worker_manifest = Manifest(root, known, force=force)
+    set_json_backend(json_backend)
+
+
+def _extract_unit(unit):
+    dataset, state = unit
+    collector = RowCollector()
+    _worker_manifest.done = {}
+    _worker_manifest.skipped = 0
+    run_dataset(DATASETS[dataset], collector, _worker_manifest.root, states=[state], manifest=_worker_manifest)
+    return collector.rows, _worker_manifest.done, _worker_manifest.skipped, collector.rejected
+
+
+# -------------------------------
+# Writer side: a few connections draining a shared queue
+# -------------------------------
+class WriterError(RuntimeError):
+    """A writer lost rows; the parsed files must not be recorded in the manifest."""
+
+
+def _writer(make_loader, rows_queue, results, errors):
+    try:
+        loader = make_loader()
+        failed = False
+    except Exception as e:
+        print("❌ Writer could not start:", e)
+        errors.append(f"could not start: {e!r}")
+        loader, failed = None, True
+    while True:
+        item = rows_queue.get()
+        if item is None:
+            break
+        if failed:
+            continue  # keep draining so the producer never blocks on a dead writer
+
+        try:
+            for table, rows in item.items():
+                for row in rows:
+                    loader.add(table, row)
+        except Exception as e:
+            print("❌ Writer failed, dropping its remaining batches:", e)
+            errors.append(f"failed while loading: {e!r}")
+            failed = True
+
+    if loader is None:
+        return
+    try:
+        loader.close()
+    except Exception as e:
+        print("❌ Writer failed while flushing:", e)
+        errors.append(f"failed while flushing: {e!r}")
+    results.append(loader.stats)
+
+
+def run_parallel(units, make_loader, manifest, json_backend="auto", workers=4, writers=2, reject_file=None):
+    """Parse (dataset, state) units in a process pool and load them through `writers` loaders.
+
+    make_loader() is called once per writer thread and must return a fresh
+    BulkLoader (with its own connection) or another object with add/close/stats.
+    Workers check files against a copy of `manifest`; returns the merged
+    per-table load stats and the manifest entries of every parsed file.
+    Files a worker could not parse are passed to reject_file(table, path, error).
+    Raises WriterError if any writer failed, since some parsed rows were then never loaded.
+    """
+    writers = max(1, writers)
+    rows_queue = queue.Queue(maxsize=writers * 4)
+    results = []
+    errors = []
+    done = {}
+    threads = [
+        threading.Thread(target=_writer, args=(make_loader, rows_queue, results, errors), daemon=True)
+        for _ in range(writers)
+    ]
+    for t in threads:
+        t.start()
+
+    try:
+        with Pool(processes=workers, initializer=_init_worker,
+                  initargs=(manifest.root, manifest.known, manifest.force, json_backend)) as pool:
+            for rows, unit_done, skipped, rejected in tqdm(pool.imap_unordered(_extract_unit, units),
+                                                 total=len(units), desc="⚡ Extracting in parallel"):
+                if rows:
+                    rows_queue.put(rows)
+                done.update(unit_done)
+                manifest.skipped += skipped
+                for table, path, error in rejected if reject_file else ():
+                    reject_file(table, path, error)
+    finally:
+        for _ in threads:
+            rows_queue.put(None)
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise WriterError(f"{len(errors)} of {writers} writers failed: {'; '.join(errors)}")
+    return merge_stats(*results), done
@@ -0,0 +1,169 @@
+import os
+import time
+
+import pandas as pd
+
+from bulk_loader import TABLE_COLUMNS, TABLE_KEYS, print_summary
+from names import DIM_TABLES, NAME_SOURCES, NameIndex
+from rollups import ROLLUPS, read_dimensions
+
+PARTITION_COLUMNS = ("year", "quarter")
+DATA_VERSION_FILE = "data_version.parquet"
+
+
+def partition_dir(root, table, year, quarter):
+    return os.path.join(root, table, f"year={year}", f"quarter={quarter}")
+
+
+def fact_glob(root, table):
+    return os.path.join(root, table, "*", "*", "*.parquet").replace(os.sep, "/")
+
+
+class ParquetSink:
+    """Drop-in for BulkLoader that writes <root>/<table>/year=Y/quarter=Q/data.parquet.
+
+    Rows are buffered per (table, year, quarter). flush() merges them into the
+    partition file, replacing rows with the same natural key, so re-ingesting
+    a changed file is idempotent just like the MySQL upserts.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.mode = "parquet"
+        self.batch_size = "partition"
+        self.buffers = {}
+        self.stats = {}
+
+    def add(self, table, row):
+        year, quarter = row[1], row[2]
+        buffer = self.buffers.get((table, year, quarter))
+        if buffer is None:
+            buffer = self.buffers[(table, year, quarter)] = []
+            self.stats.setdefault(table, {"rows": 0, "batches": 0, "db_seconds": 0.0,
+                                          "started": time.perf_counter(), "finished": None})
+        buffer.append(row)
+
+    def flush(self, table=None):
+        for key in [k for k in self.buffers if table is None or k[0] == table]:
+            rows = self.buffers.pop(key)
+            start = time.perf_counter()
+            self._write_partition(*key, rows)
+            now = time.perf_counter()
+
+            stats = self.stats[key[0]]
+            stats["rows"] += len(rows)
+            stats["batches"] += 1
+            stats["db_seconds"] += now - start
+            stats["finished"] = now
+
+    def close(self):
+        self.flush()
+
+    def print_summary(self):
+        print_summary(self.stats, self.mode, self.batch_size)
+
+    def _write_partition(self, table, year, quarter, rows):
+        columns = TABLE_COLUMNS[table]
+        keep = [c for c in columns if c not in PARTITION_COLUMNS]
+        keys = [c for c in TABLE_KEYS[table] if c not in PARTITION_COLUMNS]
+
+        df = pd.DataFrame.from_records(rows, columns=columns)[keep]
+        directory = partition_dir(self.root, table, year, quarter)
+        path = os.path.join(directory, "data.parquet")
+        if os.path.exists(path):
+            df = pd.concat([pd.read_parquet(path), df], ignore_index=True)
+        df = df.drop_duplicates(subset=keys, keep="last")
+
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+
+# -------------------------------
+# Rollups and data version for the embedded (DuckDB) backend
+# -------------------------------
+def register_views(con, root):
+    """Expose every fact table under <root> as a DuckDB view with the MySQL table name."""
+    for table in TABLE_COLUMNS:
+        if os.path.isdir(os.path.join(root, table)):
+            con.execute(f"""
+                CREATE OR REPLACE VIEW {table} AS
+                SELECT * FROM read_parquet('{fact_glob(root, table)}', hive_partitioning = true)
+            """)
+
+
+def register_dim_views(con, root):
+    """Views over the dim_*.parquet name index written by build_parquet_names()."""
+    for table in DIM_TABLES:
+        path = os.path.join(root, f"{table}.parquet").replace(os.sep, "/")
+        con.execute(f"CREATE OR REPLACE VIEW {table} AS SELECT * FROM read_parquet('{path}')")
+
+
+def build_parquet_names(root):
+    import duckdb
+
+    start = time.perf_counter()
+    stored = {}
+    for table, columns in DIM_TABLES.items():
+        path = os.path.join(root, f"{table}.parquet")
+        if os.path.exists(path):
+            stored[table] = pd.read_parquet(path, columns=list(columns)).itertuples(index=False)
+    index = NameIndex.from_rows(stored)
+
+    con = duckdb.connect()
+    register_views(con, root)
+    for table, query in NAME_SOURCES:
+        if os.path.isdir(os.path.join(root, table)):
+            index.add_names(con.execute(query).fetchall())
+    con.close()
+
+    for table, rows in index.rows().items():
+        path = os.path.join(root, f"{table}.parquet")
+        pd.DataFrame.from_records(rows, columns=DIM_TABLES[table]).to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+    print(f"🗂️ Name index: {index.summary()} in {time.perf_counter() - start:.2f}s")
+    return index
+
+
+def build_parquet_rollups(root):
+    import duckdb
+
+    con = duckdb.connect()
+    register_views(con, root)
+    register_dim_views(con, root)
+    for rollup in ROLLUPS:
+        start = time.perf_counter()
+        path = os.path.join(root, f"{rollup.table}.parquet").replace(os.sep, "/")
+        columns = ", ".join(rollup.columns)
+        con.execute(f"COPY (SELECT * FROM ({rollup.select}) AS r({columns})) TO '{path}.tmp' (FORMAT PARQUET)")
+        os.replace(path + ".tmp", path)
+        rows = con.execute(f"SELECT COUNT(*) FROM read_parquet('{path}')").fetchone()[0]
+        print(f"🧮 Rebuilt {rollup.table}: {rows:,} rows in {time.perf_counter() - start:.2f}s")
+        con.execute(f"CREATE OR REPLACE VIEW {rollup.table} AS SELECT * FROM read_parquet('{path}')")
+    dims = read_dimensions(con)
+    con.close()
+    return dims
+
+
+def build_parquet_analytics(root):
+    import duckdb
+    from analytics import ANALYTICS_TABLE, compute_growth, read_sources
+
+    start = time.perf_counter()
+    con = duckdb.connect()
+    register_views(con, root)
+    con.execute(f"CREATE OR REPLACE VIEW rollup_state_quarter AS "
+                f"SELECT * FROM read_parquet('{os.path.join(root, 'rollup_state_quarter.parquet')}')")
+    df = compute_growth(read_sources(lambda q: con.execute(q).df()))
+    con.close()
+    path = os.path.join(root, f"{ANALYTICS_TABLE}.parquet")
+    df.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+    print(f"📈 Rebuilt {ANALYTICS_TABLE}: {len(df):,} rows ({int(df['outlier'].sum()):,} outliers) "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+def write_data_version(root):
+    pd.DataFrame({"id": [1], "version": [time.time_ns()]}).to_parquet(
+        os.path.join(root, DATA_VERSION_FILE), index=False)
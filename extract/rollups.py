@@ -0,0 +1,113 @@
+import json
+import os
+import time
+from collections import namedtuple
+
+# -------------------------------
+# Rollup tables read by the dashboard
+# -------------------------------
+# Table definitions live in db/phonepe_schema.sql. Each rollup is rebuilt
+# into <table>_new and swapped in with one RENAME, so dashboards never see a
+# half-built table.
+Rollup = namedtuple("Rollup", ["table", "columns", "select"])
+
+_TXN_AND_USERS = """
+    SELECT state{keys}, count AS txn_count, amount AS txn_amount,
+           0 AS registered_users, 0 AS app_opens
+    FROM {txn_table}
+    UNION ALL
+    SELECT state{keys}, 0, 0, registered_users, app_opens
+    FROM map_user
+"""
+
+ROLLUPS = [
+    Rollup("rollup_state_totals",
+           ("state", "txn_count", "txn_amount", "registered_users", "app_opens"), """
+        SELECT state, SUM(txn_count), SUM(txn_amount), SUM(registered_users), SUM(app_opens)
+        FROM ({union}) x
+        GROUP BY state
+    """.format(union=_TXN_AND_USERS.format(keys="", txn_table="aggregated_transaction"))),
+
+    Rollup("rollup_state_quarter",
+           ("state", "year", "quarter", "txn_count", "txn_amount", "registered_users", "app_opens"), """
+        SELECT state, year, quarter, SUM(txn_count), SUM(txn_amount), SUM(registered_users), SUM(app_opens)
+        FROM ({union}) x
+        GROUP BY state, year, quarter
+    """.format(union=_TXN_AND_USERS.format(keys=", year, quarter", txn_table="aggregated_transaction"))),
+
+    # Spellings are resolved through the name index (extract/names.py), so a
+    # district keeps one row and one id whichever dataset named it
+    Rollup("rollup_state_district",
+           ("state", "district", "txn_count", "txn_amount", "registered_users", "app_opens", "district_id"), """
+        SELECT x.state, COALESCE(d.name, x.district), SUM(txn_count), SUM(txn_amount),
+               SUM(registered_users), SUM(app_opens), d.district_id
+        FROM ({union}) x
+        LEFT JOIN dim_alias a
+          ON a.kind = 'district' AND a.state = x.state AND a.raw_name = LOWER(TRIM(x.district))
+        LEFT JOIN dim_district d ON d.district_id = a.entity_id
+        GROUP BY x.state, COALESCE(d.name, x.district), d.district_id
+    """.format(union=_TXN_AND_USERS.format(keys=", district", txn_table="map_transaction"))),
+
+    Rollup("rollup_type_state_year",
+           ("transaction_type", "state", "year", "count", "amount"), """
+        SELECT transaction_type, state, year, SUM(count), SUM(amount)
+        FROM aggregated_transaction
+        GROUP BY transaction_type, state, year
+    """),
+]
+
+
+def build_rollups(conn):
+    cursor = conn.cursor()
+    for rollup in ROLLUPS:
+        start = time.perf_counter()
+        table, staging, old = rollup.table, f"{rollup.table}_new", f"{rollup.table}_old"
+
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}, {old};")
+        cursor.execute(f"CREATE TABLE {staging} LIKE {table};")
+        cursor.execute(f"INSERT INTO {staging} {rollup.select};")
+        rows = cursor.rowcount
+        cursor.execute(f"RENAME TABLE {table} TO {old}, {staging} TO {table};")
+        cursor.execute(f"DROP TABLE {old};")
+        conn.commit()
+
+        print(f"🧮 Rebuilt {table}: {rows:,} rows in {time.perf_counter() - start:.2f}s")
+    cursor.close()
+    return read_dimensions(conn)
+
+
+# -------------------------------
+# Dimension snapshot for dashboard start-up
+# -------------------------------
+# The dashboard fills its state/year pickers from this file instead of
+# querying (and importing the database driver) before the first render.
+DIMENSIONS_FILE = "dimensions.json"
+DIMENSION_QUERIES = {
+    "states": "SELECT state FROM rollup_state_totals ORDER BY state",
+    "years": "SELECT DISTINCT year FROM rollup_state_quarter ORDER BY year",
+    "latest": "SELECT year, quarter FROM rollup_state_quarter ORDER BY year DESC, quarter DESC LIMIT 1",
+}
+
+
+def read_dimensions(conn):
+    """{"states": [...], "years": [...], "latest": [year, quarter] | None} from the rollup tables."""
+    cursor = conn.cursor()
+    dims = {}
+    for name, query in DIMENSION_QUERIES.items():
+        cursor.execute(query)
+        dims[name] = cursor.fetchall()
+    cursor.close()
+    latest = dims["latest"]
+    return {"states": [str(r[0]) for r in dims["states"]],
+            "years": [int(r[0]) for r in dims["years"]],
+            "latest": [int(latest[0][0]), int(latest[0][1])] if latest else None}
+
+
+def write_dimensions(path, dims, database=None):
+    """Atomically write the snapshot; `database` names the MySQL server it describes."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    snapshot = dict(dims, database=database, written_at=time.time())
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+    print(f"📇 Dimension snapshot: {len(dims['states'])} states, {len(dims['years'])} years -> {path}")
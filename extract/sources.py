@@ -0,0 +1,272 @@
+import hashlib
+import os
+import re
+import subprocess
+import tarfile
+import time
+import zipfile
+
+# -------------------------------
+# Where the Pulse JSON comes from
+# -------------------------------
+# --data-root accepts a checkout directory, a .tar/.tar.gz/.tgz/.zip of the
+# Pulse repo (e.g. the GitHub download) or git:<repo>[@<rev>] for a clone,
+# bare or not. Archive and git members are read straight into memory, so a
+# fresh container never has to unpack hundreds of thousands of small files.
+#
+# Every source yields (state, year, quarter, handle) and reads a handle back
+# as bytes. Directory handles are real paths; archive and git handles are
+# paths relative to the data root, which is also what the manifest stores.
+
+_QUARTER_FILE = re.compile(r"^(?P<state>[^/]+)/(?P<year>\d{4})/(?P<quarter>\d)\.json$")
+_DATA_ROOT = re.compile(r"^(?P<prefix>(?:.*/)?data/)(?:aggregated|map|top)/")
+
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def list_states(base_path):
+    with os.scandir(base_path) as entries:
+        return sorted(e.name for e in entries if e.is_dir())
+
+
+def iter_quarter_files(base_path, states=None):
+    """Yield (state, year, quarter, path) for every <state>/<year>/<quarter>.json under base_path."""
+    for state in states if states is not None else list_states(base_path):
+        with os.scandir(os.path.join(base_path, state)) as years:
+            year_dirs = [(e.name, e.path) for e in years if e.is_dir()]
+        for year, year_path in year_dirs:
+            with os.scandir(year_path) as files:
+                for entry in files:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        yield state, int(year), int(entry.name[:-5]), entry.path
+
+
+class DirectorySource:
+    """A Pulse checkout on disk (the original layout)."""
+
+    random_access = True
+    content_addressed = False
+
+    def __init__(self, root):
+        self.root = root
+
+    def list_states(self, dataset_path):
+        return list_states(os.path.join(self.root, dataset_path))
+
+    def iter_quarter_files(self, dataset_path, states=None):
+        return iter_quarter_files(os.path.join(self.root, dataset_path), states)
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def key(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def stat(self, path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime
+
+    def sha1(self, path):
+        return file_sha1(path)
+
+
+class _IndexedSource:
+    """Shared logic for archive-like sources indexed as {relative path: member info}."""
+
+    random_access = True
+    content_addressed = False
+
+    def __init__(self, names):
+        self.prefix = self._find_prefix(names)
+        self.members = {}      # relative path -> source-specific member info
+        self._states = {}      # dataset path -> {state: [(year, quarter, key)]}
+        self._last = (None, None)
+
+    @staticmethod
+    def _find_prefix(names):
+        for name in names:
+            match = _DATA_ROOT.match(name)
+            if match:
+                return match.group("prefix")
+        raise ValueError("No Pulse data/aggregated|map|top directory found in the archive")
+
+    def _add(self, name, info):
+        if name.startswith(self.prefix) and name.endswith(".json"):
+            self.members[name[len(self.prefix):]] = info
+
+    def _layout(self, dataset_path):
+        layout = self._states.get(dataset_path)
+        if layout is None:
+            layout = {}
+            base = dataset_path.rstrip("/") + "/"
+            for key in self.members:
+                if key.startswith(base):
+                    match = _QUARTER_FILE.match(key[len(base):])
+                    if match:
+                        layout.setdefault(match["state"], []).append(
+                            (int(match["year"]), int(match["quarter"]), key))
+            self._states[dataset_path] = layout
+        return layout
+
+    def list_states(self, dataset_path):
+        return sorted(self._layout(dataset_path))
+
+    def iter_quarter_files(self, dataset_path, states=None):
+        layout = self._layout(dataset_path)
+        states = states if states is not None else sorted(layout)
+        if not self.random_access:
+            # One forward pass over the dataset instead of one per state
+            members = [(state, y, q, key) for state in states for y, q, key in layout.get(state, [])]
+            yield from sorted(members, key=lambda m: self._order(m[3]))
+            return
+        for state in states:
+            for year, quarter, key in sorted(layout.get(state, [])):
+                yield state, year, quarter, key
+
+    def _order(self, key):
+        return key
+
+    def read(self, key):
+        # The manifest hashes a member just before it is parsed; keep the last
+        # one so it is only pulled out of the archive once
+        if self._last[0] != key:
+            self._last = (key, self._read(key))
+        return self._last[1]
+
+    def key(self, key):
+        return key
+
+    def sha1(self, key):
+        return hashlib.sha1(self.read(key)).hexdigest()
+
+
+class TarSource(_IndexedSource):
+    """A (optionally gzip/bz2/xz-compressed) tarball of the Pulse repo.
+
+    Compressed tarballs can only be read forwards cheaply, so members are
+    visited in archive order and parallel mode falls back to one process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._tar = tarfile.open(path, "r:*")
+        members = [m for m in self._tar.getmembers() if m.isfile()]
+        super().__init__([m.name for m in members])
+        for member in members:
+            self._add(member.name, member)
+        self.random_access = not path.endswith((".gz", ".tgz", ".bz2", ".xz"))
+
+    def _order(self, key):
+        return self.members[key].offset_data
+
+    def _read(self, key):
+        return self._tar.extractfile(self.members[key]).read()
+
+    def stat(self, key):
+        member = self.members[key]
+        return member.size, float(member.mtime)
+
+
+class ZipSource(_IndexedSource):
+    """A .zip of the Pulse repo (GitHub's "Download ZIP")."""
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        infos = [i for i in self._zip.infolist() if not i.is_dir()]
+        super().__init__([i.filename for i in infos])
+        for info in infos:
+            self._add(info.filename, info)
+
+    def _read(self, key):
+        return self._zip.read(self.members[key])
+
+    def stat(self, key):
+        info = self.members[key]
+        return info.file_size, time.mktime(info.date_time + (0, 0, -1))
+
+
+class GitSource(_IndexedSource):
+    """Blobs of a git repository at one revision, read through `git cat-file --batch`.
+
+    The blob id is already a content hash, so the manifest compares it
+    directly instead of hashing every file.
+    """
+
+    content_addressed = True
+
+    def __init__(self, repo, rev="HEAD"):
+        self.repo = repo
+        self.rev = rev
+        listing = subprocess.run(["git", "-C", repo, "ls-tree", "-r", "-l", "--full-tree", rev],
+                                 check=True, capture_output=True, text=True).stdout
+        entries = []
+        for line in listing.splitlines():
+            meta, name = line.split("\t", 1)
+            _, kind, blob, size = meta.split()
+            if kind == "blob":
+                entries.append((name, (blob, int(size))))
+        super().__init__([name for name, _ in entries])
+        for name, info in entries:
+            self._add(name, info)
+        self._batch = None
+
+    def _read(self, key):
+        if self._batch is None:
+            self._batch = subprocess.Popen(["git", "-C", self.repo, "cat-file", "--batch"],
+                                           stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        blob, _ = self.members[key]
+        self._batch.stdin.write(blob.encode() + b"\n")
+        self._batch.stdin.flush()
+        header = self._batch.stdout.readline().split()
+        if len(header) != 3 or header[1] != b"blob":
+            raise ValueError(f"git cat-file returned {header!r} for {key}")
+        data = self._batch.stdout.read(int(header[2]))
+        self._batch.stdout.read(1)  # trailing newline
+        return data
+
+    def stat(self, key):
+        return self.members[key][1], 0.0
+
+    def sha1(self, key):
+        return self.members[key][0]
+
+
+# -------------------------------
+# Opening a --data-root
+# -------------------------------
+_open_sources = {}
+
+
+def open_source(data_root):
+    """Return the (per-process, cached) source for a --data-root value.
+
+    Keyed on the pid as well: a forked worker inherits the parent's cache,
+    and sharing its archive handle (one file offset) or git pipe between
+    processes interleaves their reads.
+    """
+    key = (os.getpid(), data_root)
+    source = _open_sources.get(key)
+    if source is None:
+        source = _open_sources[key] = _open(data_root)
+    return source
+
+
+def _open(data_root):
+    if data_root.startswith("git:"):
+        repo, _, rev = data_root[4:].partition("@")
+        return GitSource(repo, rev or "HEAD")
+    if os.path.isfile(data_root):
+        if zipfile.is_zipfile(data_root):
+            return ZipSource(data_root)
+        if tarfile.is_tarfile(data_root):
+            return TarSource(data_root)
+        raise ValueError(f"{data_root} is neither a tar nor a zip archive")
+    return DirectorySource(data_root)
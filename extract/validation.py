@@ -0,0 +1,320 @@
+import json
+import math
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from bulk_loader import TABLE_COLUMNS, TABLE_KEYS
+
+# -------------------------------
+# Ingest validation and quarantine
+# -------------------------------
+# ValidatingLoader sits between the row mappers and a BulkLoader/ParquetSink.
+# Rows are checked a batch at a time with pandas masks (no per-row Python), and
+# rows that fail go to ingest_quarantine (db/migrations/0004_ingest_quarantine.sql,
+# or ingest_quarantine.parquet) instead of the fact table:
+#
+#   bad_period    year outside MIN_YEAR..MAX_YEAR or quarter not 1-4
+#   missing_key   empty state / entity name
+#   bad_number    a measure that is null, non-numeric or not finite
+#   negative      a measure below zero
+#   bad_pincode   a pincode that is not six digits
+#   duplicate_key the same natural key twice in one file (the last one is loaded,
+#                 as the upserts would)
+#
+# Files the mappers could not read are recorded as parse_error, and once the
+# load is done district totals are reconciled against the state aggregates
+# (reconcile_mismatch, report only). A JSON summary is written next to the data.
+QUARANTINE_TABLE = "ingest_quarantine"
+QUARANTINE_COLUMNS = ("run_id", "table_name", "check_name", "state", "year", "quarter", "entity",
+                      "detail", "row_data")
+REPORT_FILE = "validation_report.json"
+
+MIN_YEAR = 2018
+MAX_YEAR = time.localtime().tm_year + 1
+VALIDATION_BATCH = int(os.getenv("VALIDATION_BATCH", 20000))          # rows checked per pandas pass
+VALIDATION_TOLERANCE = float(os.getenv("VALIDATION_TOLERANCE", 0.01))  # relative district vs state gap
+MAX_QUARANTINE_ROWS = int(os.getenv("MAX_QUARANTINE_ROWS", 10000))     # stored per (table, check)
+
+CHECKS = ("bad_period", "missing_key", "bad_number", "negative", "bad_pincode", "duplicate_key")
+PERIOD = ("state", "year", "quarter")
+
+# District-level table -> state-level table it should add up to
+RECONCILE = {
+    "map_transaction": "aggregated_transaction",
+    "map_insurance": "aggregated_insurance",
+}
+RECONCILE_MEASURES = ("count", "amount")
+
+
+def _measures(table):
+    return [c for c in TABLE_COLUMNS[table] if c not in TABLE_KEYS[table]]
+
+
+def _entity_columns(table):
+    return [c for c in TABLE_KEYS[table] if c not in PERIOD]
+
+
+def check_frame(table, df):
+    """Name of the first failed check per row ('' when the row is fine), as a NumPy array."""
+    failed = np.full(len(df), "", dtype=object)
+
+    def mark(check, mask):
+        mask = np.asarray(mask, dtype=bool) & (failed == "")
+        failed[mask] = check
+
+    year = pd.to_numeric(df["year"], errors="coerce")
+    quarter = pd.to_numeric(df["quarter"], errors="coerce")
+    mark("bad_period", ~(year.between(MIN_YEAR, MAX_YEAR) & quarter.isin([1, 2, 3, 4])))
+
+    text = df[["state"] + _entity_columns(table)]
+    mark("missing_key", text.isna().any(axis=1) | (text.astype(str).apply(lambda c: c.str.strip()) == "").any(axis=1))
+
+    measures = df[_measures(table)].apply(pd.to_numeric, errors="coerce").to_numpy(np.float64)
+    mark("bad_number", ~np.isfinite(measures).all(axis=1))
+    with np.errstate(invalid="ignore"):
+        mark("negative", (measures < 0).any(axis=1))
+
+    if table == "top_user":
+        pincodes = df["pincode"]
+    elif "entity_type" in df:
+        pincodes = df["name"].where(df["entity_type"] == "pincode")
+    else:
+        pincodes = None
+    if pincodes is not None:
+        is_pincode = pincodes.notna()
+        mark("bad_pincode", is_pincode & ~pincodes.astype(str).str.fullmatch(r"\d{6}"))
+
+    # Among the rows still loadable, so a bad last copy does not take a good one with it
+    ok = np.flatnonzero(failed == "")
+    duplicate = df.iloc[ok][list(TABLE_KEYS[table])].astype(str).duplicated(keep="last").to_numpy()
+    failed[ok[duplicate]] = "duplicate_key"
+    return failed
+
+
+class Validator:
+    """Checks row batches and collects quarantined rows, counts and reconciliation totals.
+
+    One Validator is shared by every loader of a run (parallel writers
+    included), so the shared state is updated under a lock.
+    """
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id or time.strftime("%Y%m%dT%H%M%S")
+        self.lock = threading.Lock()
+        self.checked = {}       # table -> rows checked
+        self.counts = {}        # (table, check) -> rows
+        self.quarantine = []    # QUARANTINE_COLUMNS tuples
+        self.totals = {}        # table -> {(state, year, quarter): [count, amount]}
+        self.mismatches = []
+        self.seconds = 0.0
+
+    def check(self, table, rows):
+        """The rows that passed; the others are recorded for the quarantine table."""
+        start = time.perf_counter()
+        df = pd.DataFrame.from_records(rows, columns=TABLE_COLUMNS[table])
+        failed = check_frame(table, df)
+        bad = np.flatnonzero(failed != "")
+        good = rows if not len(bad) else [rows[i] for i in np.flatnonzero(failed == "")]
+
+        sums = None
+        if table in RECONCILE or table in RECONCILE.values():
+            ok = df.iloc[np.flatnonzero(failed == "")] if len(bad) else df
+            ok = ok.assign(**{m: pd.to_numeric(ok[m]) for m in RECONCILE_MEASURES})
+            sums = ok.groupby(list(PERIOD), sort=False)[list(RECONCILE_MEASURES)].sum()
+
+        with self.lock:
+            self.checked[table] = self.checked.get(table, 0) + len(rows)
+            for i in bad:
+                self._record(table, failed[i], rows[i])
+            if sums is not None:
+                totals = self.totals.setdefault(table, {})
+                for key, count, amount in zip(sums.index, sums["count"], sums["amount"]):
+                    total = totals.setdefault(key, [0, 0.0])
+                    total[0] += count
+                    total[1] += amount
+            self.seconds += time.perf_counter() - start
+        return good
+
+    def _record(self, table, check, row=None, period=(None, None, None), detail=""):
+        key = (table, check)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if self.counts[key] > MAX_QUARANTINE_ROWS:
+            return
+        entity = None
+        if row is not None:
+            values = dict(zip(TABLE_COLUMNS[table], row))
+            period = tuple(values[c] for c in PERIOD)
+            entity = "/".join(str(values[c]) for c in _entity_columns(table))
+        state, year, quarter = period
+        self.quarantine.append((self.run_id, table, check, _text(state), _int(year), _int(quarter),
+                                entity and entity[:100], detail[:255],
+                                json.dumps(list(row), default=str) if row is not None else None))
+
+    def reject_file(self, table, path, error):
+        """A file the mapper failed on; none of its rows were loaded."""
+        with self.lock:
+            self._record(table, "parse_error", detail=f"{path}: {error!r}")
+
+    def reconcile(self, tolerance=VALIDATION_TOLERANCE):
+        """Compare district sums with state aggregates for every period loaded on both sides.
+
+        Returns the number of periods compared; self.mismatches gets one entry per period
+        with any measure off by more than the tolerance, holding the gap of each such measure.
+        """
+        compared = 0
+        for district_table, state_table in RECONCILE.items():
+            districts, states = self.totals.get(district_table, {}), self.totals.get(state_table, {})
+            for period in districts.keys() & states.keys():
+                compared += 1
+                gaps, details = {}, []
+                for measure, got, want in zip(RECONCILE_MEASURES, districts[period], states[period]):
+                    gap = (got - want) / want if want else (0.0 if not got else math.inf)
+                    if abs(gap) > tolerance:
+                        gaps[measure] = gap
+                        details.append(f"{measure}: districts {got:,.0f} vs state {want:,.0f} ({gap:+.2%})")
+                if gaps:
+                    self.mismatches.append({"table": district_table, "period": list(period), "gaps": gaps})
+                    self._record(district_table, "reconcile_mismatch", period=period, detail="; ".join(details))
+        return compared
+
+    def report(self, compared=0):
+        checks = {}
+        for (table, check), n in sorted(self.counts.items()):
+            checks.setdefault(table, {})[check] = n
+        return {
+            "run_id": self.run_id,
+            "rows_checked": sum(self.checked.values()),
+            "rows_quarantined": sum(n for (_, c), n in self.counts.items() if c in CHECKS),
+            "files_rejected": sum(n for (_, c), n in self.counts.items() if c == "parse_error"),
+            "periods_reconciled": compared,
+            "reconcile_mismatches": len(self.mismatches),
+            "measure_mismatches": {m: sum(m in x["gaps"] for x in self.mismatches) for m in RECONCILE_MEASURES},
+            "tolerance": VALIDATION_TOLERANCE,
+            "seconds": round(self.seconds, 3),
+            "checks": checks,
+        }
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ValidatingLoader:
+    """Wraps a BulkLoader/ParquetSink so every row passes Validator.check() first.
+
+    Rows of one (state, year, quarter) file arrive together, so a batch is
+    only cut at a period boundary; duplicates within a file are always seen
+    in the same batch.
+    """
+
+    def __init__(self, loader, validator, batch_size=VALIDATION_BATCH):
+        self.loader = loader
+        self.validator = validator
+        self.batch_size = batch_size
+        self.buffers = {}
+
+    @property
+    def stats(self):
+        return self.loader.stats
+
+    def add(self, table, row):
+        buffer = self.buffers.get(table)
+        if buffer is None:
+            buffer = self.buffers[table] = []
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self._check(table, final=False)
+
+    def _check(self, table, final=True):
+        rows = self.buffers.get(table)
+        if not rows:
+            return
+        cut = len(rows)
+        if not final:
+            period = rows[-1][:3]
+            while cut > 0 and rows[cut - 1][:3] == period:
+                cut -= 1
+            if cut == 0:  # one period larger than a batch: check it whole
+                cut = len(rows)
+        self.buffers[table] = rows[cut:]
+        for row in self.validator.check(table, rows[:cut]):
+            self.loader.add(table, row)
+
+    def flush(self, table=None):
+        for name in [table] if table else list(self.buffers):
+            self._check(name)
+        self.loader.flush(table)
+
+    def close(self):
+        for name in list(self.buffers):
+            self._check(name)
+        self.loader.close()
+
+    def print_summary(self):
+        self.loader.print_summary()
+
+    def reject_file(self, table, path, error):
+        self.validator.reject_file(table, path, error)
+
+# -------------------------------
+# Quarantine table and summary report
+# -------------------------------
+def save_quarantine(conn, validator, batch_size=5000):
+    cursor = conn.cursor()
+    insert = (f"INSERT INTO {QUARANTINE_TABLE} ({', '.join(QUARANTINE_COLUMNS)}) "
+              f"VALUES ({', '.join(['%s'] * len(QUARANTINE_COLUMNS))})")
+    rows = validator.quarantine
+    for i in range(0, len(rows), batch_size):
+        cursor.executemany(insert, rows[i:i + batch_size])
+    conn.commit()
+    cursor.close()
+
+
+def save_quarantine_file(root, validator):
+    """Append this run's rows to <root>/ingest_quarantine.parquet."""
+    path = os.path.join(root, f"{QUARANTINE_TABLE}.parquet")
+    df = pd.DataFrame.from_records(validator.quarantine, columns=QUARANTINE_COLUMNS)
+    if df.empty:
+        return
+    df["year"] = df["year"].astype("Int64")
+    df["quarter"] = df["quarter"].astype("Int64")
+    if os.path.exists(path):
+        df = pd.concat([pd.read_parquet(path), df], ignore_index=True)
+    df.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+
+def finish_validation(validator, report_path, conn=None, parquet_root=None):
+    """Reconcile, store the quarantine rows and write + print the summary report."""
+    compared = validator.reconcile()
+    if parquet_root is not None:
+        save_quarantine_file(parquet_root, validator)
+    elif conn is not None:
+        save_quarantine(conn, validator)
+    report = validator.report(compared)
+
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(report_path + ".tmp", report_path)
+
+    print(f"🔎 Validated {report['rows_checked']:,} rows in {report['seconds']:.2f}s: "
+          f"{report['rows_quarantined']:,} quarantined, {report['files_rejected']:,} files rejected, "
+          f"{report['reconcile_mismatches']:,} of {compared:,} periods off by more than "
+          f"{VALIDATION_TOLERANCE:.0%} ("
+          + ", ".join(f"{m} {n:,}" for m, n in report["measure_mismatches"].items()) + ")")
+    for table, checks in report["checks"].items():
+        print(f"   {table:<24}" + ", ".join(f"{check} {n:,}" for check, n in checks.items()))
+    print(f"🧾 Validation report -> {report_path}")
+    return report